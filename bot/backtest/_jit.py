@@ -0,0 +1,132 @@
+"""Optional numba-accelerated kernels for the backtest engine.
+
+numba is an optional dependency: when it is not installed the kernels run
+as plain Python/NumPy functions with identical semantics.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:  # numba is optional
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+
+        def wrap(func):
+            return func
+
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True)
+def _onebar_loop(
+    opens: np.ndarray, closes: np.ndarray, sigs: np.ndarray, fee: float
+) -> tuple[np.ndarray, int, float, float, float]:
+    """One-bar PnL/equity kernel.
+
+    Signal semantics match run_backtest_onebar: sigs[t] == 1 means enter at
+    open[t] and exit at close[t] of the same bar, with commission both ways.
+
+    Args:
+        opens: Open prices (float64)
+        closes: Close prices (float64)
+        sigs: Per-bar signals (int8, 1 = buy, 0 = hold); sigs[0] is ignored
+        fee: Per-side fee rate
+
+    Returns:
+        Tuple of (equity curve, trade count, profit sum, loss sum, max drawdown)
+    """
+    n = opens.shape[0]
+    equity = np.empty(n, dtype=np.float64)
+    eq = 1000.0
+    equity[0] = eq
+    peak = eq
+    max_dd = 0.0
+    trade_count = 0
+    profit_sum = 0.0
+    loss_sum = 0.0
+
+    for t in range(1, n):
+        if sigs[t] == 1:
+            entry_price = opens[t]
+            exit_price = closes[t]
+            net_pnl = (exit_price - entry_price) / entry_price - 2.0 * fee
+            eq = eq * (1.0 + net_pnl)
+            trade_count += 1
+            if net_pnl > 0.0:
+                profit_sum += net_pnl
+            elif net_pnl < 0.0:
+                loss_sum += -net_pnl
+        equity[t] = eq
+        if eq > peak:
+            peak = eq
+        dd = (peak - eq) / peak
+        if dd > max_dd:
+            max_dd = dd
+
+    return equity, trade_count, profit_sum, loss_sum, max_dd
+
+
+@njit(cache=True, parallel=True)
+def _onebar_loop_batch(
+    opens: np.ndarray, closes: np.ndarray, sigs_matrix: np.ndarray, fees: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Run _onebar_loop for many parameter combinations in parallel.
+
+    Each row of sigs_matrix (paired with the matching entry of fees) is an
+    independent sweep point; rows are distributed across cores with prange
+    when numba is available.
+
+    Args:
+        opens: Open prices (float64), shared across all rows
+        closes: Close prices (float64), shared across all rows
+        sigs_matrix: Per-combination signals, shape (n_combos, n_bars), int8
+        fees: Per-side fee rate per combination, shape (n_combos,)
+
+    Returns:
+        Arrays of (final equity, trade count, profit sum, loss sum, max
+        drawdown), one entry per combination
+    """
+    n_combos = sigs_matrix.shape[0]
+    finals = np.empty(n_combos, dtype=np.float64)
+    trade_counts = np.empty(n_combos, dtype=np.int64)
+    profit_sums = np.empty(n_combos, dtype=np.float64)
+    loss_sums = np.empty(n_combos, dtype=np.float64)
+    max_dds = np.empty(n_combos, dtype=np.float64)
+
+    for k in prange(n_combos):
+        equity, trade_count, profit_sum, loss_sum, max_dd = _onebar_loop(
+            opens, closes, sigs_matrix[k], fees[k]
+        )
+        finals[k] = equity[-1]
+        trade_counts[k] = trade_count
+        profit_sums[k] = profit_sum
+        loss_sums[k] = loss_sum
+        max_dds[k] = max_dd
+
+    return finals, trade_counts, profit_sums, loss_sums, max_dds
+
+
+def warmup() -> None:
+    """Trigger JIT compilation of all kernels once, up front.
+
+    numba.pycc AOT compilation is deprecated upstream, so the closest
+    equivalent is compiling eagerly at startup with @njit(cache=True):
+    the first call compiles (and persists to the on-disk cache), every
+    later call — including in fresh processes — reuses the cached binary.
+    No-op when numba is not installed.
+    """
+    if not HAS_NUMBA:
+        return
+    tiny = np.ones(2, dtype=np.float64)
+    _onebar_loop(tiny, tiny, np.zeros(2, dtype=np.int8), 0.001)
+    _onebar_loop_batch(tiny, tiny, np.zeros((1, 2), dtype=np.int8), np.array([0.001]))
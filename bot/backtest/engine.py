@@ -2,18 +2,161 @@
 
 from typing import Any, Callable, Optional
 
+import numpy as np
+
+from bot.backtest import _jit
+from bot.backtest._jit import _onebar_loop, _onebar_loop_batch
 from bot.core.exchange import PaperExchange
-from bot.data.ohlcv_source import OHLCVBar
+from bot.core.rules import round_price_array
+from bot.data.ohlcv_source import OHLCVBar, OHLCVColumns
 from bot.strategy.base import Strategy
 
+# Pay the (cached) JIT compile cost once at import instead of inside the
+# first timed backtest run
+_jit.warmup()
+
+# Bars may arrive as the legacy list of tuples or already split into columns
+BarsInput = list[OHLCVBar] | OHLCVColumns
+
+# Order-acceptance bound enforced by apply_order_rules / PaperExchange
+# (see bot/core/rules.py); the vectorized path screens against it
+_MIN_NOTIONAL = 10.0
+
+
+def prices_to_soa(prices: BarsInput) -> dict[str, np.ndarray]:
+    """Convert bars (AoS list of tuples) to SoA float64 column arrays.
+
+    OHLCVColumns inputs pass their float64 columns through as-is (no copy);
+    only ts/volume are widened to float64 to keep the dict homogeneous.
+
+    Args:
+        prices: List of OHLCV bars or pre-split OHLCVColumns
+
+    Returns:
+        Dict with 'ts', 'o', 'h', 'l', 'c', 'v' contiguous float64 arrays
+    """
+    if isinstance(prices, OHLCVColumns):
+        return {
+            "ts": prices.ts.astype(np.float64),
+            "o": np.ascontiguousarray(prices.open),
+            "h": np.ascontiguousarray(prices.high),
+            "l": np.ascontiguousarray(prices.low),
+            "c": np.ascontiguousarray(prices.close),
+            "v": prices.volume.astype(np.float64),
+        }
+    arr = np.asarray(prices, dtype=np.float64)
+    if arr.size == 0:
+        arr = arr.reshape(0, 6)
+    return {
+        "ts": np.ascontiguousarray(arr[:, 0]),
+        "o": np.ascontiguousarray(arr[:, 1]),
+        "h": np.ascontiguousarray(arr[:, 2]),
+        "l": np.ascontiguousarray(arr[:, 3]),
+        "c": np.ascontiguousarray(arr[:, 4]),
+        "v": np.ascontiguousarray(arr[:, 5]),
+    }
+
+
+def _run_backtest_vectorized(
+    soa: dict[str, np.ndarray],
+    strategy: Strategy,
+    fee: float,
+    initial_balance: float,
+) -> tuple[dict[str, Any], np.ndarray] | None:
+    """Vectorized close-mode backtest for strategies exposing signals_vec().
+
+    Models the long-only single-unit book under the assumption that every
+    order fills. That assumption is verified against PaperExchange's
+    rejection rules before returning: if any order in the trace would have
+    been rejected (notional below the minimum, or an entry costing more
+    than the balance at that bar), all later state diverges from the
+    scalar path, so None is returned and the caller falls back to the
+    per-bar loop.
+    """
+    c = soa["c"]
+    n = len(c)
+    sig = np.asarray(
+        strategy.signals_vec(soa["o"], soa["h"], soa["l"], soa["c"], soa["v"]), dtype=np.int8
+    )
+
+    # Position = 1 after the most recent non-zero signal was a buy, else 0
+    last_sig_idx = np.maximum.accumulate(np.where(sig != 0, np.arange(n), -1))
+    last_sig = np.where(last_sig_idx >= 0, sig[np.maximum(last_sig_idx, 0)], 0)
+    pos = (last_sig == 1).astype(np.int8)
+
+    prev_pos = np.empty(n, dtype=np.int8)
+    prev_pos[0] = 0
+    prev_pos[1:] = pos[:-1]
+    entries = (pos == 1) & (prev_pos == 0)
+    exits = (pos == 0) & (prev_pos == 1)
+
+    # Cash flow at transitions: buy costs price + fee, sell returns price - fee.
+    # Executions round the price to the tick like PaperExchange does; equity
+    # marks to the raw close, again matching the scalar path.
+    exec_px = round_price_array(c)
+    fees = fee * exec_px * (entries | exits)
+    cash_delta = np.where(entries, -(exec_px + fee * exec_px), 0.0) + np.where(
+        exits, exec_px - fee * exec_px, 0.0
+    )
+    balance = initial_balance + np.cumsum(cash_delta)
+    equity = balance + pos * c
+
+    # Rejection screen: both paths act identically up to the first order
+    # PaperExchange would refuse, so a trace containing none is exact.
+    # Orders below min_notional (checked on the raw close, as
+    # apply_order_rules does) or entries whose cost + fee exceeds the
+    # balance available at that bar invalidate the fast path
+    traded = entries | exits
+    pre_balance = balance - cash_delta
+    if (c[traded] < _MIN_NOTIONAL).any() or (
+        exec_px[entries] * (1.0 + fee) > pre_balance[entries]
+    ).any():
+        return None
+
+    # Metrics
+    final_equity = equity[-1] if n else initial_balance
+    gross_pnl = final_equity - initial_balance
+    total_fees = float(fees.sum())
+    net_pnl = gross_pnl - total_fees
+
+    entry_prices = c[entries]
+    exit_prices = c[exits]
+    pairs = min(len(entry_prices), len(exit_prices))
+    winning_trades = int(np.count_nonzero(exit_prices[:pairs] > entry_prices[:pairs]))
+    total_trades = pairs
+    win_rate = winning_trades / total_trades if total_trades > 0 else 0.0
+
+    if n:
+        # Seed the running peak with the initial balance, as the scalar path does
+        peak = np.maximum.accumulate(np.concatenate(([initial_balance], equity)))[1:]
+        max_dd = float(((peak - equity) / peak).max())
+    else:
+        max_dd = 0.0
+
+    # Keys in sorted order: callers print/serialize metrics without re-sorting
+    metrics = {
+        "final_equity": float(final_equity),
+        "gross_pnl": float(gross_pnl),
+        "initial_balance": initial_balance,
+        "max_dd": max_dd,
+        "net_pnl": float(net_pnl),
+        "return_pct": float(final_equity - initial_balance) / initial_balance * 100,
+        "total_fees": total_fees,
+        "trades": int(entries.sum() + exits.sum()),
+        "win_rate": win_rate,
+    }
+
+    return metrics, equity
+
 
 def run_backtest(
-    prices: list[OHLCVBar],
+    prices: BarsInput,
     strategy: Strategy,
     fee: float = 0.001,
     verbose: bool = False,
     progress_cb: Optional[Callable[[int, int], None]] = None,
-) -> tuple[dict[str, Any], list[float]]:
+    progress_every: int = 1000,
+) -> tuple[dict[str, Any], np.ndarray]:
     """Run backtest on historical data.
 
     Args:
@@ -21,26 +164,68 @@ def run_backtest(
         strategy: Trading strategy
         fee: Trading fee rate
         verbose: Enable verbose logging
-        progress_cb: Progress callback function(current, total)
+        progress_cb: Progress callback function(current, total), invoked
+            every progress_every bars (not per bar)
+        progress_every: Bars between progress callback invocations
 
     Returns:
-        Tuple of (metrics dict, equity curve)
+        Tuple of (metrics dict, equity curve as a float64 array)
     """
+    # Fast path: strategies exposing a vectorized signal function skip the
+    # Python-level bar loop entirely (one C-level pass over SoA columns).
+    # It declines (returns None) when any order in its trace would have
+    # been rejected by PaperExchange — those runs take the scalar loop
+    if hasattr(strategy, "signals_vec") and prices:
+        soa = prices_to_soa(prices)
+        if all(np.isfinite(soa[k]).all() for k in ("o", "h", "l", "c", "v")):
+            vec_result = _run_backtest_vectorized(
+                soa, strategy, fee, initial_balance=PaperExchange(taker_fee=fee).balance
+            )
+            if vec_result is not None:
+                return vec_result
+
     exchange = PaperExchange(taker_fee=fee)
-    equity_curve = []
     trades: list[dict[str, Any]] = []
 
     initial_balance = exchange.balance
     total_bars = len(prices)
 
-    for i, (ts, o, h, low, c, v) in enumerate(prices):
-        # Progress callback
-        if progress_cb and i % 1000 == 0:
+    # Preallocate the equity curve as one contiguous float64 buffer (8·N
+    # bytes instead of N boxed PyFloats); invalid bars are skipped, so track
+    # the fill count and trim once at the end instead of growing per bar
+    equity_curve = np.empty(total_bars, dtype=np.float64)
+    equity_count = 0
+
+    # Win tracking happens inside the bar loop; drawdown is computed in one
+    # vectorized pass over the finished equity curve below
+    winning_trades = 0
+    closed_trades = 0
+    last_entry_price = 0.0
+
+    # Convert to SoA columns once: the loop reads plain Python scalars out
+    # of column lists instead of indexing/destructuring a tuple per bar, and
+    # the NaN/inf screen becomes a single vectorized mask
+    cols = prices_to_soa(prices)
+    valid_mask = np.ones(total_bars, dtype=bool)
+    for key in ("o", "h", "l", "c", "v"):
+        valid_mask &= np.isfinite(cols[key])
+
+    bar_rows = zip(
+        cols["ts"].astype(np.int64).tolist(),
+        cols["o"].tolist(),
+        cols["h"].tolist(),
+        cols["l"].tolist(),
+        cols["c"].tolist(),
+        cols["v"].tolist(),
+        valid_mask.tolist(),
+    )
+
+    for i, (ts, o, h, low, c, v, ok) in enumerate(bar_rows):
+        # Progress callback, sampled so 999/1000 bars pay only the modulo
+        if progress_cb and i % progress_every == 0:
             progress_cb(i, total_bars)
-        
-        # Safety check for NaN/inf values
-        if any(not isinstance(x, (int, float)) or x != x or x == float('inf') or x == float('-inf') 
-               for x in [o, h, low, c, v]):
+
+        if not ok:
             if verbose:
                 print(f"[engine] Warning: Invalid values at bar {i}: o={o}, h={h}, l={low}, c={c}, v={v}")
             continue
@@ -53,6 +238,7 @@ def run_backtest(
             quantity = 1.0  # Simple position sizing
             result = exchange.market_order("buy", quantity, c, ts)
             if result.success:
+                last_entry_price = c
                 trades.append(
                     {
                         "timestamp": ts,
@@ -67,6 +253,9 @@ def run_backtest(
             quantity = exchange.position.quantity
             result = exchange.market_order("sell", quantity, c, ts)
             if result.success:
+                closed_trades += 1
+                if c > last_entry_price:
+                    winning_trades += 1
                 trades.append(
                     {
                         "timestamp": ts,
@@ -78,58 +267,185 @@ def run_backtest(
 
         # Calculate current equity
         current_equity = exchange.balance + exchange.position.quantity * c
-        equity_curve.append(current_equity)
+        equity_curve[equity_count] = current_equity
+        equity_count += 1
+
+    if equity_count < total_bars:
+        equity_curve = equity_curve[:equity_count]
+
+    # Max drawdown: running peak via np.maximum.accumulate (seeded with the
+    # initial balance) instead of a Python loop over the curve
+    if equity_count:
+        peaks = np.maximum.accumulate(np.concatenate(([initial_balance], equity_curve)))[1:]
+        max_dd = float(((peaks - equity_curve) / peaks).max())
+    else:
+        max_dd = 0.0
 
     # Calculate metrics
-    final_equity = equity_curve[-1] if equity_curve else initial_balance
+    final_equity = float(equity_curve[-1]) if equity_count else initial_balance
     gross_pnl = final_equity - initial_balance
     total_fees = exchange.get_total_fees()
     net_pnl = gross_pnl - total_fees
 
-    # Calculate win rate
-    winning_trades = 0
-    total_trades = len(trades) // 2  # Each trade has buy and sell
-
-    for i in range(0, len(trades) - 1, 2):
-        if i + 1 < len(trades):
-            buy_trade = trades[i]
-            sell_trade = trades[i + 1]
-            if sell_trade["price"] > buy_trade["price"]:
-                winning_trades += 1
-
-    win_rate = winning_trades / total_trades if total_trades > 0 else 0.0
-
-    # Calculate max drawdown
-    max_dd = 0.0
-    peak = initial_balance
-    for equity in equity_curve:
-        if equity > peak:
-            peak = equity
-        drawdown = (peak - equity) / peak
-        max_dd = max(max_dd, drawdown)
+    win_rate = winning_trades / closed_trades if closed_trades > 0 else 0.0
 
+    # Keys in sorted order: callers print/serialize metrics without re-sorting
     metrics = {
-        "trades": len(trades),
+        "final_equity": final_equity,
         "gross_pnl": gross_pnl,
-        "total_fees": total_fees,
-        "net_pnl": net_pnl,
-        "win_rate": win_rate,
-        "max_dd": max_dd,
         "initial_balance": initial_balance,
-        "final_equity": final_equity,
+        "max_dd": max_dd,
+        "net_pnl": net_pnl,
         "return_pct": (final_equity - initial_balance) / initial_balance * 100,
+        "total_fees": total_fees,
+        "trades": len(trades),
+        "win_rate": win_rate,
     }
 
     return metrics, equity_curve
 
 
+def _collect_onebar_signals(
+    bars: BarsInput,
+    strategy: Strategy,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    progress_every: int = 1000,
+) -> np.ndarray:
+    """Collect per-bar one-bar signals into a contiguous int8 vector.
+
+    History grows incrementally: bar t-1 is appended before computing the
+    signal at t, so the strategy always sees history < t (no look-ahead)
+    without rebuilding/copying the list on every iteration.
+    """
+    total_bars = len(bars)
+    sigs = np.zeros(total_bars, dtype=np.int8)
+
+    # Columnar inputs feed the batch fast paths directly; per-bar tuples are
+    # only materialized for scalar strategies that iterate history
+    if isinstance(bars, OHLCVColumns):
+        if hasattr(strategy, "signal_batch"):
+            history = np.column_stack(
+                (bars.ts, bars.open, bars.high, bars.low, bars.close, bars.volume)
+            )
+            return (strategy.signal_batch(history) == 1).astype(np.int8)
+        if hasattr(strategy, "signal_all"):
+            closes = np.ascontiguousarray(bars.close)
+            return (strategy.signal_all(closes) == 1).astype(np.int8)
+        norm = bars.to_bars()
+    # Normalize bar format once, outside the hot loop: tuples pass through,
+    # object-style bars are converted in a single comprehension
+    elif bars and not isinstance(bars[0], tuple):
+        norm: list[tuple[int, float, float, float, float]] = [
+            (bar.timestamp, bar.open, bar.high, bar.low, bar.close) for bar in bars
+        ]
+    else:
+        norm = bars  # type: ignore[assignment]
+
+    # Batch fast paths: strategies exposing signal_batch (full OHLC history)
+    # or signal_all (closes only) compute every prefix signal in one
+    # vectorized pass. One-bar mode only acts on buys, matching the
+    # `== "buy"` check in the scalar loop below.
+    if hasattr(strategy, "signal_batch"):
+        batch = strategy.signal_batch(norm)
+        return (batch == 1).astype(np.int8)
+
+    if hasattr(strategy, "signal_all"):
+        closes = np.asarray([bar[4] for bar in norm], dtype=np.float64)
+        batch = strategy.signal_all(closes)
+        return (batch == 1).astype(np.int8)
+
+    history: list[tuple[int, float, float, float, float]] = []
+    for t in range(1, total_bars):
+        # Progress callback, sampled like the close-mode loop
+        if progress_cb and t % progress_every == 0:
+            progress_cb(t, total_bars)
+        history.append(norm[t - 1])
+
+        if strategy.signal(history) == "buy":  # type: ignore
+            sigs[t] = 1
+    return sigs
+
+
+def run_backtest_onebar_batch(
+    bars: BarsInput,
+    strategies: list[Strategy],
+    fees: list[float],
+) -> list[dict[str, Any]]:
+    """Run one-bar backtests for every (strategy, fee) combination at once.
+
+    Signals are collected once per strategy, then all combinations are
+    evaluated in a single batched kernel call (parallelized across cores
+    with numba prange when numba is installed).
+
+    Args:
+        bars: List of OHLCV bars
+        strategies: Strategies with a signal() method
+        fees: Trading fee rates
+
+    Returns:
+        Metrics dicts in itertools.product(strategies, fees) order
+    """
+    n_combos = len(strategies) * len(fees)
+    if not bars:
+        return [
+            {"final_equity": 1000.0, "max_dd": 0.0, "pf": 0.0, "trades": 0}
+            for _ in range(n_combos)
+        ]
+
+    soa = prices_to_soa(bars)
+    opens, closes = soa["o"], soa["c"]
+    invalid = ~(np.isfinite(opens) & np.isfinite(closes))
+
+    strategy_sigs = []
+    for strategy in strategies:
+        sigs = _collect_onebar_signals(bars, strategy)
+        if invalid.any():
+            sigs[invalid] = 0
+        strategy_sigs.append(sigs)
+
+    sigs_matrix = np.empty((n_combos, len(bars)), dtype=np.int8)
+    fee_arr = np.empty(n_combos, dtype=np.float64)
+    k = 0
+    for sigs in strategy_sigs:
+        for fee in fees:
+            sigs_matrix[k] = sigs
+            fee_arr[k] = fee
+            k += 1
+
+    finals, trade_counts, profit_sums, loss_sums, max_dds = _onebar_loop_batch(
+        opens, closes, sigs_matrix, fee_arr
+    )
+
+    results = []
+    for k in range(n_combos):
+        trade_count = int(trade_counts[k])
+        if trade_count == 0:
+            results.append(
+                {"final_equity": float(finals[k]), "max_dd": 0.0, "pf": 0.0, "trades": 0}
+            )
+            continue
+        profit_sum, loss_sum = profit_sums[k], loss_sums[k]
+        pf = profit_sum / loss_sum if loss_sum > 0 else float("inf") if profit_sum > 0 else 0
+        results.append(
+            {
+                "final_equity": float(finals[k]),
+                "max_dd": float(max_dds[k]),
+                "pf": float(pf),
+                "trades": trade_count,
+            }
+        )
+    return results
+
+
 def run_backtest_onebar(
-    bars: list[OHLCVBar],
+    bars: BarsInput,
     strategy: Strategy,
     fee: float = 0.001,
     verbose: bool = False,
     progress_cb: Optional[Callable[[int, int], None]] = None,
-) -> tuple[dict[str, Any], list[float]]:
+    progress_every: int = 1000,
+    signals: Optional[np.ndarray] = None,
+) -> tuple[dict[str, Any], np.ndarray]:
     """Run one-bar backtest on historical data.
 
     In one-bar mode, signals are calculated using history < t (no look-ahead).
@@ -141,105 +457,64 @@ def run_backtest_onebar(
         strategy: Trading strategy with signal() method
         fee: Trading fee rate
         verbose: Enable verbose logging
-        progress_cb: Progress callback function(current, total)
+        progress_cb: Progress callback function(current, total), invoked
+            every progress_every bars (not per bar)
+        progress_every: Bars between progress callback invocations
+        signals: Optional precomputed per-bar signal array (len(bars),
+            int8, +1/-1/0). When given, the strategy is not consulted —
+            sweeps that share indicator prefixes across parameter sets
+            compute signals once outside the engine. The array may be
+            modified in place (invalid-price bars are zeroed)
 
     Returns:
-        Tuple of (metrics dict, equity curve)
+        Tuple of (metrics dict, equity curve as a float64 array)
     """
-    equity_curve = [1000.0]  # Starting equity
-    trades: list[dict[str, Any]] = []
     total_bars = len(bars)
+    if total_bars == 0:
+        return {"final_equity": 1000.0, "max_dd": 0.0, "pf": 0.0, "trades": 0}, np.array([1000.0])
+
+    if signals is not None:
+        sigs = np.ascontiguousarray(signals, dtype=np.int8)
+    else:
+        sigs = _collect_onebar_signals(bars, strategy, progress_cb, progress_every)
+
+    # Extract price columns and screen invalid values before the kernel
+    soa = prices_to_soa(bars)
+    opens, closes = soa["o"], soa["c"]
+    invalid = ~(np.isfinite(opens) & np.isfinite(closes))
+    if invalid.any():
+        if verbose:
+            for t in np.nonzero(invalid & (sigs == 1))[0]:
+                print(
+                    f"[engine] Warning: Invalid prices at bar {t}: "
+                    f"entry={opens[t]}, exit={closes[t]}"
+                )
+        sigs[invalid] = 0
 
-    for t in range(1, len(bars)):
-        # Progress callback
-        if progress_cb and t % 1000 == 0:
-            progress_cb(t, total_bars)
-        # Get signal using history < t (no look-ahead)
-        # Handle both tuple and OHLCVBar formats
-        history = []
-        for bar in bars[:t]:
-            if isinstance(bar, tuple):
-                history.append(bar)  # Already in correct format
-            else:
-                history.append((bar.timestamp, bar.open, bar.high, bar.low, bar.close))
-
-        signal = strategy.signal(history)  # type: ignore
-
-        if signal == "buy":
-            # Enter at open[t], exit at close[t]
-            current_bar = bars[t]
-            if isinstance(current_bar, tuple):
-                entry_price = current_bar[1]  # open
-                exit_price = current_bar[4]  # close
-            else:
-                entry_price = current_bar.open
-                exit_price = current_bar.close
-
-            # Safety check for NaN/inf values
-            if any(not isinstance(x, (int, float)) or x != x or x == float('inf') or x == float('-inf') 
-                   for x in [entry_price, exit_price]):
-                if verbose:
-                    print(f"[engine] Warning: Invalid prices at bar {t}: entry={entry_price}, exit={exit_price}")
-                continue
-
-            # Calculate PnL with commission both ways
-            pnl = (exit_price - entry_price) / entry_price
-            commission_cost = fee * 2  # Entry + exit
-            net_pnl = pnl - commission_cost
-
-            # Update equity
-            new_equity = equity_curve[-1] * (1 + net_pnl)
-            equity_curve.append(new_equity)
-
-            trades.append(
-                {
-                    "timestamp": (
-                        current_bar[0] if isinstance(current_bar, tuple) else current_bar.timestamp
-                    ),
-                    "entry_price": entry_price,
-                    "exit_price": exit_price,
-                    "pnl": pnl,
-                    "net_pnl": net_pnl,
-                    "commission": commission_cost,
-                }
-            )
-        else:
-            # No trade, equity stays same
-            equity_curve.append(equity_curve[-1])
+    # Tight PnL/equity loop (numba-compiled when available); the curve stays
+    # a contiguous float64 array — no per-bar PyFloat boxing via tolist()
+    equity_curve, trade_count, profit_sum, loss_sum, max_dd = _onebar_loop(
+        opens, closes, sigs, fee
+    )
+    final_equity = float(equity_curve[-1])
 
     # Calculate metrics
-    if not trades:
+    if trade_count == 0:
         return {
-            "trades": 0,
-            "final_equity": equity_curve[-1],
-            "pf": 0.0,
+            "final_equity": final_equity,
             "max_dd": 0.0,
+            "pf": 0.0,
+            "trades": 0,
         }, equity_curve
 
-    # Profit Factor calculation
-    profit_trades = [t["net_pnl"] for t in trades if t["net_pnl"] > 0]
-    loss_trades = [t["net_pnl"] for t in trades if t["net_pnl"] < 0]
-
-    profit_sum = sum(profit_trades) if profit_trades else 0
-    loss_sum = abs(sum(loss_trades)) if loss_trades else 0
-
     pf = profit_sum / loss_sum if loss_sum > 0 else float("inf") if profit_sum > 0 else 0
 
-    # Max drawdown
-    peak = equity_curve[0]
-    max_dd = 0.0
-    for equity in equity_curve:
-        if equity > peak:
-            peak = equity
-        dd = (peak - equity) / peak
-        if dd > max_dd:
-            max_dd = dd
-
+    # Keys in sorted order: callers print/serialize metrics without re-sorting
     metrics = {
-        "trades": len(trades),
-        "final_equity": equity_curve[-1],
-        "pf": pf,
+        "final_equity": final_equity,
         "max_dd": max_dd,
+        "pf": pf,
+        "trades": trade_count,
     }
 
     return metrics, equity_curve
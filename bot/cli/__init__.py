@@ -0,0 +1 @@
+"""Shared helpers for the CLI entry points in scripts/."""
@@ -0,0 +1,129 @@
+"""Result formatting and CSV output shared by the backtest CLIs.
+
+scripts/backtest.py (single run) and scripts/backtest_sweep.py (grid
+sweep) used to carry their own copies of the metrics table, the unified
+result-row builder and the CSV writers. One module parses once, and
+output-path optimizations apply to every entry point at once.
+"""
+
+import csv
+from pathlib import Path
+
+# Directories already created by this process: repeated ensure_dir calls
+# (e.g. many appends in one sweep process) skip the stat+mkdir syscalls
+_ensured_dirs: set[Path] = set()
+
+
+def ensure_dir(p: Path) -> None:
+    """mkdir -p with a per-process cache of already-ensured directories."""
+    if p not in _ensured_dirs:
+        p.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(p)
+
+
+def format_metrics_table(metrics: dict, mode: str) -> str:
+    """Format metrics as a human-readable table.
+
+    Rows follow the dict order; the engine returns metrics already
+    key-sorted, so the JSON dump and the table need no sort at all.
+    """
+    lines = [f"=== Backtest Results (mode={mode}) ==="]
+
+    # Format numeric values with appropriate precision
+    for key, value in metrics.items():
+        if isinstance(value, float):
+            if value == float("inf"):
+                formatted_value = "inf"
+            elif abs(value) < 0.001:
+                formatted_value = f"{value:.6f}"
+            elif abs(value) < 1:
+                formatted_value = f"{value:.3f}"
+            else:
+                formatted_value = f"{value:.2f}"
+        else:
+            formatted_value = str(value)
+
+        # Format key names nicely
+        display_key = key.replace("_", " ").title()
+        lines.append(f"{display_key:<15} {formatted_value}")
+
+    return "\n".join(lines)
+
+
+# CSV headers shared by the single-result and batch writers
+_CSV_HEADERS = (
+    "mode",
+    "bars",
+    "fee",
+    "threshold",
+    "seed",
+    "trades",
+    "final_equity",
+    "win_rate",
+    "pf",
+    "max_dd",
+    "return_pct",
+    "total_fees",
+)
+
+
+def unified_row(metrics: dict, mode: str, bars: int, fee: float, threshold: float) -> dict:
+    """Unify metrics to the standard CSV row format."""
+    return {
+        "mode": mode,
+        "bars": bars,
+        "fee": fee,
+        "threshold": threshold,
+        "seed": 42,  # Fixed seed for consistency
+        "trades": metrics.get("trades", 0),
+        "final_equity": metrics.get("final_equity", 0.0),
+        "win_rate": metrics.get("win_rate", ""),
+        "pf": metrics.get("pf", ""),
+        "max_dd": metrics.get("max_dd", 0.0),
+        "return_pct": metrics.get("return_pct", ""),
+        "total_fees": metrics.get("total_fees", ""),
+    }
+
+
+def save_single_result_csv(
+    metrics: dict,
+    mode: str,
+    bars: int,
+    fee: float,
+    threshold: float,
+    output_path: Path,
+    append: bool = False,
+) -> None:
+    """Save single backtest result to CSV."""
+    save_many_results_csv([unified_row(metrics, mode, bars, fee, threshold)], output_path, append)
+
+
+def save_many_results_csv(rows: list[dict], output_path: Path, append: bool = False) -> None:
+    """Write unified result rows in one open/writerows call.
+
+    Plain csv.writer over the module-level header tuple: sweeps appending
+    one row per combination skip DictWriter's per-row field mapping, and
+    batch callers amortize the open/close over all rows.
+    """
+    # Create directory if needed
+    ensure_dir(output_path.parent)
+
+    # In append mode, open with "x" first: success means the file is new
+    # and needs a header, FileExistsError means append without one. The
+    # open replaces the separate exists() stat per call
+    if append:
+        try:
+            f = open(output_path, "x", newline="", encoding="utf-8")
+            write_header = True
+        except FileExistsError:
+            f = open(output_path, "a", newline="", encoding="utf-8")
+            write_header = False
+    else:
+        f = open(output_path, "w", newline="", encoding="utf-8")
+        write_header = True
+
+    with f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(_CSV_HEADERS)
+        writer.writerows([row.get(h, "") for h in _CSV_HEADERS] for row in rows)
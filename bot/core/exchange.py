@@ -3,12 +3,12 @@
 from dataclasses import dataclass
 from typing import Literal, Protocol
 
-from bot.core.rules import round_price, round_qty, validate_notional
+from bot.core.rules import apply_order_rules
 
 Side = Literal["buy", "sell"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Order representation."""
 
@@ -18,7 +18,7 @@ class Order:
     timestamp: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Fill:
     """Order fill representation."""
 
@@ -29,7 +29,7 @@ class Fill:
     timestamp: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Position representation."""
 
@@ -38,7 +38,7 @@ class Position:
     unrealized_pnl: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Order execution result."""
 
@@ -70,6 +70,7 @@ class PaperExchange:
         self.position = Position(quantity=0.0, avg_price=0.0)
         self.fills: list[Fill] = []
         self.balance = 10000.0  # Starting balance
+        self.realized_pnl = 0.0
 
     def market_order(
         self, side: Side, quantity: float, price: float, timestamp: int
@@ -85,11 +86,9 @@ class PaperExchange:
         Returns:
             Execution result
         """
-        # Apply exchange rules: rounding and validation
+        # Apply exchange rules: rounding and validation in one fused pass
         try:
-            validate_notional(quantity, price)
-            quantity = round_qty(quantity)
-            price = round_price(price)
+            quantity, price = apply_order_rules(quantity, price)
         except ValueError as e:
             return ExecutionResult(success=False, error=str(e))
 
@@ -132,6 +131,7 @@ class PaperExchange:
 
             self.position.quantity -= quantity
             self.balance += net_proceeds
+            self.realized_pnl += (price - self.position.avg_price) * quantity
 
         # Create fill
         order = Order(side=side, quantity=quantity, price=price, timestamp=timestamp)
@@ -150,19 +150,13 @@ class PaperExchange:
         Returns:
             Total PnL (realized + unrealized)
         """
-        realized_pnl = sum(
-            fill.order.side == "sell" and fill.price - self.position.avg_price
-            for fill in self.fills
-            if fill.order.side == "sell"
-        )
-
         unrealized_pnl = (
             (current_price - self.position.avg_price) * self.position.quantity
             if self.position.quantity > 0
             else 0.0
         )
 
-        return realized_pnl + unrealized_pnl
+        return self.realized_pnl + unrealized_pnl
 
     def get_total_fees(self) -> float:
         """Get total fees paid."""
@@ -1,5 +1,36 @@
 """Exchange rules helpers."""
 
+import numpy as np
+
+
+def round_price_array(prices: np.ndarray, tick_size: float = 0.01) -> np.ndarray:
+    """Round a batch of prices to the nearest tick size.
+
+    Uses np.rint (half-to-even, same as round()) in a single branchless
+    ufunc pass over the whole array.
+
+    Args:
+        prices: Array of prices to round.
+        tick_size: The minimum price movement (default is 0.01).
+
+    Returns:
+        Array of rounded prices.
+    """
+    return np.rint(np.asarray(prices, dtype=np.float64) / tick_size) * tick_size
+
+
+def round_qty_array(quantities: np.ndarray, step_size: float = 0.01) -> np.ndarray:
+    """Round a batch of quantities to the nearest step size.
+
+    Args:
+        quantities: Array of quantities to round.
+        step_size: The minimum order size (default is 0.01).
+
+    Returns:
+        Array of rounded quantities.
+    """
+    return np.rint(np.asarray(quantities, dtype=np.float64) / step_size) * step_size
+
 
 def round_price(price: float, tick_size: float = 0.01) -> float:
     """Round price to nearest tick size.
@@ -27,6 +58,37 @@ def round_qty(quantity: float, step_size: float = 0.01) -> float:
     return round(quantity / step_size) * step_size
 
 
+def apply_order_rules(
+    quantity: float,
+    price: float,
+    tick_size: float = 0.01,
+    step_size: float = 0.01,
+    min_notional: float = 10.0,
+) -> tuple[float, float]:
+    """Validate and round an order in a single fused pass.
+
+    Combines validate_notional + round_qty + round_price into one call so
+    the hot order path pays a single function dispatch.
+
+    Args:
+        quantity: The quantity being ordered.
+        price: The price of the asset.
+        tick_size: The minimum price movement (default is 0.01).
+        step_size: The minimum order size (default is 0.01).
+        min_notional: The minimum notional value required (default is 10).
+
+    Returns:
+        Tuple of (rounded quantity, rounded price).
+
+    Raises:
+        ValueError: If the order's notional is less than the minimum.
+    """
+    notional = quantity * price
+    if notional < min_notional:
+        raise ValueError(f"Notional value of {notional} is below minimum required {min_notional}")
+    return round(quantity / step_size) * step_size, round(price / tick_size) * tick_size
+
+
 def validate_notional(quantity: float, price: float, min_notional: float = 10.0) -> None:
     """Validate that the order's notional meets the minimum requirement.
 
@@ -1,12 +1,31 @@
 """Historical OHLCV data source for real market data."""
 
 import csv
+import hashlib
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from bot.data.ohlcv_source import OHLCVColumns
+from bot.utils.timeframes import TIMEFRAME_SECONDS
+
 # OHLCV tuple: (timestamp, open, high, low, close, volume)
 OHLCVBar = tuple[int, float, float, float, float, int]
 
+# Cache directory for generated historical data (shared with real_source)
+CACHE_DIR = Path("data/cache")
+
+# On-disk layout of one cached bar; integer ts/volume round-trip exactly
+BAR_DTYPE = np.dtype(
+    [("ts", "i8"), ("o", "f8"), ("h", "f8"), ("l", "f8"), ("c", "f8"), ("v", "i8")]
+)
+
+# Single module-level generator for the scalar helpers; the batched path in
+# _generate_realistic_data uses its own per-range seeded Generator
+_rng = np.random.default_rng()
+
 
 class HistoricalOHLCV:
     """Historical OHLCV data source using real market data simulation."""
@@ -22,12 +41,13 @@ class HistoricalOHLCV:
         self.timeframe = timeframe
         self.data_cache: dict[str, list[OHLCVBar]] = {}
 
-    def load(self, tf: str, bars: int) -> list[OHLCVBar]:
+    def load(self, tf: str, bars: int, use_cache: bool = True) -> list[OHLCVBar]:
         """Load historical OHLCV data for the last 2 years.
 
         Args:
             tf: Timeframe (e.g., '15m', '1h', '4h', '1d')
             bars: Number of bars to load (ignored, loads last 2 years)
+            use_cache: Whether to reuse cached data (in-memory and on-disk)
 
         Returns:
             List of OHLCV bars for the last 2 years
@@ -36,16 +56,96 @@ class HistoricalOHLCV:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=730)  # 2 years
 
-        # Timeframe to seconds mapping
-        tf_seconds = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14400, "1d": 86400}
-
-        if tf not in tf_seconds:
+        # Single module-level mapping, no per-call dict rebuild
+        interval_seconds = TIMEFRAME_SECONDS.get(tf)
+        if interval_seconds is None:
             raise ValueError(f"Unsupported timeframe: {tf}")
 
-        interval_seconds = tf_seconds[tf]
+        # Cache key is day-granular: repeat loads within a day reuse the
+        # same data instead of regenerating it
+        cache_key = f"{self.symbol}_{tf}_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+        if use_cache:
+            if cache_key in self.data_cache:
+                return self.data_cache[cache_key]
+            cache_file = CACHE_DIR / f"historical_{cache_key}.npy"
+            if cache_file.exists():
+                bars_data = self._read_npy(cache_file)
+                self.data_cache[cache_key] = bars_data
+                return bars_data
 
         # Generate realistic historical data based on BTC patterns
-        return self._generate_realistic_data(start_date, end_date, interval_seconds)
+        bars_data = self._generate_realistic_data(start_date, end_date, interval_seconds)
+
+        if use_cache:
+            self._write_npy(CACHE_DIR / f"historical_{cache_key}.npy", bars_data)
+            self.data_cache[cache_key] = bars_data
+
+        return bars_data
+
+    def load_arrays(self, tf: str, bars: int) -> OHLCVColumns:
+        """Load the same 2-year series as load(), as struct-of-arrays columns.
+
+        When the structured .npy cache exists, its mmap'd columns are
+        wrapped directly — no per-bar tuple materialization at all. On a
+        cache miss the data is generated through load() (which writes the
+        cache) and the columns are taken from the fresh file.
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=730)  # 2 years
+        cache_key = f"{self.symbol}_{tf}_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+        cache_file = CACHE_DIR / f"historical_{cache_key}.npy"
+        if not cache_file.exists():
+            bars_data = self.load(tf, bars)
+            if not cache_file.exists():  # pragma: no cover - cache disabled externally
+                return OHLCVColumns.from_bars(bars_data)
+        arr = np.load(cache_file, mmap_mode="r")
+        return OHLCVColumns(
+            ts=arr["ts"],
+            open=arr["o"],
+            high=arr["h"],
+            low=arr["l"],
+            close=arr["c"],
+            volume=arr["v"],
+        )
+
+    @staticmethod
+    def _read_npy(cache_file: Path) -> list[OHLCVBar]:
+        """Read cached bars from the structured .npy store.
+
+        mmap_mode maps the file instead of decompressing and copying it:
+        after the first run the OS page cache serves repeat loads, and
+        only the pages actually touched are read at all.
+        """
+        arr = np.load(cache_file, mmap_mode="r")
+        return list(
+            zip(
+                arr["ts"].tolist(),
+                arr["o"].tolist(),
+                arr["h"].tolist(),
+                arr["l"].tolist(),
+                arr["c"].tolist(),
+                arr["v"].tolist(),
+            )
+        )
+
+    @staticmethod
+    def _write_npy(cache_file: Path, bars_data: list[OHLCVBar]) -> None:
+        """Write bars to an uncompressed structured .npy store."""
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        arr = np.zeros(len(bars_data), dtype=BAR_DTYPE)
+        if bars_data:
+            raw = np.asarray(bars_data, dtype=np.float64)
+            arr["ts"] = raw[:, 0].astype(np.int64)
+            arr["o"] = raw[:, 1]
+            arr["h"] = raw[:, 2]
+            arr["l"] = raw[:, 3]
+            arr["c"] = raw[:, 4]
+            arr["v"] = raw[:, 5].astype(np.int64)
+        # Write-then-rename so concurrent readers never map a partial file
+        tmp_path = cache_file.with_suffix(f".npy.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp_path, cache_file)
 
     def _generate_realistic_data(
         self, start_date: datetime, end_date: datetime, interval_seconds: int
@@ -69,99 +169,86 @@ class HistoricalOHLCV:
             (datetime.now(), 100000.0),  # Current price
         ]
 
-        bars_data = []
-        current_timestamp = int(start_date.timestamp())
+        start_timestamp = int(start_date.timestamp())
         end_timestamp = int(end_date.timestamp())
 
-        # Interpolate price between milestones
-        current_price = 20000.0
-        price_trend = 0.0  # Daily price change trend
-
-        while current_timestamp <= end_timestamp:
-            # Find current price based on milestones
-            current_date = datetime.fromtimestamp(current_timestamp)
-            current_price = self._get_price_at_date(current_date, price_milestones)
-
-            # Add realistic volatility
-            daily_volatility = 0.03  # 3% daily volatility
-            price_change = self._generate_price_change(daily_volatility, price_trend)
-
-            new_price = current_price * (1 + price_change)
-
-            # Generate OHLC from price movement
-            open_price = current_price
-            close_price = new_price
-
-            # High and low with realistic intraday movement
-            intraday_range = abs(price_change) * 0.6  # 60% of daily move
-            high_price = max(open_price, close_price) * (1 + intraday_range * 0.3)
-            low_price = min(open_price, close_price) * (1 - intraday_range * 0.3)
-
-            # Generate realistic volume (higher during volatile periods)
-            base_volume = 1000000  # Base volume
-            volatility_multiplier = 1 + abs(price_change) * 3
-            volume = int(
-                base_volume * volatility_multiplier * self._get_volume_factor(current_date)
+        timestamps = np.arange(
+            start_timestamp, end_timestamp + 1, interval_seconds, dtype=np.int64
+        )
+        n = len(timestamps)
+        if n == 0:
+            return []
+
+        # Deterministic per-range seed (same scheme as SyntheticOHLCV)
+        seed_str = f"{self.symbol}-{self.timeframe}-{start_timestamp}-{end_timestamp}"
+        seed = int.from_bytes(hashlib.blake2b(seed_str.encode(), digest_size=8).digest(), "little")
+        rng = np.random.default_rng(seed)
+
+        # Anchor prices: interpolate all bars between milestones in one pass
+        milestone_ts = np.array([int(d.timestamp()) for d, _ in price_milestones])
+        milestone_px = np.array([p for _, p in price_milestones])
+        anchor_prices = np.interp(timestamps, milestone_ts, milestone_px)
+
+        # Add realistic volatility (3% daily) as one batched draw
+        price_changes = rng.normal(0.0, 0.03, n)
+
+        open_prices = anchor_prices
+        close_prices = anchor_prices * (1 + price_changes)
+
+        # High and low with realistic intraday movement (60% of daily move)
+        intraday_range = np.abs(price_changes) * 0.6
+        high_prices = np.maximum(open_prices, close_prices) * (1 + intraday_range * 0.3)
+        low_prices = np.minimum(open_prices, close_prices) * (1 - intraday_range * 0.3)
+
+        # Volume: higher during volatile periods and stress months (Mar/Oct)
+        months = timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(int) % 12 + 1
+        u = rng.uniform(0.0, 1.0, n)
+        volume_factor = np.where(
+            (months == 3) | (months == 10),
+            1.2 + 0.6 * u,
+            np.where((months == 12) | (months == 1), 0.8 + 0.4 * u, 0.9 + 0.2 * u),
+        )
+        volatility_multiplier = 1 + np.abs(price_changes) * 3
+        volumes = (1000000 * volatility_multiplier * volume_factor).astype(np.int64)
+
+        return list(
+            zip(
+                timestamps.tolist(),
+                np.round(open_prices, 2).tolist(),
+                np.round(high_prices, 2).tolist(),
+                np.round(low_prices, 2).tolist(),
+                np.round(close_prices, 2).tolist(),
+                volumes.tolist(),
             )
-
-            bars_data.append(
-                (
-                    current_timestamp,
-                    round(open_price, 2),
-                    round(high_price, 2),
-                    round(low_price, 2),
-                    round(close_price, 2),
-                    volume,
-                )
-            )
-
-            current_price = new_price
-            current_timestamp += interval_seconds
-
-        return bars_data
+        )
 
     def _get_price_at_date(self, date: datetime, milestones: list) -> float:
         """Get interpolated price at specific date."""
-        for i, (milestone_date, price) in enumerate(milestones):
-            if date <= milestone_date:
-                if i == 0:
-                    return price
-                # Interpolate between previous and current milestone
-                prev_date, prev_price = milestones[i - 1]
-                days_diff = (milestone_date - prev_date).days
-                if days_diff == 0:
-                    return price
-
-                current_days = (date - prev_date).days
-                price_diff = price - prev_price
-                interpolated_price = prev_price + (price_diff * current_days / days_diff)
-                return interpolated_price
-
-        return milestones[-1][1]  # Return last price if beyond milestones
+        milestone_ts = np.array([m[0].timestamp() for m in milestones])
+        milestone_px = np.array([m[1] for m in milestones])
+        # np.interp clamps to the boundary prices outside the milestone range
+        return float(np.interp(date.timestamp(), milestone_ts, milestone_px))
 
     def _generate_price_change(self, volatility: float, trend: float) -> float:
         """Generate realistic price change."""
-        import random
-
         # Random walk with trend
-        random_component = random.gauss(0, volatility)
+        random_component = _rng.normal(0, volatility)
         trend_component = trend * 0.1  # Small trend influence
 
         return random_component + trend_component
 
     def _get_volume_factor(self, date: datetime) -> float:
         """Get volume factor based on market conditions."""
-        import random
-
         # Higher volume during market stress periods
         if date.month in [3, 10]:  # March and October often volatile
-            return random.uniform(1.2, 1.8)
+            return _rng.uniform(1.2, 1.8)
         elif date.month in [12, 1]:  # December and January
-            return random.uniform(0.8, 1.2)
+            return _rng.uniform(0.8, 1.2)
         else:
-            return random.uniform(0.9, 1.1)
+            return _rng.uniform(0.9, 1.1)
 
-    def save_to_csv(self, data: list[OHLCVBar], filename: str = "historical_data.csv"):
+    @staticmethod
+    def save_to_csv(data: list[OHLCVBar], filename: str = "historical_data.csv"):
         """Save historical data to CSV file."""
         output_path = Path("user_data") / filename
         output_path.parent.mkdir(exist_ok=True)
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import Protocol, Any
+from collections.abc import Callable
+from typing import Protocol
 
 OHLCV = tuple[int, float, float, float, float, int]
 
@@ -14,43 +15,62 @@ class Source(Protocol):
     ) -> list[OHLCV]: ...
 
 
+def _load_historical(**kwargs) -> list[OHLCV]:
+    from bot.data.historical_source import HistoricalOHLCV
+
+    return HistoricalOHLCV().load(**kwargs)
+
+
+def _load_real(**kwargs) -> list[OHLCV]:
+    from bot.data import real_source
+
+    # SoA fetch path: columns arrive as NumPy arrays, so converting to the
+    # OHLCV tuple format is a zip of scalars with no DataFrame round-trip
+    cols = real_source.fetch_binance_ohlcv_np(**kwargs)
+    return list(
+        zip(
+            (cols["timestamp"] // 1000).tolist(),
+            cols["open"].tolist(),
+            cols["high"].tolist(),
+            cols["low"].tolist(),
+            cols["close"].tolist(),
+            cols["volume"].astype("int64").tolist(),
+        )
+    )
+
+
+def _load_synthetic(**kwargs) -> list[OHLCV]:
+    from bot.data.ohlcv_source import SyntheticOHLCV
+
+    return SyntheticOHLCV(seed=42).load(**kwargs)
+
+
+# Single dispatch table: every consumer of named sources goes through this
+_LOADERS: dict[str, Callable[..., list[OHLCV]]] = {
+    "historical": _load_historical,
+    "real": _load_real,
+    "synthetic": _load_synthetic,
+}
+
+
 def load_data(source: str = "historical", **kwargs) -> list[OHLCV]:
     """Load data from specified source.
-    
+
     Args:
         source: Data source ("historical", "real", "synthetic")
         **kwargs: Additional parameters for data loading
-        
+
     Returns:
         List of OHLCV bars
-        
+
     Raises:
         ValueError: If unknown data source is specified
     """
-    if source == "historical":
-        from bot.data import historical_source
-        return historical_source.load(**kwargs)
-    elif source == "real":
-        from bot.data import real_source
-        # Convert DataFrame to OHLCV format
-        df = real_source.fetch_binance_ohlcv(**kwargs)
-        return [
-            (
-                int(row["timestamp"].timestamp()),
-                float(row["open"]),
-                float(row["high"]),
-                float(row["low"]),
-                float(row["close"]),
-                int(row["volume"])
-            )
-            for _, row in df.iterrows()
-        ]
-    elif source == "synthetic":
-        from bot.data.ohlcv_source import SyntheticOHLCV
-        synthetic = SyntheticOHLCV(seed=42)
-        return synthetic.load(**kwargs)
-    else:
-        raise ValueError(f"Unknown data source: {source}")
+    try:
+        loader = _LOADERS[source]
+    except KeyError:
+        raise ValueError(f"Unknown data source: {source}") from None
+    return loader(**kwargs)
 
 
 def get_source(kind: str | None = None) -> Source:
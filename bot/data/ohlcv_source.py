@@ -1,13 +1,116 @@
 """OHLCV data sources."""
 
 import hashlib
-import random
+from dataclasses import dataclass
 from typing import Protocol
 
+import numpy as np
+
+from bot.backtest._jit import njit
+from bot.utils.timeframes import TIMEFRAME_SECONDS
+
 # OHLCV tuple: (timestamp, open, high, low, close, volume)
 OHLCVBar = tuple[int, float, float, float, float, int]
 
 
+@dataclass(slots=True, eq=False)
+class OHLCVColumns:
+    """Struct-of-arrays OHLCV view: one contiguous column per field.
+
+    Columnar layout lets vectorized consumers (SMA/threshold strategies,
+    the backtest engine) touch only the columns they read instead of
+    re-iterating per-bar tuples.
+
+    eq=False keeps identity comparison and hashing: the generated
+    field-wise __eq__ would be ambiguous on ndarrays, and identity
+    hashing lets a shared column set serve as a cache key.
+    """
+
+    ts: np.ndarray  # int64
+    open: np.ndarray  # float64
+    high: np.ndarray  # float64
+    low: np.ndarray  # float64
+    close: np.ndarray  # float64
+    volume: np.ndarray  # int64
+
+    def __len__(self) -> int:
+        return self.ts.shape[0]
+
+    def __getitem__(self, s: slice) -> "OHLCVColumns":
+        """Slice all six columns at once (zero-copy numpy views)."""
+        return OHLCVColumns(
+            ts=self.ts[s],
+            open=self.open[s],
+            high=self.high[s],
+            low=self.low[s],
+            close=self.close[s],
+            volume=self.volume[s],
+        )
+
+    @classmethod
+    def from_bars(cls, bars: list[OHLCVBar]) -> "OHLCVColumns":
+        """Split the legacy list-of-tuples format into contiguous columns."""
+        arr = np.asarray(bars, dtype=np.float64)
+        if arr.size == 0:
+            arr = arr.reshape(0, 6)
+        return cls(
+            ts=arr[:, 0].astype(np.int64),
+            open=np.ascontiguousarray(arr[:, 1]),
+            high=np.ascontiguousarray(arr[:, 2]),
+            low=np.ascontiguousarray(arr[:, 3]),
+            close=np.ascontiguousarray(arr[:, 4]),
+            volume=arr[:, 5].astype(np.int64),
+        )
+
+    def to_bars(self) -> list[OHLCVBar]:
+        """Materialize the columns as the legacy list-of-tuples format."""
+        return list(
+            zip(
+                self.ts.tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+            )
+        )
+
+
+@njit(cache=True)
+def _mean_reversion_walk(
+    changes: np.ndarray, base_price: float, floor_price: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run the state-dependent random walk over pre-drawn change draws.
+
+    The mean-reversion branch makes each step depend on the running price,
+    so this stays a sequential loop — but over a contiguous float64 array
+    with no RNG calls inside, which numba can compile when available.
+
+    Returns:
+        (prices, effective_changes) where prices has n+1 entries (the
+        leading base price plus one close per bar) and effective_changes
+        holds the per-bar change after the mean-reversion damping.
+    """
+    n = changes.shape[0]
+    prices = np.empty(n + 1)
+    eff = np.empty(n)
+    prices[0] = base_price
+    price = base_price
+    for i in range(n):
+        ch = changes[i]
+        if abs(price - base_price) > base_price * 0.1:
+            # Mean reversion when price deviates too much
+            ch = ch * -0.5
+        new_price = price * (1.0 + ch)
+        # Ensure price stays positive
+        if new_price < floor_price:
+            new_price = floor_price
+        eff[i] = ch
+        prices[i + 1] = new_price
+        price = new_price
+    return prices, eff
+
+
 class OHLCVSource(Protocol):
     """OHLCV data source interface."""
 
@@ -55,13 +158,20 @@ class SyntheticOHLCV:
         Returns:
             List of OHLCV bars
         """
-        # Timeframe to seconds mapping
-        tf_seconds = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14400, "1d": 86400}
+        return self.load_arrays(tf, bars=bars, start=start, end=end).to_bars()
 
-        if tf not in tf_seconds:
-            raise ValueError(f"Unsupported timeframe: {tf}")
+    def load_arrays(
+        self, tf: str, bars: int | None = None, start: str | None = None, end: str | None = None
+    ) -> OHLCVColumns:
+        """Generate synthetic OHLCV data as struct-of-arrays columns.
 
-        tf_sec = tf_seconds[tf]
+        Same parameters and determinism as load(), but returns the six
+        NumPy columns directly without materializing per-bar tuples.
+        """
+        # Single module-level mapping, no per-call dict rebuild
+        tf_sec = TIMEFRAME_SECONDS.get(tf)
+        if tf_sec is None:
+            raise ValueError(f"Unsupported timeframe: {tf}")
 
         # If start and end are provided, generate exactly for that range
         if start and end:
@@ -74,99 +184,62 @@ class SyntheticOHLCV:
             # Calculate number of bars needed
             n = int((end_ts - start_ts) // tf_sec) + 1
 
-            # Create deterministic seed for this specific range
+            # Create deterministic seed for this specific range; blake2b with
+            # an 8-byte digest skips md5's hexdigest/slice/int-parse round-trip
             seed_str = f"{self.symbol}-{tf}-{start_ts}-{end_ts}-{self.seed}"
-            range_seed = int(hashlib.md5(seed_str.encode()).hexdigest()[:8], 16)
-            random.seed(range_seed)
-
-            # Generate exactly n bars on the grid
-            bars_data = []
-            base_price = 100.0
-            current_price = base_price
-
-            for i in range(n):
-                timestamp = start_ts + i * tf_sec
-
-                # Random walk with some mean reversion
-                change_pct = random.gauss(0, 0.02)  # 2% volatility
-                if abs(current_price - base_price) > base_price * 0.1:
-                    # Mean reversion when price deviates too much
-                    change_pct *= -0.5
-
-                new_price = current_price * (1 + change_pct)
-
-                # Ensure price stays positive
-                new_price = max(new_price, base_price * 0.5)
-
-                # Generate OHLC from price movement
-                open_price = current_price
-                close_price = new_price
+            range_seed = int.from_bytes(
+                hashlib.blake2b(seed_str.encode(), digest_size=8).digest(), "little"
+            )
 
-                # High and low with some intraday volatility
-                intraday_vol = abs(change_pct) * 0.5
-                high_price = max(open_price, close_price) * (1 + intraday_vol)
-                low_price = min(open_price, close_price) * (1 - intraday_vol)
-
-                # Generate volume (random but correlated with price movement)
-                base_volume = 1000
-                volume_multiplier = 1 + abs(change_pct) * 2
-                volume = int(base_volume * volume_multiplier * random.uniform(0.5, 1.5))
-
-                bars_data.append(
-                    (timestamp, open_price, high_price, low_price, close_price, volume)
-                )
-
-                current_price = new_price
-
-            return bars_data
+            return self._generate(range_seed, n, start_ts, tf_sec)
 
         # Fallback: generate by bars count (original behavior)
         else:
-            # Reset seed for deterministic results
-            random.seed(self.seed)
-
             # Default bars if None
             if bars is None:
                 bars = 500
 
-            # Generate synthetic data using random walk
-            base_price = 100.0
-            current_price = base_price
-            timestamp = 1609459200  # 2021-01-01 00:00:00 UTC
-
-            bars_data = []
-
-            for i in range(bars):
-                # Random walk with some mean reversion
-                change_pct = random.gauss(0, 0.02)  # 2% volatility
-                if abs(current_price - base_price) > base_price * 0.1:
-                    # Mean reversion when price deviates too much
-                    change_pct *= -0.5
+            # 2021-01-01 00:00:00 UTC
+            return self._generate(self.seed, bars, 1609459200, tf_sec)
 
-                new_price = current_price * (1 + change_pct)
+    @staticmethod
+    def _generate(seed: int, n: int, start_ts: int, tf_sec: int) -> OHLCVColumns:
+        """Generate n bars of a seeded random walk, vectorized with NumPy.
 
-                # Ensure price stays positive
-                new_price = max(new_price, base_price * 0.5)
-
-                # Generate OHLC from price movement
-                open_price = current_price
-                close_price = new_price
-
-                # High and low with some intraday volatility
-                intraday_vol = abs(change_pct) * 0.5
-                high_price = max(open_price, close_price) * (1 + intraday_vol)
-                low_price = min(open_price, close_price) * (1 - intraday_vol)
-
-                # Generate volume (random but correlated with price movement)
-                base_volume = 1000
-                volume_multiplier = 1 + abs(change_pct) * 2
-                volume = int(base_volume * volume_multiplier * random.uniform(0.5, 1.5))
-
-                bars_data.append(
-                    (timestamp, open_price, high_price, low_price, close_price, volume)
-                )
-
-                current_price = new_price
-                timestamp += tf_sec
-
-            return bars_data
+        All random draws happen in two batched Generator calls; the only
+        remaining loop is the state-dependent walk in _mean_reversion_walk.
+        OHLC, volumes and timestamps are derived as whole-array operations.
+        """
+        if n <= 0:
+            empty_f = np.empty(0)
+            empty_i = np.empty(0, dtype=np.int64)
+            return OHLCVColumns(empty_i, empty_f, empty_f, empty_f, empty_f, empty_i.copy())
+
+        rng = np.random.default_rng(seed)
+        changes = rng.standard_normal(n) * 0.02  # 2% volatility
+        vol_noise = rng.uniform(0.5, 1.5, n)
+
+        base_price = 100.0
+        prices, eff = _mean_reversion_walk(changes, base_price, base_price * 0.5)
+
+        open_prices = prices[:-1]
+        close_prices = prices[1:]
+
+        # High and low with some intraday volatility
+        intraday_vol = np.abs(eff) * 0.5
+        high_prices = np.maximum(open_prices, close_prices) * (1 + intraday_vol)
+        low_prices = np.minimum(open_prices, close_prices) * (1 - intraday_vol)
+
+        # Volume: random but correlated with price movement
+        volumes = (1000 * (1 + np.abs(eff) * 2) * vol_noise).astype(np.int64)
+
+        timestamps = start_ts + np.arange(n, dtype=np.int64) * tf_sec
+
+        return OHLCVColumns(
+            ts=timestamps,
+            open=open_prices,
+            high=high_prices,
+            low=low_prices,
+            close=close_prices,
+            volume=volumes,
+        )
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import threading
 import time
 import pathlib
-from typing import Optional
+import random
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 import ccxt
 
@@ -15,15 +19,77 @@ import ccxt
 CACHE_DIR = pathlib.Path("data/cache")
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# In-process TTL memo shared by the API helpers: at most one REST
+# round-trip per (function, args) key per TTL window. Concurrent callers
+# coalesce on a per-key lock instead of issuing duplicate requests.
+_TTL_CACHE: dict[tuple, tuple[float, Any]] = {}
+_TTL_LOCKS: dict[tuple, threading.Lock] = {}
+_TTL_LOCKS_GUARD = threading.Lock()
 
+
+def _ttl_cache(ttl: float):
+    """Memoize a function in-process for ttl seconds per argument tuple.
+
+    Args:
+        ttl: Seconds a cached value stays fresh.
+
+    Returns:
+        Decorator wrapping the function with the TTL memo.
+    """
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrap(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            hit = _TTL_CACHE.get(key)
+            if hit is not None and time.monotonic() - hit[0] < ttl:
+                return hit[1]
+            with _TTL_LOCKS_GUARD:
+                lock = _TTL_LOCKS.setdefault(key, threading.Lock())
+            with lock:
+                # Re-check under the lock: a concurrent caller may have
+                # refreshed the entry while we waited
+                hit = _TTL_CACHE.get(key)
+                if hit is not None and time.monotonic() - hit[0] < ttl:
+                    return hit[1]
+                val = fn(*args, **kwargs)
+                _TTL_CACHE[key] = (time.monotonic(), val)
+                return val
+
+        return wrap
+
+    return deco
+
+
+# Shared exchange client: one instance keeps the underlying requests
+# Session (and its keep-alive TCP/TLS connections) across calls instead
+# of paying a fresh handshake per function
+_EX: ccxt.binance | None = None
+
+
+def _exchange() -> ccxt.binance:
+    """Return the shared ccxt Binance client, creating it on first use."""
+    global _EX
+    if _EX is None:
+        _EX = ccxt.binance({"enableRateLimit": True})
+    return _EX
+
+
+def reset_exchange() -> None:
+    """Drop the shared client so the next call builds a fresh one (tests)."""
+    global _EX
+    _EX = None
+
+
+@functools.lru_cache(maxsize=1024)
 def _cache_path(pair: str, timeframe: str, limit: int) -> pathlib.Path:
     """Generate cache file path for given parameters.
-    
+
     Args:
         pair: Trading pair (e.g., "BTC/USDT")
         timeframe: Timeframe (e.g., "15m")
         limit: Number of bars to fetch
-        
+
     Returns:
         Path to cache file
     """
@@ -31,61 +97,205 @@ def _cache_path(pair: str, timeframe: str, limit: int) -> pathlib.Path:
     return CACHE_DIR / f"binance_{safe}_{timeframe}_{limit}.parquet"
 
 
+# Names of cache files known to exist: seeded once at import, extended on
+# every write, so repeat lookups in a parameter sweep skip the stat syscall
+_CACHED_FILES = {p.name for p in CACHE_DIR.glob("*.parquet")}
+
+
+def _cache_hit(cache_file: pathlib.Path) -> bool:
+    """Check whether a cache file exists, preferring the in-memory set."""
+    return cache_file.name in _CACHED_FILES or cache_file.exists()
+
+
+@_ttl_cache(60)
 def fetch_binance_ohlcv(
-    pair: str = "BTC/USDT", 
-    timeframe: str = "15m", 
-    limit: int = 1000, 
-    use_cache: bool = True
+    pair: str = "BTC/USDT",
+    timeframe: str = "15m",
+    limit: int = 1000,
+    use_cache: bool = True,
+    columns: tuple[str, ...] | None = None,
+    since_ts: int | None = None,
 ) -> pd.DataFrame:
     """Fetch OHLCV data from Binance using ccxt.
-    
+
     Args:
         pair: Trading pair (e.g., "BTC/USDT")
         timeframe: Timeframe (e.g., "15m", "1h", "1d")
         limit: Number of bars to fetch (max 1000)
         use_cache: Whether to use cached data if available
-        
+        columns: Optional column projection, e.g. ("timestamp", "close").
+            On cache hits only the requested parquet column chunks are
+            decompressed; pass a tuple so the TTL memo can hash the key.
+        since_ts: Optional epoch-ms lower bound; on cache hits this is
+            pushed down to parquet row-group filtering.
+
     Returns:
-        DataFrame with columns: timestamp, open, high, low, close, volume
-        
+        DataFrame with columns: timestamp (int64 epoch-ms), open, high,
+        low, close, volume (or the requested projection). Use
+        as_datetime() for display paths that want a timezone-aware
+        timestamp column.
+
     Raises:
         Exception: If all retry attempts fail
     """
     cache_file = _cache_path(pair, timeframe, limit)
-    
+
     # Return cached data if available and requested
-    if use_cache and cache_file.exists():
+    if use_cache and _cache_hit(cache_file):
         print(f"[cache] Loading cached data from {cache_file}")
-        return pd.read_parquet(cache_file)
-    
-    # Initialize Binance exchange
-    ex = ccxt.binance({"enableRateLimit": True})
-    
+        filters = [("timestamp", ">=", since_ts)] if since_ts is not None else None
+        return pd.read_parquet(
+            cache_file, columns=list(columns) if columns else None, filters=filters
+        )
+
+    cols = _decode_bars(_fetch_raw(pair, timeframe, limit))
+
+    # Build the DataFrame from ready-made columns: dict-of-arrays
+    # construction skips pandas' per-element dtype inference pass, and the
+    # timestamp stays int64 ms — no datetime round-trip for cache-bound data
+    df = pd.DataFrame(cols)
+
+    # Cache the data if requested (always the full frame, so later calls
+    # with a different projection still hit)
+    if use_cache:
+        _write_cache(df, cache_file)
+
+    # Apply the same projection/filter to fresh fetches for parity with
+    # the cache-read path
+    if since_ts is not None:
+        df = df[df["timestamp"] >= since_ts]
+    if columns:
+        df = df[list(columns)]
+
+    print(f"[api] Successfully fetched {len(df)} bars")
+    return df
+
+
+@_ttl_cache(60)
+def fetch_binance_ohlcv_np(
+    pair: str = "BTC/USDT",
+    timeframe: str = "15m",
+    limit: int = 1000,
+    use_cache: bool = True,
+) -> dict[str, np.ndarray]:
+    """Fetch OHLCV as struct-of-arrays columns, skipping the DataFrame.
+
+    Same parameters and on-disk cache as fetch_binance_ohlcv, but returns
+    six NumPy columns for vectorized consumers: timestamp as int64
+    epoch-ms, the OHLCV columns as float64.
+    """
+    cache_file = _cache_path(pair, timeframe, limit)
+
+    if use_cache and _cache_hit(cache_file):
+        print(f"[cache] Loading cached data from {cache_file}")
+        df = pd.read_parquet(cache_file)
+        ts = df["timestamp"]
+        if str(ts.dtype).startswith("datetime64"):
+            ts_ms = ts.astype("datetime64[ms, UTC]").astype("int64").to_numpy()
+        else:
+            ts_ms = ts.astype("int64").to_numpy()
+        return {
+            "timestamp": ts_ms,
+            "open": df["open"].to_numpy(np.float64),
+            "high": df["high"].to_numpy(np.float64),
+            "low": df["low"].to_numpy(np.float64),
+            "close": df["close"].to_numpy(np.float64),
+            "volume": df["volume"].to_numpy(np.float64),
+        }
+
+    cols = _decode_bars(_fetch_raw(pair, timeframe, limit))
+
+    if use_cache:
+        _write_cache(pd.DataFrame(cols), cache_file)
+
+    print(f"[api] Successfully fetched {len(cols['timestamp'])} bars")
+    return cols
+
+
+# Circuit breaker shared by all REST calls: after _BREAKER_THRESHOLD
+# consecutive failed fetches the circuit opens for _BREAKER_COOLDOWN
+# seconds and callers fail fast instead of piling more retries onto a
+# struggling endpoint
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN = 60.0
+_breaker = {"failures": 0, "open_until": 0.0}
+
+
+def _fetch_raw(pair: str, timeframe: str, limit: int) -> list[list]:
+    """Fetch raw OHLCV rows from Binance with the shared retry loop.
+
+    Retries use exponential backoff with jitter so parallel callers
+    don't re-synchronize on rate-limit bursts.
+
+    Raises:
+        RuntimeError: If the circuit breaker is open.
+        Exception: If all retry attempts fail.
+    """
+    if time.time() < _breaker["open_until"]:
+        raise RuntimeError(
+            f"circuit open after {_breaker['failures']} consecutive failures; "
+            f"retrying after {_breaker['open_until'] - time.time():.0f}s"
+        )
+
+    ex = _exchange()
+
     # Retry logic for API calls
     for attempt in range(3):
         try:
             print(f"[api] Fetching {limit} bars of {pair} {timeframe} from Binance (attempt {attempt + 1})")
             bars = ex.fetch_ohlcv(pair, timeframe=timeframe, limit=limit)
-            break
+            _breaker["failures"] = 0
+            return bars
         except Exception as e:
             print(f"[api] Attempt {attempt + 1} failed: {e}")
             if attempt == 2:
+                _breaker["failures"] += 1
+                if _breaker["failures"] >= _BREAKER_THRESHOLD:
+                    _breaker["open_until"] = time.time() + _BREAKER_COOLDOWN
                 raise
-            time.sleep(1.5 * (attempt + 1))
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(bars, columns=["timestamp", "open", "high", "low", "close", "volume"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-    
-    # Cache the data if requested
-    if use_cache:
-        print(f"[cache] Saving data to {cache_file}")
-        df.to_parquet(cache_file, index=False)
-    
-    print(f"[api] Successfully fetched {len(df)} bars")
+            # Exponential backoff, capped, plus jitter against retry storms
+            time.sleep(min(30.0, 0.5 * (2**attempt)) + random.uniform(0.0, 0.5))
+
+
+def as_datetime(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert an int64 epoch-ms timestamp column to tz-aware datetimes.
+
+    For display paths only; the bot-internal consumers keep the raw ms.
+    """
+    if not str(df["timestamp"].dtype).startswith("datetime64"):
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
     return df
 
 
+def _decode_bars(bars: list[list]) -> dict[str, np.ndarray]:
+    """Decode the ccxt list-of-lists payload into contiguous columns."""
+    arr = np.asarray(bars, dtype=np.float64)
+    if arr.size == 0:
+        arr = arr.reshape(0, 6)
+    return {
+        "timestamp": arr[:, 0].astype(np.int64),
+        "open": arr[:, 1],
+        "high": arr[:, 2],
+        "low": arr[:, 3],
+        "close": arr[:, 4],
+        "volume": arr[:, 5],
+    }
+
+
+def _write_cache(df: pd.DataFrame, cache_file: pathlib.Path) -> None:
+    """Write the shared parquet cache file for a fetched DataFrame."""
+    print(f"[cache] Saving data to {cache_file}")
+    # float32 has plenty of precision headroom for crypto OHLCV and,
+    # combined with zstd, roughly halves the cache file size vs the
+    # default snappy parquet
+    cache_df = df.astype(
+        {"open": "float32", "high": "float32", "low": "float32", "close": "float32", "volume": "float32"}
+    )
+    cache_df.to_parquet(cache_file, index=False, compression="zstd")
+    _CACHED_FILES.add(cache_file.name)
+
+
+@_ttl_cache(3600)
 def get_available_pairs() -> list[str]:
     """Get list of available trading pairs from Binance.
     
@@ -93,14 +303,14 @@ def get_available_pairs() -> list[str]:
         List of trading pair strings
     """
     try:
-        ex = ccxt.binance({"enableRateLimit": True})
-        markets = ex.load_markets()
+        markets = _exchange().load_markets()
         return [symbol for symbol in markets.keys() if "/USDT" in symbol]
     except Exception as e:
         print(f"[api] Failed to fetch available pairs: {e}")
         return ["BTC/USDT", "ETH/USDT", "BNB/USDT"]  # Fallback
 
 
+@_ttl_cache(86400)
 def get_available_timeframes() -> list[str]:
     """Get list of available timeframes from Binance.
     
@@ -108,8 +318,7 @@ def get_available_timeframes() -> list[str]:
         List of timeframe strings
     """
     try:
-        ex = ccxt.binance({"enableRateLimit": True})
-        return list(ex.timeframes.keys())
+        return list(_exchange().timeframes.keys())
     except Exception as e:
         print(f"[api] Failed to fetch available timeframes: {e}")
         return ["1m", "5m", "15m", "1h", "4h", "1d"]  # Fallback
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -13,14 +14,14 @@ def _iso(ts: int | None) -> str:
 
 
 def _pct(x: float | None) -> str:
-    return f"{x*100:.2f}%" if isinstance(x, (int, float)) else "N/A"
+    return f"{x*100:.2f}%" if x is not None else "N/A"
 
 
 def _money(x: float | None) -> str:
-    return f"${x:,.2f}" if isinstance(x, (int, float)) else "N/A"
+    return f"${x:,.2f}" if x is not None else "N/A"
 
 
-@dataclass
+@dataclass(slots=True)
 class PrettyCtx:
     # Контекст прогона
     start_ts: int
@@ -59,7 +60,17 @@ def _years_between(a_ts: int, b_ts: int) -> float:
     return max((b_ts - a_ts) / (365.25 * 24 * 3600), 0.0001)
 
 
+# Отбивки фиксированной ширины — считаем один раз на модуль
+_EQ_LINE = "=" * 70
+_DASH_LINE = "-" * 70
+
+
 def _line(s: str = "=", n: int = 70) -> str:
+    if n == 70:
+        if s == "=":
+            return _EQ_LINE
+        if s == "-":
+            return _DASH_LINE
     return s * n
 
 
@@ -99,7 +110,7 @@ def render(ctx: PrettyCtx) -> str:
 
     out.append("")
     out.append("⚖️ ЗАПУСК СБАЛАНСИРОВАННОГО ДВУХЛЕТНЕГО БЭКТЕСТА")
-    out.append(_line("="))
+    out.append(_EQ_LINE)
     out.append("📊 Загрузка двухлетних реальных данных...")
     if ctx.symbols_bars:
         for sym, n in ctx.symbols_bars:
@@ -148,13 +159,13 @@ def render(ctx: PrettyCtx) -> str:
     out.append("")
     out.append("⚖️ РЕЗУЛЬТАТЫ СБАЛАНСИРОВАННОГО ДВУХЛЕТНЕГО БЭКТЕСТА")
     out.append("")
-    out.append(_line("="))
+    out.append(_EQ_LINE)
     out.append("")
     # Фин. результаты
     out.append(
         f"💰 СБАЛАНСИРОВАННЫЕ ФИНАНСОВЫЕ РЕЗУЛЬТАТЫ ({_iso(ctx.start_ts)}-{_iso(ctx.end_ts)}):"
     )
-    out.append(_line("-"))
+    out.append(_DASH_LINE)
     out.append(f"Начальный депозит:      {_money(ctx.initial_balance)}")
     out.append(f"Финальный баланс:       {_money(final_equity)}")
     out.append(f"Чистая прибыль:         {_money(net_profit)}")
@@ -166,7 +177,7 @@ def render(ctx: PrettyCtx) -> str:
     out.append("")
     # Торговая статистика
     out.append("📊 СБАЛАНСИРОВАННАЯ ТОРГОВАЯ СТАТИСТИКА:")
-    out.append(_line("-"))
+    out.append(_DASH_LINE)
     out.append(f"Всего сделок:           {trades if trades is not None else 'N/A'}")
     out.append(f"Винрейт:                {_pct(win_rate)}")
     out.append(
@@ -180,32 +191,30 @@ def render(ctx: PrettyCtx) -> str:
     # По годам (если есть)
     if ctx.yearly:
         out.append("📅 АНАЛИЗ ПО ГОДАМ:")
-        out.append(_line("-"))
-        for y in ctx.yearly:
-            yy = y.get("year", "YYYY")
-            tr = y.get("trades", "N/A")
-            pnl = y.get("pnl", None)
-            out.append(f"{yy}: {tr} сделок, PnL: {_money(pnl)}")
+        out.append(_DASH_LINE)
+        out.extend(
+            f"{y.get('year', 'YYYY')}: {y.get('trades', 'N/A')} сделок, PnL: {_money(y.get('pnl'))}"
+            for y in ctx.yearly
+        )
         # опциональные доходности по годам
-        ry = [y for y in ctx.yearly if "return_pct" in y]
-        if ry:
-            for y in ry:
-                out.append(
-                    f"Доходность {y['year']}: {('+' if y['return_pct']>=0 else '')}{_pct(y['return_pct'])}"
-                )
+        out.extend(
+            f"Доходность {y['year']}: {('+' if y['return_pct']>=0 else '')}{_pct(y['return_pct'])}"
+            for y in ctx.yearly
+            if "return_pct" in y
+        )
         out.append("")
 
     # Параметры
     if ctx.params:
         out.append("⚖️ СБАЛАНСИРОВАННЫЕ ПАРАМЕТРЫ:")
-        out.append(_line("-"))
+        out.append(_DASH_LINE)
         for k, v in ctx.params.items():
             out.append(f"✅ {k}: {v}")
         out.append("")
 
     # Эволюция (чисто структурный блок — заполняется по желанию)
     out.append("📈 ЭВОЛЮЦИЯ РЕЗУЛЬТАТОВ:")
-    out.append(_line("-"))
+    out.append(_DASH_LINE)
     out.append("С багами:      n/a (нереально)")
     out.append("Переисправлено:    n/a (слишком консервативно)")
     out.append("Сбалансировано: n/a (оптимально)")
@@ -226,26 +235,33 @@ def render(ctx: PrettyCtx) -> str:
     # Проекция (если известен final_equity)
     if isinstance(final_equity, (int, float)):
         mul = multiple or 1.0
-
-        def proj(x: float) -> str:
-            y1 = x * (1.0 + (ann or 0.0))  # приблизительно за год
-            y2 = x * mul  # за 2 года по итогу
-            return f"${x:,.0f} → ${y1:,.2f}/год | ${y2:,.2f}/2года"
+        y1_mult = 1.0 + (ann or 0.0)  # приблизительно за год
 
         out.append("💡 ПРОЕКЦИЯ НА БОЛЬШИЙ КАПИТАЛ:")
-        out.append(_line("-"))
-        for cap in (5_000, 10_000, 25_000, 50_000, 100_000):
-            out.append(proj(cap))
+        out.append(_DASH_LINE)
+        # Вся таблица одним extend вместо пяти append
+        out.extend(
+            f"${cap:,.0f} → ${cap * y1_mult:,.2f}/год | ${cap * mul:,.2f}/2года"
+            for cap in (5_000, 10_000, 25_000, 50_000, 100_000)
+        )
         out.append("")
 
     out.append("🎯 ИТОГОВОЕ ЗАКЛЮЧЕНИЕ:")
-    out.append(_line("-"))
+    out.append(_DASH_LINE)
     out.append("🎉 МИССИЯ: отчёт сформирован (структура как в образце)")
     out.append("💾 Результаты сохранены в balanced_two_year_results.json")
     return "\n".join(out)
 
 
+def to_json(ctx: PrettyCtx) -> str:
+    # json.dumps даёт настоящий JSON (str(asdict(...)) давал Python-repr с
+    # одинарными кавычками и None); сериализация вынесена отдельно, чтобы
+    # писать один и тот же контекст в несколько файлов без повторного
+    # обхода dataclass-дерева
+    return json.dumps(asdict(ctx), ensure_ascii=False)
+
+
 def save_json(ctx: PrettyCtx, out_path: str | Path = "balanced_two_year_results.json") -> Path:
     p = Path(out_path)
-    p.write_text(str(asdict(ctx)), encoding="utf-8")
+    p.write_text(to_json(ctx), encoding="utf-8")
     return p
@@ -0,0 +1,162 @@
+"""Compiled indicator kernels for the optimized mean reversion filters.
+
+Kernels take pre-extracted contiguous float64 arrays in bar order
+(oldest → newest) and return scalars. With numba installed they are
+JIT-compiled (and cached on disk); without it they run as plain Python.
+
+They replicate the original pure-Python loops bar-for-bar, including the
+simplified smoothing (plain mean of the last 14 TR/DM values) and the
+defaults returned on short inputs.
+"""
+
+import numpy as np
+
+from bot.backtest._jit import njit
+
+
+def tr_dm(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """True Range and ±Directional Movement series for a whole price array.
+
+    Plain NumPy (not a kernel): this is the batch-path counterpart of the
+    fused per-bar kernel below, computing (tr, dm_plus, dm_minus) — one
+    entry per consecutive bar pair — once, so callers that need several
+    rolling aggregates over them don't redo the slicing arithmetic.
+    """
+    tr = np.maximum.reduce(
+        [
+            highs[1:] - lows[1:],
+            np.abs(highs[1:] - closes[:-1]),
+            np.abs(lows[1:] - closes[:-1]),
+        ]
+    )
+    high_diff = highs[1:] - highs[:-1]
+    low_diff = lows[:-1] - lows[1:]
+    dm_plus = np.where((high_diff > low_diff) & (high_diff > 0.0), high_diff, 0.0)
+    dm_minus = np.where((low_diff > high_diff) & (low_diff > 0.0), low_diff, 0.0)
+    return tr, dm_plus, dm_minus
+
+
+@njit(cache=True)
+def adx_dx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> float:
+    """Simplified ADX (single DX over 14-bar mean TR/DM) for the trend filter.
+
+    Returns 50.0 (trending-market default) when fewer than 15 bars are
+    available or the denominators degenerate to zero.
+    """
+    n = highs.shape[0]
+    if n < 15:  # need 14 TR/DM samples, each spanning a bar pair
+        return 50.0
+
+    tr_sum = 0.0
+    dmp_sum = 0.0
+    dmn_sum = 0.0
+    for i in range(n - 14, n):
+        tr = highs[i] - lows[i]
+        hc = abs(highs[i] - closes[i - 1])
+        if hc > tr:
+            tr = hc
+        lc = abs(lows[i] - closes[i - 1])
+        if lc > tr:
+            tr = lc
+
+        high_diff = highs[i] - highs[i - 1]
+        low_diff = lows[i - 1] - lows[i]
+        if high_diff > low_diff and high_diff > 0.0:
+            dmp_sum += high_diff
+        if low_diff > high_diff and low_diff > 0.0:
+            dmn_sum += low_diff
+        tr_sum += tr
+
+    if tr_sum <= 0.0:
+        return 50.0
+    di_plus = dmp_sum / tr_sum * 100.0
+    di_minus = dmn_sum / tr_sum * 100.0
+    di_sum = di_plus + di_minus
+    if di_sum <= 0.0:
+        return 50.0
+    return abs(di_plus - di_minus) / di_sum * 100.0
+
+
+@njit(cache=True)
+def adx_and_atr(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> tuple[float, float]:
+    """Fused ADX + ATR-percentage over one sweep of the shared True Ranges.
+
+    Both filters consume the same TR values; computing them together
+    halves the passes over the window versus calling adx_dx and atr_pct
+    separately. Returns (adx, atr_pct) with the same per-indicator
+    defaults and cut-offs as the standalone kernels.
+    """
+    n = highs.shape[0]
+    adx = 50.0
+    atr = 0.01
+
+    if n < 14:
+        return adx, atr
+
+    # Both windows cover the same trailing TR samples: tr_values[-14:] in
+    # the original code, which is only 13 samples at exactly 14 bars (when
+    # ADX is not computed at all)
+    count = n - 1 if n - 1 < 14 else 14
+    tr_sum = 0.0
+    dmp_sum = 0.0
+    dmn_sum = 0.0
+    for i in range(n - count, n):
+        tr = highs[i] - lows[i]
+        hc = abs(highs[i] - closes[i - 1])
+        if hc > tr:
+            tr = hc
+        lc = abs(lows[i] - closes[i - 1])
+        if lc > tr:
+            tr = lc
+        tr_sum += tr
+
+        high_diff = highs[i] - highs[i - 1]
+        low_diff = lows[i - 1] - lows[i]
+        if high_diff > low_diff and high_diff > 0.0:
+            dmp_sum += high_diff
+        if low_diff > high_diff and low_diff > 0.0:
+            dmn_sum += low_diff
+
+    if closes[n - 1] > 0.0:
+        atr = tr_sum / count / closes[n - 1]
+
+    if n >= 15 and tr_sum > 0.0:
+        di_plus = dmp_sum / tr_sum * 100.0
+        di_minus = dmn_sum / tr_sum * 100.0
+        di_sum = di_plus + di_minus
+        if di_sum > 0.0:
+            adx = abs(di_plus - di_minus) / di_sum * 100.0
+
+    return adx, atr
+
+
+@njit(cache=True)
+def atr_pct(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> float:
+    """ATR (mean of up to the last 14 TRs) as a fraction of the last close.
+
+    Returns the 1% default when fewer than 14 bars are available or the
+    last close is not positive.
+    """
+    n = highs.shape[0]
+    if n < 14:
+        return 0.01
+
+    # Mirrors the original tr_values[-14:] slice: with exactly 14 bars only
+    # 13 TR samples exist, so the mean runs over those 13
+    count = n - 1 if n - 1 < 14 else 14
+    tr_sum = 0.0
+    for i in range(n - count, n):
+        tr = highs[i] - lows[i]
+        hc = abs(highs[i] - closes[i - 1])
+        if hc > tr:
+            tr = hc
+        lc = abs(lows[i] - closes[i - 1])
+        if lc > tr:
+            tr = lc
+        tr_sum += tr
+
+    if closes[n - 1] <= 0.0:
+        return 0.01
+    return tr_sum / count / closes[n - 1]
@@ -0,0 +1,37 @@
+"""Compiled batch kernels for mean reversion strategies.
+
+Kernels take pre-extracted contiguous float64 arrays and return int8
+signal arrays (+1 buy, -1 sell, 0 hold). With numba installed they are
+JIT-compiled (and cached on disk); without it they run as plain Python.
+"""
+
+import numpy as np
+
+from bot.backtest._jit import njit
+
+
+@njit(cache=True)
+def mr_signals(closes: np.ndarray, window: int, lo_mult: float, hi_mult: float) -> np.ndarray:
+    """Rolling-SMA mean reversion signals for a whole close series.
+
+    Mirrors MeanReversion.on_bar bar-for-bar: SMA over the last `window`
+    closes (including the current one), buy below sma * lo_mult, sell
+    above sma * hi_mult, nothing until the window is filled. The rolling
+    sum is maintained incrementally, so the kernel is O(n) regardless of
+    window size.
+    """
+    n = closes.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    s = 0.0
+    for i in range(n):
+        s += closes[i]
+        if i >= window:
+            s -= closes[i - window]
+        if i >= window - 1:
+            sma = s / window
+            c = closes[i]
+            if c < sma * lo_mult:
+                out[i] = 1
+            elif c > sma * hi_mult:
+                out[i] = -1
+    return out
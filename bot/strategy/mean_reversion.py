@@ -2,6 +2,9 @@
 
 from collections import deque
 
+import numpy as np
+
+from bot.strategy._mr_kernel import mr_signals
 from bot.strategy.base import Strategy
 from bot.utils.freshness import is_stale
 from bot.utils.timeframes import tf_to_seconds
@@ -23,6 +26,14 @@ class MeanReversion(Strategy):
         self.timeframe = timeframe
         self.tf_seconds = tf_to_seconds(timeframe)
         self.prices: deque[float] = deque(maxlen=window)
+        self._sum = 0.0  # running sum of self.prices, kept in sync by on_bar
+        # Threshold multipliers folded once at construction; every signal
+        # path below does one multiply per bound instead of recomputing
+        self._lo_mult = 1.0 - threshold
+        self._hi_mult = 1.0 + threshold
+        # on_bar simulates the clock as ts + tf_seconds, so the staleness
+        # check is a pure function of the fixed timeframe — evaluate once
+        self._always_fresh = not is_stale(0, self.tf_seconds, self.tf_seconds)
 
     def on_bar(self, ts: int, o: float, h: float, low: float, c: float, v: int) -> str | None:
         """Process new bar data.
@@ -38,28 +49,73 @@ class MeanReversion(Strategy):
         Returns:
             'buy', 'sell', or None
         """
-        # Check if data is stale
-        now_ts = ts + self.tf_seconds  # Simulate current time
-        if is_stale(ts, now_ts, self.tf_seconds):
+        # Staleness under the simulated clock (ts + tf_seconds) is constant
+        # per timeframe; the result is hoisted to __init__
+        if not self._always_fresh:
             return None  # Don't trade on stale data
 
+        # O(1) rolling sum: subtract the element the full deque evicts,
+        # then add the new close
+        if len(self.prices) == self.window:
+            self._sum -= self.prices[0]
         self.prices.append(c)
+        self._sum += c
 
         # Need at least window bars for SMA
         if len(self.prices) < self.window:
             return None
 
         # Calculate SMA
-        sma = sum(self.prices) / len(self.prices)
+        sma = self._sum / self.window
 
         # Mean reversion signals
-        if c < sma * (1 - self.threshold):
+        if c < sma * self._lo_mult:
             return "buy"
-        elif c > sma * (1 + self.threshold):
+        elif c > sma * self._hi_mult:
             return "sell"
         else:
             return None
 
+    def signals_vec(
+        self, o: np.ndarray, h: np.ndarray, low: np.ndarray, c: np.ndarray, v: np.ndarray
+    ) -> np.ndarray:
+        """Compute close-mode signals for the whole series in one batch.
+
+        Produces the same signal per bar as feeding on_bar sequentially;
+        the simulated-clock freshness check there is constant-false for a
+        fixed timeframe, so it has no batch counterpart. Used by the
+        engine's vectorized backtest path.
+        """
+        closes = np.ascontiguousarray(c, dtype=np.float64)
+        return mr_signals(closes, self.window, self._lo_mult, self._hi_mult)
+
+    def signal_all(self, closes: np.ndarray) -> np.ndarray:
+        """Batch version of signal() over every history prefix at once.
+
+        out[t] is the signal for bar t computed from closes[:t] — the same
+        expanding mean over all prior closes that signal() uses, evaluated
+        for the whole series with one cumsum instead of O(n^2) list sums.
+
+        Returns:
+            int8 array: +1 buy, -1 sell, 0 hold.
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        n = closes.size
+        out = np.zeros(n, dtype=np.int8)
+        if n <= self.window:
+            return out
+
+        cs = np.cumsum(closes)
+        t = np.arange(self.window, n)
+        mean = cs[t - 1] / t  # expanding mean of closes[:t]
+        last = closes[t - 1]
+        out[t] = np.where(
+            last < mean * self._lo_mult,
+            1,
+            np.where(last > mean * self._hi_mult, -1, 0),
+        ).astype(np.int8)
+        return out
+
     def name(self) -> str:
         """Get strategy name."""
         return f"MeanReversion_{self.window}_{self.threshold}"
@@ -84,9 +140,9 @@ class MeanReversion(Strategy):
         last_close = closes[-1]
 
         # Mean reversion signals
-        if last_close < sma * (1 - self.threshold):
+        if last_close < sma * self._lo_mult:
             return "buy"
-        elif last_close > sma * (1 + self.threshold):
+        elif last_close > sma * self._hi_mult:
             return "sell"
         else:
             return None
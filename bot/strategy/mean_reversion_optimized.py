@@ -1,11 +1,11 @@
 """Optimized mean reversion strategy with advanced filters."""
 
 import math
-from collections import deque
 from typing import Optional
 
 import numpy as np
 
+from bot.strategy._indicators import adx_and_atr, adx_dx, atr_pct, tr_dm
 from bot.strategy.base import Strategy
 from bot.utils.freshness import is_stale
 from bot.utils.timeframes import tf_to_seconds
@@ -45,130 +45,113 @@ class MeanReversionOptimized(Strategy):
         self.adx_threshold = adx_threshold
         self.atr_threshold = atr_threshold
         self.min_bars_cooldown = min_bars_cooldown
-        
-        # Data storage
-        self.prices: deque[float] = deque(maxlen=window)
-        self.highs: deque[float] = deque(maxlen=window)
-        self.lows: deque[float] = deque(maxlen=window)
-        self.volumes: deque[int] = deque(maxlen=window)
-        
+
+        # Threshold multipliers folded once at construction (same pattern
+        # as MeanReversion), and the pure-function name cached
+        self._lo_mult = 1.0 - threshold
+        self._hi_mult = 1.0 + threshold
+        self._name = (
+            f"MeanReversionOpt_{window}_{threshold}_z{zscore_threshold}"
+            f"_adx{adx_threshold}_atr{atr_threshold}_cd{min_bars_cooldown}"
+        )
+        # on_bar simulates the clock as ts + tf_seconds, so the staleness
+        # check is a pure function of the fixed timeframe — evaluate once
+        # (same hoist as MeanReversion)
+        self._always_fresh = not is_stale(0, self.tf_seconds, self.tf_seconds)
+
+        # Data storage: price/high/low live in 2×window ring buffers with
+        # each sample written twice (at i and i+window), so the last
+        # `window` bars in order are always the contiguous slice
+        # buf[i+1 : i+1+window] — no deque→list→array copies per bar
+        self._p = np.empty(2 * window, dtype=np.float64)
+        self._h = np.empty(2 * window, dtype=np.float64)
+        self._l = np.empty(2 * window, dtype=np.float64)
+        self._i = 0  # next write slot, cycles over [0, window)
+        self._n = 0  # bars seen, capped at window
+        self._v = np.empty(2 * window, dtype=np.int64)
+        # Running sum / sum of squares of the price window, kept in sync by
+        # on_bar — SMA and z-score come out in O(1) per bar
+        self._sum = 0.0
+        self._sumsq = 0.0
+
         # Cooldown tracking
         self.last_trade_bar = -1
 
-    def _calculate_zscore(self, prices: list[float]) -> float:
+    def _calculate_zscore(self, prices: np.ndarray) -> float:
         """Calculate Z-score for the last price.
-        
+
         Args:
-            prices: List of prices
-            
+            prices: Array of prices (float64)
+
         Returns:
             Z-score of the last price
         """
-        if len(prices) < 2:
+        if prices.size < 2:
             return 0.0
-        
-        mean_price = np.mean(prices)
-        std_price = np.std(prices)
-        
+
+        # Single pass over the window: mean, then population std from the
+        # same residuals — no list→array conversion, no second np.std walk
+        mean_price = prices.mean()
+        d = prices - mean_price
+        std_price = np.sqrt((d * d).mean())
+
         if std_price == 0:
             return 0.0
-            
+
         return abs((prices[-1] - mean_price) / std_price)
 
-    def _calculate_adx(self, highs: list[float], lows: list[float], closes: list[float]) -> float:
+    def _calculate_adx(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> float:
         """Calculate ADX (Average Directional Index) for trend filter.
-        
+
         Args:
-            highs: List of high prices
-            lows: List of low prices
-            closes: List of close prices
-            
+            highs: Array of high prices
+            lows: Array of low prices
+            closes: Array of close prices
+
         Returns:
             ADX value (0-100)
         """
-        if len(highs) < 14:  # Need at least 14 periods for ADX
-            return 50.0  # Default to trending market
-        
-        try:
-            # Calculate True Range (TR)
-            tr_values = []
-            for i in range(1, len(highs)):
-                tr = max(
-                    highs[i] - lows[i],
-                    abs(highs[i] - closes[i-1]),
-                    abs(lows[i] - closes[i-1])
-                )
-                tr_values.append(tr)
-            
-            # Calculate Directional Movement
-            dm_plus = []
-            dm_minus = []
-            
-            for i in range(1, len(highs)):
-                high_diff = highs[i] - highs[i-1]
-                low_diff = lows[i-1] - lows[i]
-                
-                if high_diff > low_diff and high_diff > 0:
-                    dm_plus.append(high_diff)
-                else:
-                    dm_plus.append(0)
-                    
-                if low_diff > high_diff and low_diff > 0:
-                    dm_minus.append(low_diff)
-                else:
-                    dm_minus.append(0)
-            
-            # Calculate smoothed values (simplified)
-            if len(tr_values) >= 14:
-                tr_smooth = np.mean(tr_values[-14:])
-                dm_plus_smooth = np.mean(dm_plus[-14:])
-                dm_minus_smooth = np.mean(dm_minus[-14:])
-                
-                if tr_smooth > 0:
-                    di_plus = (dm_plus_smooth / tr_smooth) * 100
-                    di_minus = (dm_minus_smooth / tr_smooth) * 100
-                    
-                    dx = abs(di_plus - di_minus) / (di_plus + di_minus) * 100
-                    return dx
-                    
-        except Exception:
-            pass
-            
-        return 50.0  # Default to trending market
-
-    def _calculate_atr_percentage(self, highs: list[float], lows: list[float], closes: list[float]) -> float:
+        return adx_dx(
+            np.ascontiguousarray(highs, dtype=np.float64),
+            np.ascontiguousarray(lows, dtype=np.float64),
+            np.ascontiguousarray(closes, dtype=np.float64),
+        )
+
+    def _calculate_atr_percentage(
+        self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray
+    ) -> float:
         """Calculate ATR as percentage of price for volatility filter.
-        
+
         Args:
-            highs: List of high prices
-            lows: List of low prices
-            closes: List of close prices
-            
+            highs: Array of high prices
+            lows: Array of low prices
+            closes: Array of close prices
+
         Returns:
             ATR as percentage of current price
         """
-        if len(highs) < 14:
-            return 0.01  # Default 1%
-            
-        try:
-            # Calculate True Range
-            tr_values = []
-            for i in range(1, len(highs)):
-                tr = max(
-                    highs[i] - lows[i],
-                    abs(highs[i] - closes[i-1]),
-                    abs(lows[i] - closes[i-1])
-                )
-                tr_values.append(tr)
-            
-            # Calculate ATR (14-period average)
-            atr = np.mean(tr_values[-14:])
-            current_price = closes[-1]
-            
-            return atr / current_price if current_price > 0 else 0.01
-            
-        except Exception:
-            return 0.01  # Default 1%
+        return atr_pct(
+            np.ascontiguousarray(highs, dtype=np.float64),
+            np.ascontiguousarray(lows, dtype=np.float64),
+            np.ascontiguousarray(closes, dtype=np.float64),
+        )
+
+    def _adx_atr(
+        self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray
+    ) -> tuple[float, float]:
+        """Compute the ADX and ATR filter values in one fused kernel pass.
+
+        Both indicators share the same True Ranges; the fused kernel sweeps
+        the window once instead of twice. Returns (adx, atr_pct) with the
+        usual trending-market / 1% defaults on degenerate inputs — the
+        kernels validate short inputs and zero denominators explicitly, so
+        no defensive try/except is needed (and none would JIT-compile).
+        """
+        return adx_and_atr(
+            np.ascontiguousarray(highs, dtype=np.float64),
+            np.ascontiguousarray(lows, dtype=np.float64),
+            np.ascontiguousarray(closes, dtype=np.float64),
+        )
 
     def on_bar(self, ts: int, o: float, h: float, low: float, c: float, v: int) -> Optional[str]:
         """Process new bar data with advanced filters.
@@ -184,62 +167,224 @@ class MeanReversionOptimized(Strategy):
         Returns:
             'buy', 'sell', or None
         """
-        # Check if data is stale
-        now_ts = ts + self.tf_seconds
-        if is_stale(ts, now_ts, self.tf_seconds):
+        # Staleness under the simulated clock (ts + tf_seconds) is constant
+        # per timeframe; the result is hoisted to __init__
+        if not self._always_fresh:
             return None
 
-        # Store data
-        self.prices.append(c)
-        self.highs.append(h)
-        self.lows.append(low)
-        self.volumes.append(v)
+        # Store data, maintaining the running sums incrementally: slot i
+        # holds the close from exactly `window` bars ago, i.e. the sample
+        # this write evicts
+        i = self._i
+        if self._n == self.window:
+            evicted = self._p[i]
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        else:
+            self._n += 1
+        self._p[i] = c
+        self._p[i + self.window] = c
+        self._h[i] = h
+        self._h[i + self.window] = h
+        self._l[i] = low
+        self._l[i + self.window] = low
+        self._v[i] = v
+        self._v[i + self.window] = v
+        self._sum += c
+        self._sumsq += c * c
+        self._i = i + 1 if i + 1 < self.window else 0
 
         # Need at least window bars for calculations
-        if len(self.prices) < self.window:
+        if self._n < self.window:
             return None
 
-        # Convert to lists for calculations
-        prices_list = list(self.prices)
-        highs_list = list(self.highs)
-        lows_list = list(self.lows)
-
         # Filter 0: Cooldown filter - minimum bars between trades
-        current_bar = len(prices_list) - 1
+        current_bar = self._n - 1
         if self.last_trade_bar >= 0 and (current_bar - self.last_trade_bar) < self.min_bars_cooldown:
             return None  # Still in cooldown period
 
-        # Filter 1: Z-score threshold - only trade on significant deviations
-        zscore = self._calculate_zscore(prices_list)
+        # Filter 1: Z-score threshold - only trade on significant deviations.
+        # O(1) from the running sums: population variance = E[x²] − E[x]²
+        # (clamped — the subtraction can go a hair negative in fp)
+        sma = self._sum / self.window
+        var = self._sumsq / self.window - sma * sma
+        zscore = abs(c - sma) / math.sqrt(var) if var > 0.0 else 0.0
         if zscore < self.zscore_threshold:
             return None  # Not significant enough deviation
 
-        # Filter 2: ADX trend filter - only trade in range-bound markets
-        adx = self._calculate_adx(highs_list, lows_list, prices_list)
+        # Decide the would-be signal next — it is O(1) from the running-sum
+        # mean, so bars that would end up as "hold" anyway never pay for the
+        # windowed ADX/ATR indicators. The emitted signals are unchanged:
+        # all filters still have to pass before anything is returned.
+        if c < sma * self._lo_mult:
+            side = "buy"
+        elif c > sma * self._hi_mult:
+            side = "sell"
+        else:
+            return None
+
+        # Only true candidates reach the windowed indicators: the ordered
+        # window is a contiguous zero-copy slice of each ring buffer
+        lo = i + 1
+        hi = lo + self.window
+        prices_arr = self._p[lo:hi]
+        highs_arr = self._h[lo:hi]
+        lows_arr = self._l[lo:hi]
+
+        # Filters 2+3 share True Ranges — one fused kernel pass, checks in
+        # the original order
+        adx, atr = self._adx_atr(highs_arr, lows_arr, prices_arr)
         if adx > self.adx_threshold:
             return None  # Market is trending, avoid mean reversion
-
-        # Filter 3: ATR volatility filter - only trade in sufficient volatility
-        atr_pct = self._calculate_atr_percentage(highs_list, lows_list, prices_list)
-        if atr_pct < self.atr_threshold:
+        if atr < self.atr_threshold:
             return None  # Insufficient volatility
 
-        # Calculate SMA for mean reversion signal
-        sma = sum(prices_list) / len(prices_list)
+        self.last_trade_bar = current_bar
+        return side
+
+    def signals_vec(
+        self, o: np.ndarray, h: np.ndarray, low: np.ndarray, c: np.ndarray, v: np.ndarray
+    ) -> np.ndarray:
+        """Compute close-mode signals for the whole series in one batch.
 
-        # Mean reversion signals (only if all filters pass)
-        if c < sma * (1 - self.threshold):
-            self.last_trade_bar = current_bar
-            return "buy"
-        elif c > sma * (1 + self.threshold):
-            self.last_trade_bar = current_bar
-            return "sell"
+        Produces the same signal per bar as feeding on_bar sequentially:
+        rolling window mean/variance come from prefix-sum differences, the
+        ADX/ATR filters from trailing TR/DM prefix sums over the same
+        window the ring buffers would hold. on_bar's cooldown compares a
+        frozen bar counter (the buffer fill count stops at window) against
+        last_trade_bar, so with a positive cooldown only the first emitted
+        signal ever fires — replicated below. Used by the engine's
+        vectorized backtest path.
+
+        Returns:
+            int8 array: +1 buy, -1 sell, 0 hold.
+        """
+        closes = np.asarray(c, dtype=np.float64)
+        highs = np.asarray(h, dtype=np.float64)
+        lows = np.asarray(low, dtype=np.float64)
+        n = closes.size
+        out = np.zeros(n, dtype=np.int8)
+        w = self.window
+        if n < w or not self._always_fresh:
+            return out
+
+        # Bars with a full rolling window; padded prefix sums make every
+        # window aggregate a two-element difference
+        b = np.arange(w - 1, n)
+        cs = np.concatenate(([0.0], np.cumsum(closes)))
+        css = np.concatenate(([0.0], np.cumsum(closes * closes)))
+        sma = (cs[b + 1] - cs[b + 1 - w]) / w
+        var = (css[b + 1] - css[b + 1 - w]) / w - sma * sma
+        last = closes[b]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.abs(last - sma) / np.sqrt(var)
+        z = np.where(var > 0.0, z, 0.0)
+
+        side = np.where(
+            last < sma * self._lo_mult,
+            1,
+            np.where(last > sma * self._hi_mult, -1, 0),
+        ).astype(np.int8)
+
+        # ADX/ATR over the trailing min(14, window-1) bar pairs — the same
+        # slice of the ring window the fused kernel sees, with the same
+        # short-window defaults
+        count = w - 1 if w - 1 < 14 else 14
+        if w < 14:
+            adx = np.full(b.shape, 50.0)
+            atr = np.full(b.shape, 0.01)
         else:
-            return None
+            tr, dmp, dmn = tr_dm(highs, lows, closes)
+            tr_cs = np.concatenate(([0.0], np.cumsum(tr)))
+            trs = tr_cs[b] - tr_cs[b - count]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                atr = np.where(last > 0.0, trs / count / last, 0.01)
+            if w >= 15:
+                dmp_cs = np.concatenate(([0.0], np.cumsum(dmp)))
+                dmn_cs = np.concatenate(([0.0], np.cumsum(dmn)))
+                dps = dmp_cs[b] - dmp_cs[b - count]
+                dns = dmn_cs[b] - dmn_cs[b - count]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    di_plus = dps / trs * 100.0
+                    di_minus = dns / trs * 100.0
+                    di_sum = di_plus + di_minus
+                    dx = np.abs(di_plus - di_minus) / di_sum * 100.0
+                adx = np.where((trs > 0.0) & (di_sum > 0.0), dx, 50.0)
+            else:
+                adx = np.full(b.shape, 50.0)
+
+        passed = (
+            (z >= self.zscore_threshold)
+            & (adx <= self.adx_threshold)
+            & (atr >= self.atr_threshold)
+        )
+        out[b] = np.where(passed, side, 0)
+
+        # Positive cooldown never expires (see docstring): zero everything
+        # after the first emitted signal
+        if self.min_bars_cooldown > 0:
+            nz = np.flatnonzero(out)
+            if nz.size > 1:
+                out[nz[1:]] = 0
+        return out
+
+    def filter_signals(
+        self,
+        last: np.ndarray,
+        mean: np.ndarray,
+        z: np.ndarray,
+        adx: np.ndarray,
+        atr: np.ndarray,
+    ) -> np.ndarray:
+        """Apply this strategy's thresholds to precomputed indicator arrays.
+
+        The arrays come from prefix_indicators; only the comparisons here
+        depend on the strategy's parameters, so sweeps reuse one indicator
+        set across every threshold combination.
+
+        Returns:
+            int8 array aligned with the indicator arrays: +1/-1/0.
+        """
+        side = np.where(
+            last < mean * self._lo_mult,
+            1,
+            np.where(last > mean * self._hi_mult, -1, 0),
+        ).astype(np.int8)
+
+        passed = (
+            (z >= self.zscore_threshold)
+            & (adx <= self.adx_threshold)
+            & (atr >= self.atr_threshold)
+        )
+        return np.where(passed, side, 0)
+
+    def signal_batch(self, history: list[tuple[int, float, float, float, float]]) -> np.ndarray:
+        """Batch version of signal() over every history prefix at once.
+
+        out[t] is the signal for bar t computed from history[:t] — the same
+        expanding-mean SMA/z-score and last-14 TR/DM filters that signal()
+        applies, evaluated for the whole series with cumulative sums
+        instead of O(n·window) per-prefix rescans. Used by the engine's
+        one-bar batch path.
+
+        Returns:
+            int8 array: +1 buy, -1 sell, 0 hold.
+        """
+        arr = np.asarray(history, dtype=np.float64)
+        n = arr.shape[0]
+        out = np.zeros(n, dtype=np.int8)
+        if n <= self.window:
+            return out
+
+        t, last, mean, z, adx, atr = prefix_indicators(
+            arr[:, 2], arr[:, 3], arr[:, 4], self.window
+        )
+        out[t] = self.filter_signals(last, mean, z, adx, atr)
+        return out
 
     def name(self) -> str:
         """Get strategy name."""
-        return f"MeanReversionOpt_{self.window}_{self.threshold}_z{self.zscore_threshold}_adx{self.adx_threshold}_atr{self.atr_threshold}_cd{self.min_bars_cooldown}"
+        return self._name
 
     def signal(self, history: list[tuple[int, float, float, float, float]]) -> Optional[str]:
         """Calculate signal using historical data with filters.
@@ -253,34 +398,99 @@ class MeanReversionOptimized(Strategy):
         if len(history) < self.window:
             return None
 
-        # Extract data
-        highs = [bar[2] for bar in history]  # high is index 2
-        lows = [bar[3] for bar in history]   # low is index 3
-        closes = [bar[4] for bar in history]  # close is index 4
+        # One C-level conversion of the whole history, then column slices —
+        # no per-column Python list comprehensions
+        arr = np.asarray(history, dtype=np.float64)
+        highs = arr[:, 2]
+        lows = arr[:, 3]
+        closes = arr[:, 4]
 
         # Filter 1: Z-score threshold
         zscore = self._calculate_zscore(closes)
         if zscore < self.zscore_threshold:
             return None
 
-        # Filter 2: ADX trend filter
-        adx = self._calculate_adx(highs, lows, closes)
-        if adx > self.adx_threshold:
+        # Mean reversion side next (cheap), so "hold" bars skip the
+        # windowed ADX/ATR entirely; emitted signals are unchanged
+        sma = closes.mean()
+        last_close = closes[-1]
+        if last_close < sma * self._lo_mult:
+            side = "buy"
+        elif last_close > sma * self._hi_mult:
+            side = "sell"
+        else:
             return None
 
-        # Filter 3: ATR volatility filter
-        atr_pct = self._calculate_atr_percentage(highs, lows, closes)
-        if atr_pct < self.atr_threshold:
+        # Filters 2+3: fused ADX/ATR pass, checks in the original order
+        adx, atr = self._adx_atr(highs, lows, closes)
+        if adx > self.adx_threshold:
             return None
-
-        # Calculate SMA
-        sma = sum(closes) / len(closes)
-        last_close = closes[-1]
-
-        # Mean reversion signals
-        if last_close < sma * (1 - self.threshold):
-            return "buy"
-        elif last_close > sma * (1 + self.threshold):
-            return "sell"
-        else:
+        if atr < self.atr_threshold:
             return None
+
+        return side
+
+
+def prefix_indicators(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, window: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Expanding-prefix indicator arrays shared by every threshold set.
+
+    Everything here depends only on the bars and the window — the
+    z-score/ADX/ATR thresholds are plain comparisons applied afterwards
+    (filter_signals) — so a parameter sweep computes these once per
+    dataset instead of once per grid point.
+
+    Returns:
+        (t, last, mean, z, adx, atr): prefix lengths with a defined
+        signal, plus the per-prefix last close, expanding mean and the
+        filter values, all aligned with t.
+    """
+    n = closes.shape[0]
+
+    # TR/±DM series (one entry per bar pair) and their prefix sums, so
+    # any trailing-14 mean is a cumsum difference
+    tr, dmp, dmn = tr_dm(highs, lows, closes)
+    tr_cs = np.concatenate(([0.0], np.cumsum(tr)))
+    dmp_cs = np.concatenate(([0.0], np.cumsum(dmp)))
+    dmn_cs = np.concatenate(([0.0], np.cumsum(dmn)))
+
+    cs = np.cumsum(closes)
+    css = np.cumsum(closes * closes)
+
+    # Prefix lengths with a defined signal (z-score needs 2 samples)
+    t = np.arange(max(window, 2), n)
+    mean = cs[t - 1] / t  # expanding mean of closes[:t]
+    var = css[t - 1] / t - mean * mean
+    std = np.sqrt(np.clip(var, 0.0, None))
+    last = closes[t - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.abs(last - mean) / std
+    z = np.where(std > 0.0, z, 0.0)
+
+    # ADX per prefix: mean TR/DM over the last 14 pairs (needs 15 bars);
+    # shorter prefixes keep the trending-market default
+    adx = np.full(t.shape, 50.0)
+    has_adx = t >= 15
+    ta = t[has_adx]
+    trs = tr_cs[ta - 1] - tr_cs[ta - 15]
+    dps = dmp_cs[ta - 1] - dmp_cs[ta - 15]
+    dns = dmn_cs[ta - 1] - dmn_cs[ta - 15]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_plus = dps / trs * 100.0
+        di_minus = dns / trs * 100.0
+        di_sum = di_plus + di_minus
+        dx = np.abs(di_plus - di_minus) / di_sum * 100.0
+    adx[has_adx] = np.where((trs > 0.0) & (di_sum > 0.0), dx, 50.0)
+
+    # ATR per prefix: mean of the trailing min(14, t-1) TRs over the
+    # last close (needs 14 bars); shorter prefixes keep the 1% default
+    atr = np.full(t.shape, 0.01)
+    has_atr = t >= 14
+    tv = t[has_atr]
+    count = np.minimum(tv - 1, 14)
+    atr_mean = (tr_cs[tv - 1] - tr_cs[tv - 1 - count]) / count
+    last_close = closes[tv - 1]
+    atr[has_atr] = np.where(last_close > 0.0, atr_mean / last_close, 0.01)
+
+    return t, last, mean, z, adx, atr
@@ -1,9 +1,14 @@
 """Freshness check utilities for trading data."""
 
+import numpy as np
 
-def is_stale(last_ts: int, now_ts: int, tf_sec: int, tol: float = 1.2) -> bool:
+
+def is_stale(last_ts: int, now_ts: int, tf_sec: int, tol: float = 1.2, /) -> bool:
     """Check if the last candle timestamp is stale.
 
+    Called per bar in strategy hot paths; positional-only parameters skip
+    CPython's keyword-binding work on every call.
+
     Args:
         last_ts: Last candle timestamp
         now_ts: Current timestamp
@@ -13,6 +18,26 @@ def is_stale(last_ts: int, now_ts: int, tf_sec: int, tol: float = 1.2) -> bool:
     Returns:
         True if stale, False if fresh
     """
-    expected_interval = tf_sec * tol
-    time_diff = now_ts - last_ts
-    return time_diff > expected_interval
+    return (now_ts - last_ts) > tf_sec * tol
+
+
+def is_stale_array(ts_arr: np.ndarray, tf_sec: int, tol: float = 1.2) -> np.ndarray:
+    """Flag stale gaps in a whole timestamp series at once.
+
+    Audits a bar series for missing candles: element i is True when the
+    gap between ts_arr[i] and ts_arr[i + 1] exceeds tf_sec * tol — the
+    same test is_stale applies to one (last_ts, now_ts) pair, evaluated
+    for every consecutive pair in one vectorized np.diff pass instead of
+    a Python loop.
+
+    Args:
+        ts_arr: Bar timestamps in ascending order (int64 array)
+        tf_sec: Timeframe in seconds
+        tol: Tolerance multiplier (default 1.2 = 20% tolerance)
+
+    Returns:
+        Boolean array of length len(ts_arr) - 1, True where the gap
+        after each bar is stale.
+    """
+    ts_arr = np.asarray(ts_arr)
+    return np.diff(ts_arr) > tf_sec * tol
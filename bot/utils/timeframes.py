@@ -25,8 +25,11 @@ def tf_to_seconds(tf: str) -> int:
     Raises:
         ValueError: If timeframe is not supported
     """
-    if tf not in TIMEFRAME_SECONDS:
+    # Single dict probe: the membership test + lookup pair hashed the key
+    # twice; unsupported timeframes are the cold path
+    try:
+        return TIMEFRAME_SECONDS[tf]
+    except KeyError:
         raise ValueError(
             f"Unsupported timeframe: {tf}. Supported: {list(TIMEFRAME_SECONDS.keys())}"
-        )
-    return TIMEFRAME_SECONDS[tf]
+        ) from None
@@ -3,35 +3,63 @@
 Автоматическая генерация TODO.md на основе анализа кода, результатов бэктестов и тестов.
 """
 
-import csv
 import re
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
+_SCAN_EXTENSIONS = {".py", ".md", ".yml", ".yaml", ".sh"}
+# Паттерн маркеров компилируется один раз на модуль, а не на каждый вызов
+_MARKER_RE = re.compile(r"(TODO|FIXME|NOTE):\s*(.+)", re.IGNORECASE)
+# Тяжёлые каталоги, где маркеров заведомо нет — не тратим syscalls
+_SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "artifacts", "user_data"}
+
+
+def _scan_candidates(project_root: Path) -> list[Path]:
+    """Файлы для сканирования: glob по каждому расширению вместо обхода
+    всего дерева с фильтрацией по suffix — пропускаем бинарники и
+    служебные каталоги без stat-вызова на каждый файл."""
+    files: list[Path] = []
+    for ext in _SCAN_EXTENSIONS:
+        for p in project_root.rglob(f"*{ext}"):
+            if _SKIP_DIRS.isdisjoint(p.parts):
+                files.append(p)
+    files.sort()  # детерминированный порядок маркеров в TODO.md
+    return files
+
 
 def scan_code_markers(project_root: Path) -> list[tuple[str, int, str]]:
     """Сканирует все файлы проекта на наличие маркеров TODO/FIXME/NOTE."""
-    markers = []
-    extensions = {".py", ".md", ".yml", ".yaml", ".sh"}
-
-    # Паттерн для поиска маркеров
-    pattern = re.compile(r"(TODO|FIXME|NOTE):\s*(.+)", re.IGNORECASE)
-
-    for file_path in project_root.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in extensions:
-            try:
-                with open(file_path, encoding="utf-8", errors="ignore") as f:
-                    for line_num, line in enumerate(f, 1):
-                        match = pattern.search(line)
-                        if match:
-                            marker_type = match.group(1).upper()
-                            text = match.group(2).strip()
-                            relative_path = file_path.relative_to(project_root)
-                            markers.append((str(relative_path), line_num, f"{marker_type}: {text}"))
-            except Exception as e:
-                print(f"Ошибка чтения файла {file_path}: {e}")
-                continue
+
+    def scan_one(file_path: Path) -> list[tuple[str, int, str]]:
+        try:
+            # Один проход regex-движка по всему файлу вместо
+            # Python-цикла по строкам; номер строки считаем только
+            # для найденных маркеров (их мало)
+            data = file_path.read_text(encoding="utf-8", errors="ignore")
+            found = []
+            relative_path = None
+            for match in _MARKER_RE.finditer(data):
+                if relative_path is None:
+                    relative_path = str(file_path.relative_to(project_root))
+                line_num = data.count("\n", 0, match.start()) + 1
+                marker_type = match.group(1).upper()
+                text = match.group(2).strip()
+                found.append((relative_path, line_num, f"{marker_type}: {text}"))
+            return found
+        except Exception as e:
+            print(f"Ошибка чтения файла {file_path}: {e}")
+            return []
+
+    # Скан I/O-bound (много мелких файлов), GIL отпускается на чтении —
+    # пул потоков перекрывает дисковые задержки; ex.map сохраняет порядок
+    markers: list[tuple[str, int, str]] = []
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        for found in ex.map(scan_one, _scan_candidates(project_root)):
+            markers.extend(found)
 
     return markers
 
@@ -57,6 +85,13 @@ def find_backtest_csvs(project_root: Path) -> list[Path]:
     return csv_files
 
 
+def _numeric_column(df: "pd.DataFrame", name: str) -> "pd.Series":
+    """Числовая колонка с заменой пропусков на 0 (как `float(x) if x else 0`)."""
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").fillna(0.0)
+    return pd.Series(0.0, index=df.index)
+
+
 def analyze_backtests(csv_files: list[Path]) -> tuple[list[dict], list[dict]]:
     """Анализирует CSV файлы с результатами бэктестов."""
     alerts = []
@@ -64,87 +99,92 @@ def analyze_backtests(csv_files: list[Path]) -> tuple[list[dict], list[dict]]:
 
     for csv_file in csv_files:
         try:
-            with open(csv_file, encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    # Пропускаем строки без данных
-                    if not row.get("mode") or not row.get("trades"):
-                        continue
-
-                    # Извлекаем метрики
-                    try:
-                        trades = int(row.get("trades", 0))
-                        equity = float(row.get("final_equity", 0))
-                        winrate = float(row.get("win_rate", 0)) if row.get("win_rate") else 0
-                        pf = float(row.get("pf", 0)) if row.get("pf") else 0
-                        dd = float(row.get("max_dd", 0)) if row.get("max_dd") else 0
-                        return_pct = float(row.get("return_pct", 0)) if row.get("return_pct") else 0
-
-                        # Проверяем условия для алертов
-                        if pf < 1.1 and pf > 0:
-                            alerts.append(
-                                {
-                                    "file": csv_file.name,
-                                    "mode": row.get("mode", "unknown"),
-                                    "pf": pf,
-                                    "reason": f"Низкий PF: {pf:.3f}",
-                                }
-                            )
-
-                        if winrate < 0.45 and winrate > 0:
-                            alerts.append(
-                                {
-                                    "file": csv_file.name,
-                                    "mode": row.get("mode", "unknown"),
-                                    "winrate": winrate,
-                                    "reason": f"Низкая win rate: {winrate:.1%}",
-                                }
-                            )
-
-                        if dd > 0.3:
-                            alerts.append(
-                                {
-                                    "file": csv_file.name,
-                                    "mode": row.get("mode", "unknown"),
-                                    "dd": dd,
-                                    "reason": f"Высокий drawdown: {dd:.1%}",
-                                }
-                            )
-
-                        if trades == 0:
-                            alerts.append(
-                                {
-                                    "file": csv_file.name,
-                                    "mode": row.get("mode", "unknown"),
-                                    "trades": trades,
-                                    "reason": "Нет сделок",
-                                }
-                            )
-
-                        # Собираем лучшие результаты по PF
-                        if pf > 1.0:
-                            best_results.append(
-                                {
-                                    "file": csv_file.name,
-                                    "mode": row.get("mode", "unknown"),
-                                    "pf": pf,
-                                    "equity": equity,
-                                    "trades": trades,
-                                    "winrate": winrate,
-                                    "dd": dd,
-                                    "return_pct": return_pct,
-                                }
-                            )
-
-                    except (ValueError, TypeError) as e:
-                        print(f"Ошибка парсинга строки в {csv_file}: {e}")
-                        continue
-
+            df = pd.read_csv(csv_file)
         except Exception as e:
             print(f"Ошибка чтения CSV файла {csv_file}: {e}")
             continue
 
+        if "mode" not in df.columns or "trades" not in df.columns:
+            continue
+
+        # Пропускаем строки без данных: пустой mode/trades и строки,
+        # где обязательные метрики не парсятся (аналог прежнего ValueError)
+        trades = pd.to_numeric(df["trades"], errors="coerce")
+        keep = df["mode"].notna() & (df["mode"].astype(str) != "") & trades.notna()
+        if "final_equity" in df.columns:
+            equity = pd.to_numeric(df["final_equity"], errors="coerce")
+            keep &= equity.notna()
+        else:
+            equity = pd.Series(0.0, index=df.index)
+
+        winrate = _numeric_column(df, "win_rate")
+        pf = _numeric_column(df, "pf")
+        dd = _numeric_column(df, "max_dd")
+        return_pct = _numeric_column(df, "return_pct")
+
+        # Условия алертов считаем булевыми масками по колонкам; Python-цикл
+        # остаётся только по строкам, которые что-то зацепили
+        low_pf = keep & (pf < 1.1) & (pf > 0)
+        low_winrate = keep & (winrate < 0.45) & (winrate > 0)
+        high_dd = keep & (dd > 0.3)
+        no_trades = keep & (trades == 0)
+        good_pf = keep & (pf > 1.0)
+
+        flagged = low_pf | low_winrate | high_dd | no_trades | good_pf
+        for i in df.index[flagged]:
+            mode = str(df.at[i, "mode"])
+            if low_pf[i]:
+                alerts.append(
+                    {
+                        "file": csv_file.name,
+                        "mode": mode,
+                        "pf": float(pf[i]),
+                        "reason": f"Низкий PF: {pf[i]:.3f}",
+                    }
+                )
+            if low_winrate[i]:
+                alerts.append(
+                    {
+                        "file": csv_file.name,
+                        "mode": mode,
+                        "winrate": float(winrate[i]),
+                        "reason": f"Низкая win rate: {winrate[i]:.1%}",
+                    }
+                )
+            if high_dd[i]:
+                alerts.append(
+                    {
+                        "file": csv_file.name,
+                        "mode": mode,
+                        "dd": float(dd[i]),
+                        "reason": f"Высокий drawdown: {dd[i]:.1%}",
+                    }
+                )
+            if no_trades[i]:
+                alerts.append(
+                    {
+                        "file": csv_file.name,
+                        "mode": mode,
+                        "trades": 0,
+                        "reason": "Нет сделок",
+                    }
+                )
+
+            # Собираем лучшие результаты по PF
+            if good_pf[i]:
+                best_results.append(
+                    {
+                        "file": csv_file.name,
+                        "mode": mode,
+                        "pf": float(pf[i]),
+                        "equity": float(equity[i]),
+                        "trades": int(trades[i]),
+                        "winrate": float(winrate[i]),
+                        "dd": float(dd[i]),
+                        "return_pct": float(return_pct[i]),
+                    }
+                )
+
     # Сортируем лучшие результаты по PF
     best_results.sort(key=lambda x: x["pf"], reverse=True)
 
@@ -159,16 +199,17 @@ def parse_junit(junit_path: Path) -> list[dict]:
         return failures
 
     try:
-        tree = ET.parse(junit_path)
-        root = tree.getroot()
-
-        # Обрабатываем тест-кейсы
-        for testcase in root.findall(".//testcase"):
-            name = testcase.get("name", "unknown")
-            classname = testcase.get("classname", "unknown")
+        # Потоковый разбор: тест-кейсы обрабатываются по мере закрытия
+        # тегов и сразу освобождаются — память не зависит от размера
+        # отчёта, в отличие от полного DOM через ET.parse
+        for _event, elem in ET.iterparse(str(junit_path), events=("end",)):
+            if elem.tag != "testcase":
+                continue
+            name = elem.get("name", "unknown")
+            classname = elem.get("classname", "unknown")
 
             # Проверяем на ошибки
-            error = testcase.find("error")
+            error = elem.find("error")
             if error is not None:
                 message = error.get("message", "Ошибка")
                 failures.append(
@@ -176,13 +217,15 @@ def parse_junit(junit_path: Path) -> list[dict]:
                 )
 
             # Проверяем на фейлы
-            failure = testcase.find("failure")
+            failure = elem.find("failure")
             if failure is not None:
                 message = failure.get("message", "Фейл")
                 failures.append(
                     {"type": "FAILURE", "test": f"{classname}.{name}", "message": message}
                 )
 
+            elem.clear()
+
     except Exception as e:
         print(f"Ошибка парсинга JUnit файла {junit_path}: {e}")
 
@@ -194,48 +237,59 @@ def render_markdown(
     backtest_alerts: list[dict],
     best_results: list[dict],
     test_failures: list[dict],
-) -> str:
-    """Генерирует Markdown содержимое для TODO.md."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+):
+    """Генерирует строки Markdown для TODO.md (генератор, без "\\n").
+
+    Ленивая выдача строк позволяет писать файл через writelines без
+    промежуточной склейки всего содержимого в одну большую строку.
+    """
+    # isoformat с отброшенными микросекундами даёт ту же строку
+    # "YYYY-MM-DD HH:MM:SS" одним C-вызовом вместо разбора формата strftime
+    timestamp = datetime.now().replace(microsecond=0).isoformat(sep=" ")
 
-    lines = [f"# TODO (auto-generated) — {timestamp}", "", "## 🚨 Test Failures", ""]
+    yield f"# TODO (auto-generated) — {timestamp}"
+    yield ""
+    yield "## 🚨 Test Failures"
+    yield ""
 
     if test_failures:
         for failure in test_failures:
-            lines.append(f"- [ ] **{failure['type']}**: {failure['test']} — {failure['message']}")
+            yield f"- [ ] **{failure['type']}**: {failure['test']} — {failure['message']}"
     else:
-        lines.append("- [ ] Нет ошибок тестов")
+        yield "- [ ] Нет ошибок тестов"
 
-    lines.extend(["", "## 📉 Backtest Alerts", ""])
+    yield ""
+    yield "## 📉 Backtest Alerts"
+    yield ""
 
     if backtest_alerts:
         for alert in backtest_alerts:
-            lines.append(f"- [ ] **{alert['mode']}** ({alert['file']}): {alert['reason']}")
+            yield f"- [ ] **{alert['mode']}** ({alert['file']}): {alert['reason']}"
     else:
-        lines.append("- [ ] Нет алертов бэктестов")
+        yield "- [ ] Нет алертов бэктестов"
 
-    lines.extend(["", "## 📈 Suggestions from Results", ""])
+    yield ""
+    yield "## 📈 Suggestions from Results"
+    yield ""
 
     if best_results:
         # Показываем топ-3 лучших результата
         for i, result in enumerate(best_results[:3], 1):
-            lines.append(
+            yield (
                 f"- [ ] **#{i}** {result['mode']} (PF: {result['pf']:.3f}, Equity: {result['equity']:.0f}, Trades: {result['trades']})"
             )
     else:
-        lines.append("- [ ] Нет данных для анализа")
+        yield "- [ ] Нет данных для анализа"
 
-    lines.extend(["", "## 🛠 Code Markers (TODO/FIXME/NOTE)", ""])
+    yield ""
+    yield "## 🛠 Code Markers (TODO/FIXME/NOTE)"
+    yield ""
 
     if code_markers:
         for file_path, line_num, text in code_markers:
-            lines.append(f"- [ ] `{file_path}:{line_num}` — {text}")
+            yield f"- [ ] `{file_path}:{line_num}` — {text}"
     else:
-        lines.append("- [ ] Нет маркеров в коде")
-
-    lines.append("")
-
-    return "\n".join(lines)
+        yield "- [ ] Нет маркеров в коде"
 
 
 def main():
@@ -279,15 +333,17 @@ def main():
 
     print(f"Найдено ошибок тестов: {len(test_failures)}")
 
-    # 5. Генерируем Markdown
+    # 5-6. Генерируем Markdown и стримим его в файл построчно
     print("Генерация TODO.md...")
-    markdown_content = render_markdown(code_markers, backtest_alerts, best_results, test_failures)
-
-    # 6. Записываем в файл
     todo_path = project_root / "TODO.md"
     try:
         with open(todo_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
+            f.writelines(
+                line + "\n"
+                for line in render_markdown(
+                    code_markers, backtest_alerts, best_results, test_failures
+                )
+            )
         print(f"TODO.md успешно создан: {todo_path}")
     except Exception as e:
         print(f"Ошибка записи TODO.md: {e}")
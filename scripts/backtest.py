@@ -2,146 +2,140 @@
 """Backtest CLI script."""
 
 import argparse
-import csv
+import hashlib
 import json
 import os
+import signal
 import sys
 import time
 import threading
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from bot.backtest.engine import run_backtest, run_backtest_onebar  # noqa: E402
+from bot.cli.backtest_runner import (  # noqa: E402
+    ensure_dir,
+    format_metrics_table,
+    save_single_result_csv,
+)
 from bot.data.loader import get_source, load_data  # noqa: E402
-from bot.report.pretty import PrettyCtx, render, save_json  # noqa: E402
+from bot.data.ohlcv_source import OHLCVColumns  # noqa: E402
 from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
-from bot.strategy.mean_reversion_optimized import MeanReversionOptimized  # noqa: E402
-from utils.dates import filter_bars_by_date, iso_utc  # noqa: E402
+from utils.dates import filter_bars_by_date_np, iso_utc  # noqa: E402
+
+# MeanReversionOptimized (extra indicator kernels to JIT-compile) and the
+# pretty report module are imported lazily in main(): runs that use neither
+# don't pay their import/warm-up on every CLI launch.
 
-# UTF-8 support
+# UTF-8 support; line buffering flushes on newline, so individual prints
+# don't need flush=True (and its per-call write syscall)
 os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 if hasattr(sys.stdout, "reconfigure"):
-    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8", line_buffering=True)
+
+
+# Process start reference for log_stage offsets; time.monotonic() is one
+# clock read, where datetime.now().strftime built a struct_tm and a fresh
+# string per call
+_T0 = time.monotonic()
 
 
 def log_stage(stage: str, verbose: bool = False) -> None:
-    """Log stage with timestamp."""
+    """Log stage with seconds elapsed since process start."""
     if verbose:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {stage}", flush=True)
+        print(f"[{time.monotonic() - _T0:7.2f}s] {stage}")
 
 
 def log_timing(stage: str, duration: float, verbose: bool = False) -> None:
     """Log stage timing."""
     if verbose:
-        print(f"[timing] {stage}: {duration:.2f}s", flush=True)
+        print(f"[timing] {stage}: {duration:.2f}s")
 
 
 def progress_callback(current: int, total: int, verbose: bool = False) -> None:
-    """Progress callback for engine."""
-    if verbose and current % 1000 == 0:
+    """Progress callback for engine (invoked on the engine's sampling cadence)."""
+    if verbose:
         percentage = (current / total) * 100
-        print(f"[progress] processed {current:,}/{total:,} bars ({percentage:.1f}%)", flush=True)
+        print(f"[progress] processed {current:,}/{total:,} bars ({percentage:.1f}%)")
 
 
 def watchdog_timer(stop_event: threading.Event, verbose: bool = False) -> None:
-    """Watchdog timer to detect silent hangs."""
+    """Watchdog timer to detect silent hangs (thread fallback for Windows)."""
     last_log_time = time.time()
     while not stop_event.is_set():
         time.sleep(30)  # Check every 30 seconds
         if time.time() - last_log_time > 120:  # 2 minutes without activity
             if verbose:
-                print("[watchdog] still working...", flush=True)
+                print("[watchdog] still working...")
             last_log_time = time.time()
 
 
-def format_metrics_table(metrics: dict, mode: str) -> str:
-    """Format metrics as a human-readable table."""
-    lines = [f"=== Backtest Results (mode={mode}) ==="]
-
-    # Format numeric values with appropriate precision
-    for key, value in sorted(metrics.items()):
-        if isinstance(value, float):
-            if value == float("inf"):
-                formatted_value = "inf"
-            elif abs(value) < 0.001:
-                formatted_value = f"{value:.6f}"
-            elif abs(value) < 1:
-                formatted_value = f"{value:.3f}"
-            else:
-                formatted_value = f"{value:.2f}"
-        else:
-            formatted_value = str(value)
-
-        # Format key names nicely
-        display_key = key.replace("_", " ").title()
-        lines.append(f"{display_key:<15} {formatted_value}")
-
-    return "\n".join(lines)
-
-
-def save_single_result_csv(
-    metrics: dict,
-    mode: str,
-    bars: int,
-    fee: float,
-    threshold: float,
-    output_path: Path,
-    append: bool = False,
-) -> None:
-    """Save single backtest result to CSV."""
-    # Create directory if needed
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Unify metrics to standard format
-    unified = {
-        "mode": mode,
-        "bars": bars,
-        "fee": fee,
-        "threshold": threshold,
-        "seed": 42,  # Fixed seed for consistency
-        "trades": metrics.get("trades", 0),
-        "final_equity": metrics.get("final_equity", 0.0),
-        "win_rate": metrics.get("win_rate", ""),
-        "pf": metrics.get("pf", ""),
-        "max_dd": metrics.get("max_dd", 0.0),
-        "return_pct": metrics.get("return_pct", ""),
-        "total_fees": metrics.get("total_fees", ""),
-    }
-
-    # CSV headers
-    headers = [
-        "mode",
-        "bars",
-        "fee",
-        "threshold",
-        "seed",
-        "trades",
-        "final_equity",
-        "win_rate",
-        "pf",
-        "max_dd",
-        "return_pct",
-        "total_fees",
-    ]
-
-    # Write CSV
-    mode_str = "a" if append else "w"
-    file_exists = output_path.exists()
-
-    with open(output_path, mode_str, newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        # Write header if file doesn't exist or not appending
-        if not file_exists or not append:
-            writer.writeheader()
-        writer.writerow(unified)
-
-
-def main() -> int:
+def _watchdog_alarm(signum, frame) -> None:
+    """SIGALRM handler: liveness line every interval, no extra thread."""
+    print("[watchdog] still working...", file=sys.stderr, flush=True)
+
+
+def _bars_cache_path(
+    source_kind: str,
+    timeframe: str,
+    bars: int | None,
+    start: str | None,
+    end: str | None,
+) -> Path:
+    """Cache file for one load request; the key covers every load parameter.
+
+    hashlib instead of the builtin hash(): string hashing is randomized per
+    process, which would defeat a cross-invocation cache.
+    """
+    key_str = f"{source_kind}|{timeframe}|{bars}|{start}|{end}"
+    key = hashlib.blake2b(key_str.encode(), digest_size=8).hexdigest()
+    return Path("artifacts/cache") / f"bars_{key}.npy"
+
+
+def _load_bars_cached(
+    src,
+    source_kind: str,
+    timeframe: str,
+    bars_to_use: int | None,
+    start: str | None,
+    end: str | None,
+    verbose: bool = False,
+) -> list[tuple[int, float, float, float, float, int]]:
+    """Load bars via src.load() with an .npy disk cache keyed on the request.
+
+    Parameter sweeps re-invoke this CLI with identical load parameters; the
+    cache turns every repeat into a memory-mapped np.load instead of a
+    synthetic regeneration or historical re-parse. Real (network) data is
+    never cached — its latest bars change between calls by design.
+    """
+    cache_path = _bars_cache_path(source_kind, timeframe, bars_to_use, start, end)
+    if cache_path.exists():
+        arr = np.load(cache_path, mmap_mode="r")
+        log_stage(f"Loaded {arr.shape[0]:,} bars from cache: {cache_path}", verbose)
+        return OHLCVColumns.from_bars(arr).to_bars()
+
+    bars = src.load(tf=timeframe, bars=bars_to_use, start=start, end=end)
+
+    arr = np.asarray(bars, dtype=np.float64)
+    if arr.size == 0:
+        arr = arr.reshape(0, 6)
+    ensure_dir(cache_path.parent)
+    # Write-then-rename so parallel sweep workers never read a partial file
+    # (np.save would re-append .npy to a bare .tmp path, hence the handle)
+    tmp_path = cache_path.with_suffix(".npy.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp_path, cache_path)
+    return bars
+
+
+def main(argv: list[str] | None = None) -> int:
     """Run backtest and print results."""
     parser = argparse.ArgumentParser(description="Run backtest")
     parser.add_argument(
@@ -279,6 +273,11 @@ def main() -> int:
         type=int,
         help="Limit number of bars for backtest (overrides --smoke)",
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress the JSON/table result output (for sweep runners)",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -289,15 +288,28 @@ def main() -> int:
         action="store_true",
         help="Enable cProfile profiling and save stats to artifacts/profile_<timestamp>.prof",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    # Start watchdog timer if verbose
+    # Start watchdog if verbose. On POSIX a SIGALRM interval timer does the
+    # job with zero extra threads and no 30s wakeups; Windows keeps the
+    # original daemon thread.
     stop_event = threading.Event()
-    watchdog_thread = None
+    use_alarm = hasattr(signal, "SIGALRM")
     if args.verbose:
-        watchdog_thread = threading.Thread(target=watchdog_timer, args=(stop_event, args.verbose))
-        watchdog_thread.daemon = True
-        watchdog_thread.start()
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _watchdog_alarm)
+            signal.setitimer(signal.ITIMER_REAL, 120.0, 120.0)
+        else:
+            watchdog_thread = threading.Thread(
+                target=watchdog_timer, args=(stop_event, args.verbose)
+            )
+            watchdog_thread.daemon = True
+            watchdog_thread.start()
+
+    def stop_watchdog() -> None:
+        if args.verbose and use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0.0)
+        stop_event.set()
 
     # Determine max bars limit
     max_bars = None
@@ -308,7 +320,7 @@ def main() -> int:
 
     # Load data with timing
     log_stage("Loading data", args.verbose)
-    start_time = time.time()
+    start_time = time.monotonic()
     
     if args.data_source == "real":
         # For real data, use specific parameters
@@ -325,45 +337,51 @@ def main() -> int:
         
         # bars_to_use: если задан диапазон — не резать
         bars_to_use = 0 if (args.start or args.end) else getattr(args, "bars", None)
-        bars: list[tuple[int, float, float, float, float, int]] = src.load(
-            tf=args.timeframe, bars=bars_to_use, start=args.start, end=args.end
+        bars: list[tuple[int, float, float, float, float, int]] = _load_bars_cached(
+            src, source_kind, args.timeframe, bars_to_use, args.start, args.end, args.verbose
         )
 
-    log_timing("Data loading", time.time() - start_time, args.verbose)
+    if args.verbose:
+        log_timing("Data loading", time.monotonic() - start_time, True)
+
+    # Split bars into SoA columns once: the engine reads the contiguous
+    # float64 columns directly instead of re-converting the tuple list, and
+    # batch strategies never touch per-bar PyObjects at all
+    bars = OHLCVColumns.from_bars(bars)
 
-    # Apply max bars limit
+    # Apply max bars limit — on columns this is a zero-copy view slice,
+    # not a new list of max_bars tuple pointers
     original_bars = len(bars)
     if max_bars and len(bars) > max_bars:
         bars = bars[-max_bars:]  # Take last N bars
         log_stage(f"Trimmed data from {original_bars:,} to {len(bars):,} bars", args.verbose)
 
-    # фильтрация + логирование
+    # фильтрация + логирование: бинарный поиск по отсортированным
+    # таймстемпам вместо прохода по всем барам
     log_stage("Filtering data by date range", args.verbose)
-    filter_start = time.time()
+    filter_start = time.monotonic()
     before = len(bars)
-    filtered_bars, st, et = filter_bars_by_date(bars, args.start, args.end)
-    bars = filtered_bars  # type: ignore[assignment]
+    lo, hi, st, et = filter_bars_by_date_np(bars.ts, args.start, args.end)
+    bars = bars[lo:hi]  # zero-copy column views
     after = len(bars)
-    log_timing("Date filtering", time.time() - filter_start, args.verbose)
+    if args.verbose:
+        log_timing("Date filtering", time.monotonic() - filter_start, True)
     
-    print(
-        f"[range] start={iso_utc(st)} end={iso_utc(et)} bars_before={before} bars_after={after}",
-        flush=True,
-    )
+    print(f"[range] start={iso_utc(st)} end={iso_utc(et)} bars_before={before} bars_after={after}")
 
     # fail-fast если диапазон указан и баров нет
     if (args.start or args.end) and not bars:
-        print(
-            f"[ERR] No bars in range {iso_utc(st)}..{iso_utc(et)} timeframe={args.timeframe}",
-            flush=True,
-        )
+        print(f"[ERR] No bars in range {iso_utc(st)}..{iso_utc(et)} timeframe={args.timeframe}")
+        sys.stdout.flush()
         sys.exit(2)
 
     # Initialize strategy
     log_stage("Initializing strategy", args.verbose)
-    strategy_start = time.time()
+    strategy_start = time.monotonic()
     
     if args.strategy == "optimized":
+        from bot.strategy.mean_reversion_optimized import MeanReversionOptimized
+
         strategy = MeanReversionOptimized(
             window=20,
             threshold=args.threshold,
@@ -376,11 +394,12 @@ def main() -> int:
     else:
         strategy = MeanReversion(window=20, threshold=args.threshold, timeframe="15m")
     
-    log_timing("Strategy initialization", time.time() - strategy_start, args.verbose)
+    if args.verbose:
+        log_timing("Strategy initialization", time.monotonic() - strategy_start, True)
 
     # Run backtest with profiling if requested
     log_stage(f"Running {args.mode} backtest on {len(bars):,} bars", args.verbose)
-    engine_start = time.time()
+    engine_start = time.monotonic()
     
     if args.profile:
         import cProfile
@@ -408,8 +427,9 @@ def main() -> int:
     except Exception as e:
         if args.profile:
             profiler.disable()
-        stop_event.set()
-        print(f"[ERROR] Backtest failed: {e}", flush=True)
+        stop_watchdog()
+        print(f"[ERROR] Backtest failed: {e}")
+        sys.stdout.flush()
         sys.exit(2)
     finally:
         if args.profile:
@@ -417,33 +437,38 @@ def main() -> int:
             # Save profile
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             profile_path = Path(f"artifacts/profile_{timestamp}.prof")
-            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(profile_path.parent)
             profiler.dump_stats(str(profile_path))
             print(f"[profile] Saved to: {profile_path}")
             print(f"[profile] View with: python -m pstats {profile_path}")
     
-    log_timing("Backtest engine", time.time() - engine_start, args.verbose)
+    if args.verbose:
+        log_timing("Backtest engine", time.monotonic() - engine_start, True)
     
     # Stop watchdog
-    stop_event.set()
+    stop_watchdog()
 
-    # Print results as JSON
-    print(json.dumps(metrics, indent=2, sort_keys=True))
+    # Sort the metrics once; the JSON dump and the table reuse the order
+    # (json.dumps keeps dict insertion order, so sort_keys is redundant)
 
-    # Print human-readable table
-    print()
-    print(format_metrics_table(metrics, args.mode))
+    if not args.quiet:
+        # Print results as JSON
+        print(json.dumps(metrics, indent=2))
+
+        # Print human-readable table
+        print()
+        print(format_metrics_table(metrics, args.mode))
 
     # Save to CSV if requested
     if args.out:
         log_stage("Saving results to CSV", args.verbose)
-        save_start = time.time()
+        save_start = time.monotonic()
         output_path = Path(args.out)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         save_single_result_csv(
             metrics, args.mode, args.bars, args.fee, args.threshold, output_path, args.append
         )
-        log_timing("CSV save", time.time() - save_start, args.verbose)
+        if args.verbose:
+            log_timing("CSV save", time.monotonic() - save_start, True)
         print(f"\nResult saved to: {output_path}")
     
     # Print summary
@@ -451,10 +476,12 @@ def main() -> int:
         print(f"\n[summary] Data: {original_bars:,} → {len(bars):,} bars")
         print(f"[summary] Strategy: {strategy.name()}")
         print(f"[summary] Mode: {args.mode}")
-        print(f"[summary] Total time: {time.time() - start_time:.2f}s")
+        print(f"[summary] Total time: {time.monotonic() - start_time:.2f}s")
 
     # Generate pretty report if requested
     if args.pretty:
+        from bot.report.pretty import PrettyCtx, render, to_json
+
         # Prepare context for pretty report
         if args.pretty_symbols:
             # Parse symbols from command line
@@ -471,20 +498,24 @@ def main() -> int:
             symbols_bars = [(sym, len(bars))]
 
         signals_total = metrics.get("trades")  # если «сигналы == сделки», иначе оставь None
-        signals_period = (bars[0][0], bars[-1][0]) if bars else None
+        signals_period = (int(bars.ts[0]), int(bars.ts[-1])) if len(bars) else None
 
-        # чекпоинты (если нет equity_curve)
+        # чекпоинты (если нет equity_curve): доли в промилле, сделки — целочисленно
         checkpoints = []
         if metrics.get("trades"):
             T = metrics["trades"]
-            for k in (0.189, 0.378, 0.567, 0.756, 0.945):
-                checkpoints.append((k, 0.0, int(T * k)))  # баланс=0.0, чтобы сохранить структуру
+            for num in (189, 378, 567, 756, 945):
+                # баланс=0.0, чтобы сохранить структуру
+                checkpoints.append((num / 1000, 0.0, (T * num) // 1000))
 
         params = {
             "Базовый размер позиции": "6%",
             "Максимальный размер": "10%",
             "Торговые расходы": (
-                f"{int(round((args.fee or 0.0)*10000))} bps" if hasattr(args, "fee") else "N/A"
+                # комиссия → bps без float-round: микродоли + полубипс для округления
+                f"{(int((args.fee or 0.0) * 1_000_000) + 50) // 100} bps"
+                if hasattr(args, "fee")
+                else "N/A"
             ),
         }
 
@@ -504,11 +535,12 @@ def main() -> int:
         summary = render(ctx)
         print("\n" + summary)
 
-        # Save JSON to both locations
-        save_json(ctx, "balanced_two_year_results.json")
+        # Save JSON to both locations — serialize the ctx once, write twice
+        payload = to_json(ctx)
+        Path("balanced_two_year_results.json").write_text(payload, encoding="utf-8")
         out_dir = Path("artifacts/reports")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        save_json(ctx, out_dir / "balanced_two_year_results.json")
+        ensure_dir(out_dir)
+        (out_dir / "balanced_two_year_results.json").write_text(payload, encoding="utf-8")
 
         # Add to GitHub Step Summary if available
         summ = os.environ.get("GITHUB_STEP_SUMMARY")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""In-process parameter sweep over backtest combinations.
+
+Looping scripts/backtest.py pays a fresh interpreter start, import
+warm-up and data load per combination. This entry point loads the bars
+once and evaluates the whole grid in-process: one-bar mode goes through
+the engine's batched run_backtest_onebar_batch kernel, close mode fans
+out over a process pool whose workers receive the bar columns once at
+startup instead of per task. Results land in one CSV via the batch
+writer.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from bot.backtest.engine import run_backtest, run_backtest_onebar_batch  # noqa: E402
+from bot.cli.backtest_runner import save_many_results_csv, unified_row  # noqa: E402
+from bot.data.loader import get_source  # noqa: E402
+from bot.data.ohlcv_source import OHLCVColumns  # noqa: E402
+from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
+from bot.strategy.mean_reversion_optimized import MeanReversionOptimized  # noqa: E402
+from scripts.backtest import _load_bars_cached  # noqa: E402
+from utils.dates import filter_bars_by_date_np  # noqa: E402
+
+
+def parse_float_list(value: str) -> list[float]:
+    """Parse comma-separated string into list of floats."""
+    return [float(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def parse_int_list(value: str) -> list[int]:
+    """Parse comma-separated string into list of ints."""
+    return [int(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def build_strategies(args: argparse.Namespace) -> list[tuple[float, object]]:
+    """One (threshold, strategy) pair per grid point; fees multiply later."""
+    if args.strategy == "optimized":
+        grid = product(
+            args.thresholds,
+            args.zs_thresholds,
+            args.adx_max_values,
+            args.atrpct_min_values,
+            args.cooldowns,
+        )
+        return [
+            (
+                th,
+                MeanReversionOptimized(
+                    window=20,
+                    threshold=th,
+                    timeframe="15m",
+                    zscore_threshold=zs,
+                    adx_threshold=adx,
+                    atr_threshold=atr,
+                    min_bars_cooldown=cd,
+                ),
+            )
+            for th, zs, adx, atr, cd in grid
+        ]
+    return [
+        (th, MeanReversion(window=20, threshold=th, timeframe="15m")) for th in args.thresholds
+    ]
+
+
+# Close-mode workers keep the shared bar columns in a module global: the
+# initializer receives them once per worker process instead of every task
+# re-pickling the whole dataset.
+_worker_cols: OHLCVColumns | None = None
+
+
+def _worker_init(cols: OHLCVColumns) -> None:
+    global _worker_cols
+    _worker_cols = cols
+
+
+def _run_one(job: tuple[object, float]) -> dict:
+    """Run one close-mode combination against the worker's shared bars."""
+    strategy, fee = job
+    metrics, _ = run_backtest(_worker_cols, strategy, fee=fee)
+    return metrics
+
+
+def main() -> int:
+    """Run the sweep and write all rows to one CSV."""
+    parser = argparse.ArgumentParser(description="Run backtest parameter sweep")
+    parser.add_argument("--mode", choices=["close", "onebar"], default="onebar")
+    parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--start", type=str, help="Start date: YYYY-MM-DD")
+    parser.add_argument("--end", type=str, help="End date: YYYY-MM-DD")
+    parser.add_argument(
+        "--data-source", choices=["historical", "synthetic"], default="historical"
+    )
+    parser.add_argument("--strategy", choices=["basic", "optimized"], default="basic")
+    parser.add_argument("--thresholds", type=parse_float_list, default=[0.005])
+    parser.add_argument("--fees", type=parse_float_list, default=[0.001])
+    parser.add_argument("--zs-thresholds", type=parse_float_list, default=[2.0])
+    parser.add_argument("--adx-max-values", type=parse_float_list, default=[25.0])
+    parser.add_argument("--atrpct-min-values", type=parse_float_list, default=[0.005])
+    parser.add_argument("--cooldowns", type=parse_int_list, default=[5])
+    parser.add_argument("--out", required=True, help="Output CSV path")
+    parser.add_argument("--append", action="store_true")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Load once (shared .npy cache with scripts/backtest.py), then filter
+    # on the timestamp column
+    source_kind = os.getenv("DATA_SOURCE", args.data_source)
+    src = get_source(source_kind)
+    bars_to_use = 0 if (args.start or args.end) else args.bars
+    bars = _load_bars_cached(src, source_kind, args.timeframe, bars_to_use, args.start, args.end)
+    cols = OHLCVColumns.from_bars(bars)
+    lo, hi, _, _ = filter_bars_by_date_np(cols.ts, args.start, args.end)
+    cols = cols[lo:hi]
+
+    strategies = build_strategies(args)
+    combos = [(th, strategy, fee) for (th, strategy), fee in product(strategies, args.fees)]
+
+    if args.mode == "onebar":
+        # Signals are collected once per strategy and all (strategy, fee)
+        # pairs run through one batched kernel call
+        results = run_backtest_onebar_batch(cols, [s for _, s in strategies], args.fees)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs, initializer=_worker_init, initargs=(cols,)
+        ) as ex:
+            # Pickling each job hands every worker its own strategy copy,
+            # so scalar strategies can mutate state safely
+            results = list(ex.map(_run_one, [(s, fee) for _, s, fee in combos]))
+
+    rows = [
+        unified_row(metrics, args.mode, len(cols), fee, th)
+        for (th, _, fee), metrics in zip(combos, results)
+    ]
+    output_path = Path(args.out)
+    save_many_results_csv(rows, output_path, args.append)
+    print(f"[sweep] mode={args.mode} combos={len(rows)} bars={len(cols)} -> {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ import argparse
 import csv
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
@@ -27,16 +28,24 @@ def parse_float_list(value: str) -> list[float]:
     return [float(item.strip()) for item in value.split(",") if item.strip()]
 
 
-def run_single_backtest(
-    mode: str,
+def run_grid(
+    modes: list[str],
+    fees: list[float],
+    thresholds: list[float],
     bars: int,
-    fee: float,
-    threshold: float,
     seed: int,
     start_date: str | None = None,
     end_date: str | None = None,
-) -> dict[str, float | int | str]:
-    """Run a single backtest and return unified metrics."""
+) -> list[dict[str, float | int | str]]:
+    """Run the whole mode × fee × threshold grid and return unified rows.
+
+    The data is loaded and date-filtered once for every configuration.
+    Each grid point is independent, so a thread pool runs them
+    ~cores-at-a-time (the engine spends its time in NumPy kernels that
+    release the GIL — same pattern as bench_small.run_params_parallel);
+    results are collected in grid order, so CSV rows and the summary
+    table are unaffected by completion order.
+    """
     # Load data using factory
     source_kind = os.getenv("DATA_SOURCE", "real")
     src = get_source(source_kind)
@@ -49,32 +58,41 @@ def run_single_backtest(
     if start_date or end_date:
         bars_data, _, _ = filter_bars_by_date(bars_data, start_date, end_date)
 
-    # Initialize strategy
-    strategy = MeanReversion(window=20, threshold=threshold, timeframe="15m")
+    def run_one(mode: str, fee: float, threshold: float) -> dict[str, float | int | str]:
+        # Per-task strategy instance: on_bar state is not shareable
+        strategy = MeanReversion(window=20, threshold=threshold, timeframe="15m")
+        if mode == "onebar":
+            metrics, _ = run_backtest_onebar(bars_data, strategy, fee=fee)
+        else:
+            metrics, _ = run_backtest(bars_data, strategy, fee=fee)
+
+        # Unify metrics to standard format
+        return {
+            "mode": mode,
+            "bars": bars_to_use,
+            "fee": fee,
+            "threshold": threshold,
+            "seed": seed,
+            "trades": metrics.get("trades", 0),
+            "final_equity": metrics.get("final_equity", 0.0),
+            "win_rate": metrics.get("win_rate", ""),
+            "pf": metrics.get("pf", ""),
+            "max_dd": metrics.get("max_dd", 0.0),
+            "return_pct": metrics.get("return_pct", ""),
+            "total_fees": metrics.get("total_fees", ""),
+        }
+
+    grid = [(mode, fee, threshold) for mode in modes for fee in fees for threshold in thresholds]
+    total = len(grid)
+    results = []
+    max_workers = min(os.cpu_count() or 1, total) if total else 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_one, mode, fee, threshold) for mode, fee, threshold in grid]
+        for current, (future, (mode, fee, threshold)) in enumerate(zip(futures, grid), start=1):
+            results.append(future.result())
+            print(f"Completed {current}/{total}: {mode}, fee={fee:.3f}, threshold={threshold:.3f}")
 
-    # Run backtest based on mode
-    if mode == "onebar":
-        metrics, _ = run_backtest_onebar(bars_data, strategy, fee=fee)
-    else:
-        metrics, _ = run_backtest(bars_data, strategy, fee=fee)
-
-    # Unify metrics to standard format
-    unified = {
-        "mode": mode,
-        "bars": bars,
-        "fee": fee,
-        "threshold": threshold,
-        "seed": seed,
-        "trades": metrics.get("trades", 0),
-        "final_equity": metrics.get("final_equity", 0.0),
-        "win_rate": metrics.get("win_rate", ""),
-        "pf": metrics.get("pf", ""),
-        "max_dd": metrics.get("max_dd", 0.0),
-        "return_pct": metrics.get("return_pct", ""),
-        "total_fees": metrics.get("total_fees", ""),
-    }
-
-    return unified
+    return results
 
 
 def save_csv(results: list[dict], output_path: Path, append: bool = False) -> None:
@@ -98,16 +116,25 @@ def save_csv(results: list[dict], output_path: Path, append: bool = False) -> No
         "total_fees",
     ]
 
-    # Write CSV
-    mode = "a" if append else "w"
-    file_exists = output_path.exists()
+    # Write CSV; plain writer over tuple rows skips DictWriter's per-row
+    # field mapping and fieldname check. In append mode the open itself
+    # tells us whether the file is new ("x" succeeds), so no extra stat
+    if append:
+        try:
+            f = open(output_path, "x", newline="", encoding="utf-8")
+            write_header = True
+        except FileExistsError:
+            f = open(output_path, "a", newline="", encoding="utf-8")
+            write_header = False
+    else:
+        f = open(output_path, "w", newline="", encoding="utf-8")
+        write_header = True
 
-    with open(output_path, mode, newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        # Write header if file doesn't exist or not appending
-        if not file_exists or not append:
-            writer.writeheader()
-        writer.writerows(results)
+    with f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(headers)
+        writer.writerows(tuple(result.get(h, "") for h in headers) for result in results)
 
 
 def print_summary_table(results: list[dict]) -> None:
@@ -116,7 +143,6 @@ def print_summary_table(results: list[dict]) -> None:
         print("No results to display.")
         return
 
-    # Calculate column widths
     headers = [
         "Mode",
         "Bars",
@@ -128,48 +154,37 @@ def print_summary_table(results: list[dict]) -> None:
         "PF",
         "Max DD",
     ]
-    widths = [len(h) for h in headers]
-
-    for result in results:
-        widths[0] = max(widths[0], len(str(result["mode"])))
-        widths[1] = max(widths[1], len(str(result["bars"])))
-        widths[2] = max(widths[2], len(f"{result['fee']:.3f}"))
-        widths[3] = max(widths[3], len(f"{result['threshold']:.3f}"))
-        widths[4] = max(widths[4], len(str(result["trades"])))
-        widths[5] = max(widths[5], len(f"{result['final_equity']:.2f}"))
-        widths[6] = max(
-            widths[6], len(str(result["win_rate"]) if result["win_rate"] != "" else "N/A")
-        )
-        widths[7] = max(widths[7], len(str(result["pf"]) if result["pf"] != "" else "N/A"))
-        widths[8] = max(widths[8], len(f"{result['max_dd']:.3f}"))
-
-    # Print header
-    header_line = " | ".join(f"{h:<{w}}" for h, w in zip(headers, widths))
-    print(header_line)
-    print("-" * len(header_line))
-
-    # Print data rows
-    for result in results:
-        win_rate_str = f"{result['win_rate']:.3f}" if result["win_rate"] != "" else "N/A"
-        pf_str = f"{result['pf']:.3f}" if result["pf"] != "" else "N/A"
 
-        row = [
+    # Format every cell exactly once; widths come from the formatted
+    # strings, so the same value is never formatted twice
+    rows = [
+        [
             str(result["mode"]),
             str(result["bars"]),
             f"{result['fee']:.3f}",
             f"{result['threshold']:.3f}",
             str(result["trades"]),
             f"{result['final_equity']:.2f}",
-            win_rate_str,
-            pf_str,
+            f"{result['win_rate']:.3f}" if result["win_rate"] != "" else "N/A",
+            f"{result['pf']:.3f}" if result["pf"] != "" else "N/A",
             f"{result['max_dd']:.3f}",
         ]
+        for result in results
+    ]
+
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+
+    # Print header
+    header_line = " | ".join(f"{h:<{w}}" for h, w in zip(headers, widths))
+    print(header_line)
+    print("-" * len(header_line))
 
-        row_line = " | ".join(f"{cell:<{w}}" for cell, w in zip(row, widths))
-        print(row_line)
+    # Print data rows
+    for row in rows:
+        print(" | ".join(f"{cell:<{w}}" for cell, w in zip(row, widths)))
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Run batch backtest and save results to CSV."""
     parser = argparse.ArgumentParser(description="Run batch backtest with CSV output")
     parser.add_argument(
@@ -220,7 +235,7 @@ def main() -> int:
         help="End date: YYYY-MM-DD",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Parse arguments
     modes = parse_comma_separated(args.modes)
@@ -252,33 +267,18 @@ def main() -> int:
         return 1
 
     # Run batch backtests
-    results = []
     total_combinations = len(modes) * len(fees) * len(thresholds)
-    current = 0
 
     print(f"Running {total_combinations} backtest combinations...")
     print(
         f"Parameters: modes={modes}, fees={fees}, thresholds={thresholds}, bars={args.bars}, seed={args.seed}"
     )
 
-    for mode in modes:
-        for fee in fees:
-            for threshold in thresholds:
-                current += 1
-                print(
-                    f"Running {current}/{total_combinations}: {mode}, fee={fee:.3f}, threshold={threshold:.3f}"
-                )
-
-                try:
-                    # Если задан start/end — не передавай bars (или выставь bars=0)
-                    bars_to_use = 0 if (args.start or args.end) else args.bars
-                    result = run_single_backtest(
-                        mode, bars_to_use, fee, threshold, args.seed, args.start, args.end
-                    )
-                    results.append(result)
-                except Exception as e:
-                    print(f"Error running backtest: {e}")
-                    return 1
+    try:
+        results = run_grid(modes, fees, thresholds, args.bars, args.seed, args.start, args.end)
+    except Exception as e:
+        print(f"Error running backtest: {e}")
+        return 1
 
     # Save results
     save_csv(results, output_path, args.append)
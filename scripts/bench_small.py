@@ -3,155 +3,278 @@
 
 import argparse
 import csv
+import hashlib
 import json
-import re
-import subprocess
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cache
+from itertools import product
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# orjson serializes a few times faster than stdlib json when present;
+# the grid output falls back to stdlib silently (same pattern as the
+# optional numba dependency in bot/backtest/_jit.py)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from bot.backtest.engine import run_backtest_onebar  # noqa: E402
 from bot.data.loader import load_data  # noqa: E402
+from bot.data.ohlcv_source import OHLCVColumns  # noqa: E402
+from bot.strategy.mean_reversion_optimized import (  # noqa: E402
+    MeanReversionOptimized,
+    prefix_indicators,
+)
+
+# Parameter grids, materialized once at import and shared with
+# scripts/cloud_optimize.py (previously both scripts hard-coded the same
+# lists and rebuilt the combinations with nested loops)
+ZS_THRESHOLDS = [1.2, 1.5, 1.8, 2.0]
+ADX_MAX_VALUES = [20, 25, 30]
+ATRPCT_MIN_VALUES = [0.003, 0.004, 0.005]
+MIN_BARS_COOLDOWNS = [3, 5]
+STANDARD_GRID = list(product(ZS_THRESHOLDS, ADX_MAX_VALUES, ATRPCT_MIN_VALUES, MIN_BARS_COOLDOWNS))
+
+# Softer fallback grid for when the standard one produces no trades
+ZS_THRESHOLDS_SOFT = [1.0, 1.2, 1.5]
+ADX_MAX_VALUES_SOFT = [25, 30, 35]
+ATRPCT_MIN_VALUES_SOFT = [0.002, 0.003, 0.004]
+MIN_BARS_COOLDOWNS_SOFT = [3, 5]
+SOFT_GRID = list(
+    product(ZS_THRESHOLDS_SOFT, ADX_MAX_VALUES_SOFT, ATRPCT_MIN_VALUES_SOFT, MIN_BARS_COOLDOWNS_SOFT)
+)
+
+# The grids overlap (16 of the 54 soft combinations are also standard).
+# The soft sweep only ever runs as a fallback after the standard one
+# found zero trades, and a shared combination would return the same zero
+# again — so the fallback paths skip the overlap up front
+SOFT_GRID_UNIQUE = [p for p in SOFT_GRID if p not in frozenset(STANDARD_GRID)]
+
+
+def load_bars_once(pair: str, timeframe: str, limit: int) -> OHLCVColumns:
+    """Load the market data one time for a whole sweep.
+
+    Every grid point used to reload the same dataset; loading once and
+    splitting into shared SoA columns turns the sweep from I/O-bound into
+    CPU-bound — each backtest just reads the same immutable arrays.
+    """
+    return OHLCVColumns.from_bars(
+        load_data(source="real", pair=pair, timeframe=timeframe, limit=limit)
+    )
+
+
+# One sweep result per row: a structured array keeps the whole grid in a
+# few contiguous KB instead of one ~1KB dict per row, and the trade
+# filter / ranking work on whole columns. Parameter columns keep the
+# grid's own types (adx/cooldown are ints) so CSV and report text is
+# unchanged; error holds the exception message for failed rows
+RESULT_DTYPE = np.dtype(
+    [
+        ("zs_threshold", "f8"),
+        ("adx_max", "i4"),
+        ("atrpct_min", "f8"),
+        ("min_bars_cooldown", "i4"),
+        ("equity", "f8"),
+        ("trades", "i4"),
+        ("win_rate", "f8"),
+        ("pf", "f8"),
+        ("max_dd", "f8"),
+        ("runtime_s", "f8"),
+        ("error", "U128"),
+    ]
+)
+
+
+def _error_result(
+    zs_threshold: float,
+    adx_max: float,
+    atrpct_min: float,
+    min_bars_cooldown: int,
+    runtime_s: float,
+    error: str,
+) -> Tuple:
+    """Zeroed result row (RESULT_DTYPE field order) for a failed run."""
+    return (
+        zs_threshold,
+        adx_max,
+        atrpct_min,
+        min_bars_cooldown,
+        0.0,
+        0,
+        0.0,
+        0.0,
+        1.0,
+        runtime_s,
+        error,
+    )
+
+
+def _error_results(combos: List[Tuple[float, float, float, int]], error: str) -> np.ndarray:
+    """Result array of zeroed rows for combinations that never ran."""
+    results = np.empty(len(combos), dtype=RESULT_DTYPE)
+    for k, (zs, adx, atr, cd) in enumerate(combos):
+        results[k] = _error_result(zs, adx, atr, cd, 0.0, error)
+    return results
+
+
+# Strategy window used by every grid point; the indicator prefix depends
+# only on the bars and this window, never on the thresholds being swept
+_STRATEGY_WINDOW = 20
+
+# When set (scripts/cloud_optimize.py points it at artifacts/cache),
+# _dataset_indicators persists the prefix arrays to a content-addressed
+# .npy so concurrent shards on one machine mmap the first shard's result
+# instead of each recomputing it. None keeps the cache in-process only
+INDICATOR_CACHE_DIR: Path | None = None
+
+
+def _indicator_cache_path(bars_data: OHLCVColumns) -> Path:
+    """Content-addressed cache path for a dataset's indicator prefix."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(str(_STRATEGY_WINDOW).encode())
+    h.update(np.ascontiguousarray(bars_data.high).tobytes())
+    h.update(np.ascontiguousarray(bars_data.low).tobytes())
+    h.update(np.ascontiguousarray(bars_data.close).tobytes())
+    return INDICATOR_CACHE_DIR / f"indicators_{h.hexdigest()}.npy"
+
+
+@cache
+def _dataset_indicators(
+    bars_data: OHLCVColumns,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the z-score/ADX/ATR% indicator prefix once per dataset.
+
+    All grid points share the same bars and window, so the expensive
+    cumulative-sum indicator pass is identical across the whole sweep;
+    only the threshold comparisons differ per parameter set. With
+    INDICATOR_CACHE_DIR set, the float arrays are additionally cached on
+    disk: later shards mmap them read-only (one stat + mmap) rather than
+    recomputing. The bar-index array t is deterministic from the dataset
+    length, so only the five value rows are persisted.
+    """
+    if INDICATOR_CACHE_DIR is not None:
+        cache_path = _indicator_cache_path(bars_data)
+        if cache_path.exists():
+            stacked = np.load(cache_path, mmap_mode="r")
+            t = np.arange(max(_STRATEGY_WINDOW, 2), len(bars_data))
+            return (t, stacked[0], stacked[1], stacked[2], stacked[3], stacked[4])
+
+    t, last, mean, z, adx, atr = prefix_indicators(
+        np.ascontiguousarray(bars_data.high),
+        np.ascontiguousarray(bars_data.low),
+        np.ascontiguousarray(bars_data.close),
+        _STRATEGY_WINDOW,
+    )
+
+    if INDICATOR_CACHE_DIR is not None:
+        # Write-then-rename so a concurrent shard never mmaps a partial
+        # file (same pattern as the bars cache in scripts/backtest.py)
+        INDICATOR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".npy.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.stack((last, mean, z, adx, atr)))
+        os.replace(tmp_path, cache_path)
+
+    return (t, last, mean, z, adx, atr)
+
+
+@cache
+def _compute_metrics(
+    bars_data: OHLCVColumns,
+    zs_threshold: float,
+    adx_max: float,
+    atrpct_min: float,
+    min_bars_cooldown: int,
+) -> Tuple[float, int, float, float, float]:
+    """Run one backtest and return (equity, trades, win_rate, pf, max_dd).
+
+    Memoized on (bars identity, parameter tuple): uneven shard splits and
+    the soft-grid fallback can revisit a combination, and repeats then
+    cost a cache hit instead of a full backtest. The tuple return keeps
+    the cached value immutable; the wrapper builds the result row.
+    """
+    strategy = MeanReversionOptimized(
+        window=_STRATEGY_WINDOW,
+        threshold=0.005,
+        timeframe="15m",
+        zscore_threshold=zs_threshold,
+        adx_threshold=adx_max,
+        atr_threshold=atrpct_min,
+        min_bars_cooldown=min_bars_cooldown,
+    )
+    # Reuse the per-dataset indicator prefix; this grid point only pays
+    # for its own threshold filter and the PnL kernel
+    sigs = np.zeros(len(bars_data), dtype=np.int8)
+    if len(bars_data) > strategy.window:
+        t, last, mean, z, adx, atr = _dataset_indicators(bars_data)
+        sigs[t] = strategy.filter_signals(last, mean, z, adx, atr)
+    metrics, _ = run_backtest_onebar(bars_data, strategy, fee=0.001, signals=sigs)
+    return (
+        metrics.get("final_equity", 0.0),
+        metrics.get("trades", 0),
+        metrics.get("win_rate", 0.0),
+        metrics.get("pf", 0.0),
+        metrics.get("max_dd", 1.0),
+    )
 
 
 def run_backtest_with_params(
+    bars_data: OHLCVColumns,
     zs_threshold: float,
     adx_max: float,
     atrpct_min: float,
     min_bars_cooldown: int,
-    pair: str = "BTC/USDT",
-    timeframe: str = "15m",
-    limit: int = 3000,
     verbose: bool = False
-) -> Dict:
-    """Run backtest with specific parameters and return metrics."""
-    
-    cmd = [
-        "python3", "scripts/backtest.py",
-        "--mode", "onebar",
-        "--strategy", "optimized",
-        "--data-source", "real",
-        "--pair", pair,
-        "--timeframe", timeframe,
-        "--limit", str(limit),
-        "--zs-threshold", str(zs_threshold),
-        "--adx-max", str(adx_max),
-        "--atrpct-min", str(atrpct_min),
-        "--min-bars-cooldown", str(min_bars_cooldown),
-        "--out", f"artifacts/bench/temp_{zs_threshold}_{adx_max}_{atrpct_min}_{min_bars_cooldown}.csv"
-    ]
-    
-    if verbose:
-        cmd.append("--verbose")
-    
+) -> Tuple:
+    """Run backtest with specific parameters against pre-loaded bars.
+
+    Calls the engine in-process instead of forking scripts/backtest.py:
+    no interpreter start, no re-imports, and no regex scraping of JSON
+    out of the child's stdout. The bars come from load_bars_once so the
+    whole sweep shares one dataset, and repeated parameter tuples are
+    served from the _compute_metrics cache. Strategy construction
+    mirrors the CLI's --strategy optimized defaults (window=20,
+    threshold=0.005, fee=0.001). Returns one result row in RESULT_DTYPE
+    field order.
+    """
     start_time = time.time()
-    
+
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        equity, trades, win_rate, pf, max_dd = _compute_metrics(
+            bars_data, zs_threshold, adx_max, atrpct_min, min_bars_cooldown
+        )
         runtime_s = time.time() - start_time
-        
-        if result.returncode != 0:
-            print(f"Error running backtest: {result.stderr}")
-            return {
-                "zs_threshold": zs_threshold,
-                "adx_max": adx_max,
-                "atrpct_min": atrpct_min,
-                "min_bars_cooldown": min_bars_cooldown,
-                "equity": 0.0,
-                "trades": 0,
-                "win_rate": 0.0,
-                "pf": 0.0,
-                "max_dd": 1.0,
-                "runtime_s": runtime_s,
-                "error": result.stderr
-            }
-        
-        # Parse JSON output from stdout using regex
-        json_match = re.search(r'\{[^{}]*"final_equity"[^{}]*\}', result.stdout, re.DOTALL)
-        json_line = json_match.group(0) if json_match else None
-        
-        if not json_line:
-            print(f"No JSON output found in: {result.stdout}")
-            return {
-                "zs_threshold": zs_threshold,
-                "adx_max": adx_max,
-                "atrpct_min": atrpct_min,
-                "min_bars_cooldown": min_bars_cooldown,
-                "equity": 0.0,
-                "trades": 0,
-                "win_rate": 0.0,
-                "pf": 0.0,
-                "max_dd": 1.0,
-                "runtime_s": runtime_s,
-                "error": "No JSON output"
-            }
-        
-        try:
-            metrics = json.loads(json_line)
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            print(f"JSON line: {json_line}")
-            return {
-                "zs_threshold": zs_threshold,
-                "adx_max": adx_max,
-                "atrpct_min": atrpct_min,
-                "min_bars_cooldown": min_bars_cooldown,
-                "equity": 0.0,
-                "trades": 0,
-                "win_rate": 0.0,
-                "pf": 0.0,
-                "max_dd": 1.0,
-                "runtime_s": runtime_s,
-                "error": f"JSON decode error: {e}"
-            }
-        
-        return {
-            "zs_threshold": zs_threshold,
-            "adx_max": adx_max,
-            "atrpct_min": atrpct_min,
-            "min_bars_cooldown": min_bars_cooldown,
-            "equity": metrics.get("final_equity", 0.0),
-            "trades": metrics.get("trades", 0),
-            "win_rate": metrics.get("win_rate", 0.0),
-            "pf": metrics.get("pf", 0.0),
-            "max_dd": metrics.get("max_dd", 1.0),
-            "runtime_s": runtime_s
-        }
-        
-    except subprocess.TimeoutExpired:
-        print(f"Timeout running backtest for params: {zs_threshold}, {adx_max}, {atrpct_min}, {min_bars_cooldown}")
-        return {
-            "zs_threshold": zs_threshold,
-            "adx_max": adx_max,
-            "atrpct_min": atrpct_min,
-            "min_bars_cooldown": min_bars_cooldown,
-            "equity": 0.0,
-            "trades": 0,
-            "win_rate": 0.0,
-            "pf": 0.0,
-            "max_dd": 1.0,
-            "runtime_s": 60.0,
-            "error": "Timeout"
-        }
+
+        return (
+            zs_threshold,
+            adx_max,
+            atrpct_min,
+            min_bars_cooldown,
+            equity,
+            trades,
+            win_rate,
+            pf,
+            max_dd,
+            runtime_s,
+            "",
+        )
+
     except Exception as e:
         print(f"Exception running backtest: {e}")
-        return {
-            "zs_threshold": zs_threshold,
-            "adx_max": adx_max,
-            "atrpct_min": atrpct_min,
-            "min_bars_cooldown": min_bars_cooldown,
-            "equity": 0.0,
-            "trades": 0,
-            "win_rate": 0.0,
-            "pf": 0.0,
-            "max_dd": 1.0,
-            "runtime_s": 0.0,
-            "error": str(e)
-        }
+        return _error_result(
+            zs_threshold, adx_max, atrpct_min, min_bars_cooldown,
+            time.time() - start_time, str(e)
+        )
 
 
 def run_grid_search(
@@ -159,79 +282,168 @@ def run_grid_search(
     timeframe: str = "15m", 
     limit: int = 3000,
     soft_mode: bool = False
-) -> List[Dict]:
+) -> np.ndarray:
     """Run grid search with specified parameter ranges."""
     
     if soft_mode:
-        # Softer parameters for when no trades are found
-        zs_thresholds = [1.0, 1.2, 1.5]
-        adx_max_values = [25, 30, 35]
-        atrpct_min_values = [0.002, 0.003, 0.004]
-        min_bars_cooldowns = [3, 5]
+        combos = SOFT_GRID_UNIQUE
         print("🔄 Running SOFT grid search (no trades found in previous run)")
     else:
-        # Standard parameters
-        zs_thresholds = [1.2, 1.5, 1.8, 2.0]
-        adx_max_values = [20, 25, 30]
-        atrpct_min_values = [0.003, 0.004, 0.005]
-        min_bars_cooldowns = [3, 5]
+        combos = STANDARD_GRID
         print("🚀 Running STANDARD grid search")
     
-    results = []
-    total_combinations = len(zs_thresholds) * len(adx_max_values) * len(atrpct_min_values) * len(min_bars_cooldowns)
-    current = 0
-    
+    total_combinations = len(combos)
+
     print(f"📊 Total combinations to test: {total_combinations}")
     print(f"📈 Data source: real BTC/USDT 15m (2000 bars)")
     print()
-    
-    for zs_threshold in zs_thresholds:
-        for adx_max in adx_max_values:
-            for atrpct_min in atrpct_min_values:
-                for min_bars_cooldown in min_bars_cooldowns:
-                    current += 1
-                    print(f"[{current}/{total_combinations}] Testing: zs={zs_threshold}, adx={adx_max}, atr={atrpct_min}, cd={min_bars_cooldown}")
-                    
-                    result = run_backtest_with_params(
-                        zs_threshold, adx_max, atrpct_min, min_bars_cooldown, 
-                        pair, timeframe, limit, verbose=False
-                    )
-                    
-                    results.append(result)
-                    
-                    # Print quick result
-                    trades = result["trades"]
-                    equity = result["equity"]
-                    pf = result["pf"]
-                    max_dd = result["max_dd"]
-                    print(f"  → trades={trades}, equity={equity:.2f}, pf={pf:.3f}, dd={max_dd:.3f}")
-                    
-                    if "error" in result:
-                        print(f"  ❌ Error: {result['error']}")
-                    
-                    print()
-    
+
+    try:
+        bars_data = load_bars_once(pair, timeframe, limit)
+    except Exception as e:
+        print(f"❌ Data load failed: {e}")
+        return _error_results(combos, str(e))
+
+    return run_params_parallel(combos, bars_data)
+
+
+def run_params_parallel(
+    combos: List[Tuple[float, float, float, int]],
+    bars_data: OHLCVColumns,
+) -> np.ndarray:
+    """Run one backtest per parameter tuple across a thread pool.
+
+    The sweep is embarrassingly parallel and each point spends its time in
+    NumPy kernels, which release the GIL — so threads give ~min(jobs,
+    cores) speedup with no pickling. Rows land in the preallocated result
+    array in completion order; callers sort it anyway.
+    """
+    total = len(combos)
+    results = np.empty(total, dtype=RESULT_DTYPE)
+    current = 0
+    max_workers = min(os.cpu_count() or 1, total) if total else 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_backtest_with_params, bars_data, zs, adx, atr, cd, False
+            ): (zs, adx, atr, cd)
+            for zs, adx, atr, cd in combos
+        }
+        for future in as_completed(futures):
+            zs_threshold, adx_max, atrpct_min, min_bars_cooldown = futures[future]
+            results[current] = future.result()
+            row = results[current]
+            current += 1
+
+            # One print per combination: the progress line, quick result
+            # and separator go out as a single write instead of 3-4. When
+            # stdout is a pipe (CI log capture) the block buffer then
+            # batches many combinations per write() syscall; only the
+            # final summary prints force a flush
+            lines = (
+                f"[{current}/{total}] Tested: zs={zs_threshold}, adx={adx_max}, atr={atrpct_min}, cd={min_bars_cooldown}\n"
+                f"  → trades={row['trades']}, equity={row['equity']:.2f}, pf={row['pf']:.3f}, dd={row['max_dd']:.3f}"
+            )
+            if row["error"]:
+                lines += f"\n  ❌ Error: {row['error']}"
+            print(lines + "\n")
+
     return results
 
 
-def filter_and_sort_results(results: List[Dict]) -> List[Dict]:
-    """Filter results to keep only 3-80 trades and sort by performance."""
-    
-    # Filter: keep only results with 3-80 trades
-    filtered = [r for r in results if 3 <= r["trades"] <= 80]
-    
-    if not filtered:
+def filter_and_sort_results(results: np.ndarray, top_n: int = None) -> np.ndarray:
+    """Filter results to keep only 3-80 trades and sort by performance.
+
+    The trade filter is one boolean mask over the trades column and the
+    ranking one stable lexsort over the metric columns — no per-row key
+    tuples or dict lookups. Sort by: pf (desc), equity (desc), max_dd
+    (asc). With top_n only the leading slice of the sorted order is
+    returned; callers that persist the complete ranked result set (the
+    per-sweep and per-shard CSVs) take the whole array.
+    """
+
+    valid = results[(results["trades"] >= 3) & (results["trades"] <= 80)]
+
+    if len(valid) == 0:
         print("⚠️  No results with 3-80 trades found!")
-        return []
-    
-    # Sort by: pf (desc), equity (desc), max_dd (asc)
-    sorted_results = sorted(filtered, key=lambda x: (-x["pf"], -x["equity"], x["max_dd"]))
-    
-    return sorted_results
+        return valid
+
+    # lexsort keys run least- to most-significant; stable, like sorted()
+    order = np.lexsort((valid["max_dd"], -valid["equity"], -valid["pf"]))
+    if top_n is not None:
+        order = order[:top_n]
+    return valid[order]
+
+
+def _dumps(obj: Dict) -> str:
+    """Serialize a small dict to JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
-def save_results_csv(results: List[Dict], filename: str, top_n: int = 5, output_dir: Path = None) -> None:
-    """Save results to CSV file."""
+def _result_rows(results: np.ndarray) -> List[Tuple]:
+    """Materialize result rows as CSV tuples in _RESULT_FIELDS order.
+
+    NumPy scalars are unwrapped to Python ones so the CSV text and the
+    params_json payload stay exactly what the dict rows used to produce
+    (orjson also rejects NumPy scalars).
+    """
+    rows = []
+    for r in results:
+        zs = float(r["zs_threshold"])
+        adx = int(r["adx_max"])
+        atr = float(r["atrpct_min"])
+        cd = int(r["min_bars_cooldown"])
+        rows.append(
+            (
+                zs,
+                adx,
+                atr,
+                cd,
+                float(r["equity"]),
+                int(r["trades"]),
+                float(r["win_rate"]),
+                float(r["pf"]),
+                float(r["max_dd"]),
+                float(r["runtime_s"]),
+                _dumps({
+                    "zs_threshold": zs,
+                    "adx_max": adx,
+                    "atrpct_min": atr,
+                    "min_bars_cooldown": cd,
+                }),
+            )
+        )
+    return rows
+
+
+_RESULT_FIELDS = (
+    'zs_threshold', 'adx_max', 'atrpct_min', 'min_bars_cooldown',
+    'equity', 'trades', 'win_rate', 'pf', 'max_dd', 'runtime_s', 'params_json'
+)
+
+
+def write_results_csv(csvfile, rows: List[Tuple]) -> None:
+    """Write the header and pre-built tuple rows to an open file handle.
+
+    Callers that emit several related files (e.g. per-shard full + top-N)
+    open them once and reuse the same formatted rows, instead of paying
+    an open/format/header cycle per file.
+    """
+    writer = csv.writer(csvfile)
+    writer.writerow(_RESULT_FIELDS)
+    writer.writerows(rows)
+
+
+def save_results_csv(results: np.ndarray, filename: str, top_n: int = 5, output_dir: Path = None) -> None:
+    """Save results to CSV file.
+
+    csv.writer over pre-built tuples instead of DictWriter: no per-row
+    field mapping, and the error field is dropped by construction rather
+    than filtered per row (DictWriter raised on the extra params_json
+    key, so the old path crashed on any non-empty results).
+    """
     
     if output_dir is None:
         output_dir = Path("artifacts/bench")
@@ -242,60 +454,28 @@ def save_results_csv(results: List[Dict], filename: str, top_n: int = 5, output_
     
     output_path = output_dir / filename
     
+    rows = _result_rows(results)
+    
     with open(output_path, 'w', newline='') as csvfile:
-        fieldnames = [
-            'zs_threshold', 'adx_max', 'atrpct_min', 'min_bars_cooldown',
-            'equity', 'trades', 'win_rate', 'pf', 'max_dd', 'runtime_s'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for result in results:
-            # Create params_json field
-            params_json = json.dumps({
-                "zs_threshold": result["zs_threshold"],
-                "adx_max": result["adx_max"],
-                "atrpct_min": result["atrpct_min"],
-                "min_bars_cooldown": result["min_bars_cooldown"]
-            })
-            result["params_json"] = params_json
-            
-            # Write row (excluding error field if present)
-            row = {k: v for k, v in result.items() if k != "error"}
-            writer.writerow(row)
+        write_results_csv(csvfile, rows)
     
     print(f"💾 Results saved to: {output_path}", flush=True)
     
-    # Save Top-N results separately
-    if results:
-        top_n_results = results[:top_n]
+    # Save Top-N results separately (rows are already formatted)
+    if len(results):
         top_filename = filename.replace('.csv', f'_top{top_n}.csv')
         top_path = output_dir / top_filename
         
         with open(top_path, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for result in top_n_results:
-                params_json = json.dumps({
-                    "zs_threshold": result["zs_threshold"],
-                    "adx_max": result["adx_max"],
-                    "atrpct_min": result["atrpct_min"],
-                    "min_bars_cooldown": result["min_bars_cooldown"]
-                })
-                result["params_json"] = params_json
-                
-                row = {k: v for k, v in result.items() if k != "error"}
-                writer.writerow(row)
+            write_results_csv(csvfile, rows[:top_n])
         
         print(f"💾 Top-{top_n} results saved to: {top_path}", flush=True)
 
 
-def print_top_results(results: List[Dict], top_n: int = 5) -> None:
+def print_top_results(results: np.ndarray, top_n: int = 5) -> None:
     """Print top N results in a formatted table."""
     
-    if not results:
+    if not len(results):
         print("❌ No results to display")
         return
     
@@ -320,10 +500,10 @@ def print_top_results(results: List[Dict], top_n: int = 5) -> None:
     print()
 
 
-def generate_markdown_table(results: List[Dict], top_n: int = 5) -> str:
+def generate_markdown_table(results: np.ndarray, top_n: int = 5) -> str:
     """Generate markdown table for top results."""
     
-    if not results:
+    if not len(results):
         return "No results available."
     
     md_lines = [
@@ -377,7 +557,7 @@ def main() -> int:
     results = run_grid_search(args.pair, args.timeframe, args.limit, soft_mode=False)
     
     # Check if we got any trades
-    total_trades = sum(r["trades"] for r in results)
+    total_trades = int(results["trades"].sum())
     if total_trades == 0:
         print("⚠️  No trades found in standard grid search. Running soft mode...", flush=True)
         results = run_grid_search(args.pair, args.timeframe, args.limit, soft_mode=True)
@@ -399,7 +579,7 @@ def main() -> int:
     print()
     
     # Print recommended config
-    if filtered_results:
+    if len(filtered_results):
         best = filtered_results[0]
         recommended_args = f"--zs-threshold {best['zs_threshold']} --adx-max {best['adx_max']} --atrpct-min {best['atrpct_min']} --min-bars-cooldown {best['min_bars_cooldown']}"
         print("🎯 RECOMMENDED CONFIG:", flush=True)
@@ -4,47 +4,38 @@
 import argparse
 import sys
 import time
+from contextlib import ExitStack
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import List, Tuple
+
+import numpy as np
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.bench_small import run_grid_search, filter_and_sort_results, save_results_csv  # noqa: E402
+from scripts import bench_small  # noqa: E402
+from scripts.bench_small import (  # noqa: E402
+    SOFT_GRID,
+    SOFT_GRID_UNIQUE,
+    STANDARD_GRID,
+    _error_results,
+    _result_rows,
+    filter_and_sort_results,
+    load_bars_once,
+    run_params_parallel,
+    write_results_csv,
+)
+
 
+def get_parameter_grid() -> Tuple[List[Tuple[float, float, float, int]], List[Tuple[float, float, float, int]]]:
+    """Get the standard and soft parameter grids as lists of tuples.
 
-def get_parameter_grid() -> List[Tuple[float, float, float, int]]:
-    """Get the full parameter grid as a list of tuples."""
-    # Standard parameters
-    zs_thresholds = [1.2, 1.5, 1.8, 2.0]
-    adx_max_values = [20, 25, 30]
-    atrpct_min_values = [0.003, 0.004, 0.005]
-    min_bars_cooldowns = [3, 5]
-    
-    # Soft parameters (for fallback)
-    zs_thresholds_soft = [1.0, 1.2, 1.5]
-    adx_max_values_soft = [25, 30, 35]
-    atrpct_min_values_soft = [0.002, 0.003, 0.004]
-    min_bars_cooldowns_soft = [3, 5]
-    
-    # Generate all combinations
-    standard_grid = []
-    for zs in zs_thresholds:
-        for adx in adx_max_values:
-            for atr in atrpct_min_values:
-                for cd in min_bars_cooldowns:
-                    standard_grid.append((zs, adx, atr, cd))
-    
-    soft_grid = []
-    for zs in zs_thresholds_soft:
-        for adx in adx_max_values_soft:
-            for atr in atrpct_min_values_soft:
-                for cd in min_bars_cooldowns_soft:
-                    soft_grid.append((zs, adx, atr, cd))
-    
-    return standard_grid, soft_grid
+    The grids live in scripts/bench_small.py (materialized once at
+    import); this wrapper stays for callers of the sharding entrypoint.
+    """
+    return STANDARD_GRID, SOFT_GRID
 
 
 def run_shard_grid_search(
@@ -55,11 +46,15 @@ def run_shard_grid_search(
     limit: int,
     top_n: int,
     seed: int
-) -> List[Dict]:
+) -> np.ndarray:
     """Run grid search for a specific shard."""
     
     standard_grid, soft_grid = get_parameter_grid()
-    
+
+    # Shards share one machine in CI: persist the per-dataset indicator
+    # prefix so only the first shard computes it and the rest mmap it
+    bench_small.INDICATOR_CACHE_DIR = Path("artifacts/cache")
+
     # Determine which grid to use for this shard
     # Try standard grid first
     shard_params = []
@@ -69,66 +64,32 @@ def run_shard_grid_search(
     
     print(f"🔍 Shard {shard_index}/{shard_count}: Testing {len(shard_params)} standard combinations", flush=True)
     
-    # Run tests for this shard
-    results = []
-    for i, (zs_threshold, adx_max, atrpct_min, min_bars_cooldown) in enumerate(shard_params):
-        print(f"[{i+1}/{len(shard_params)}] Testing: zs={zs_threshold}, adx={adx_max}, atr={atrpct_min}, cd={min_bars_cooldown}", flush=True)
-        
-        # Import here to avoid circular imports
-        from scripts.bench_small import run_backtest_with_params
-        
-        result = run_backtest_with_params(
-            zs_threshold, adx_max, atrpct_min, min_bars_cooldown,
-            pair, timeframe, limit, verbose=False
-        )
-        
-        results.append(result)
-        
-        # Print quick result
-        trades = result["trades"]
-        equity = result["equity"]
-        pf = result["pf"]
-        max_dd = result["max_dd"]
-        print(f"  → trades={trades}, equity={equity:.2f}, pf={pf:.3f}, dd={max_dd:.3f}", flush=True)
-        
-        if "error" in result:
-            print(f"  ❌ Error: {result['error']}", flush=True)
+    # Load the data once per shard; every combination shares the columns
+    try:
+        bars_data = load_bars_once(pair, timeframe, limit)
+    except Exception as e:
+        print(f"❌ Data load failed: {e}", flush=True)
+        return _error_results(shard_params, str(e))
+    
+    # Run tests for this shard: shard selection stays i % shard_count,
+    # parallelism is across the combinations within the shard
+    results = run_params_parallel(shard_params, bars_data)
     
     # Check if we got any trades
-    total_trades = sum(r["trades"] for r in results)
+    total_trades = int(results["trades"].sum())
     if total_trades == 0:
         print("⚠️  No trades found in standard grid. Trying soft parameters...", flush=True)
         
-        # Try soft grid for this shard
+        # Try soft grid for this shard; combinations the standard grid
+        # already tested (and found tradeless) are skipped
         soft_shard_params = []
-        for i, params in enumerate(soft_grid):
+        for i, params in enumerate(SOFT_GRID_UNIQUE):
             if i % shard_count == shard_index:
                 soft_shard_params.append(params)
         
         print(f"🔍 Shard {shard_index}/{shard_count}: Testing {len(soft_shard_params)} soft combinations", flush=True)
         
-        soft_results = []
-        for i, (zs_threshold, adx_max, atrpct_min, min_bars_cooldown) in enumerate(soft_shard_params):
-            print(f"[{i+1}/{len(soft_shard_params)}] Testing: zs={zs_threshold}, adx={adx_max}, atr={atrpct_min}, cd={min_bars_cooldown}", flush=True)
-            
-            result = run_backtest_with_params(
-                zs_threshold, adx_max, atrpct_min, min_bars_cooldown,
-                pair, timeframe, limit, verbose=False
-            )
-            
-            soft_results.append(result)
-            
-            # Print quick result
-            trades = result["trades"]
-            equity = result["equity"]
-            pf = result["pf"]
-            max_dd = result["max_dd"]
-            print(f"  → trades={trades}, equity={equity:.2f}, pf={pf:.3f}, dd={max_dd:.3f}", flush=True)
-            
-            if "error" in result:
-                print(f"  ❌ Error: {result['error']}", flush=True)
-        
-        results.extend(soft_results)
+        results = np.concatenate((results, run_params_parallel(soft_shard_params, bars_data)))
     
     return results
 
@@ -181,22 +142,29 @@ def main() -> int:
     # Filter and sort results
     filtered_results = filter_and_sort_results(results)
     
-    # Save shard results
+    # Save shard results and top-N in one pass: rows are formatted once
+    # and each file is opened exactly once
     shard_results_file = run_dir / f"shard_{args.shard_index}_results.csv"
-    save_results_csv(filtered_results, f"shard_{args.shard_index}_results.csv", args.top, run_dir)
-    
-    # Save shard top-N results
     shard_top_file = run_dir / f"shard_{args.shard_index}_top{args.top}.csv"
-    if filtered_results:
-        top_n_results = filtered_results[:args.top]
-        save_results_csv(top_n_results, f"shard_{args.shard_index}_top{args.top}.csv", args.top, run_dir)
+    rows = _result_rows(filtered_results)
+    with ExitStack() as stack:
+        targets = [(stack.enter_context(open(shard_results_file, "w", newline="")), rows)]
+        if len(filtered_results):
+            targets.append(
+                (stack.enter_context(open(shard_top_file, "w", newline="")), rows[: args.top])
+            )
+        for csvfile, file_rows in targets:
+            write_results_csv(csvfile, file_rows)
+    print(f"💾 Results saved to: {shard_results_file}", flush=True)
+    if len(filtered_results):
+        print(f"💾 Top-{args.top} results saved to: {shard_top_file}", flush=True)
     
     # Print summary
     print(f"📊 Shard {args.shard_index} Summary:", flush=True)
     print(f"  Total combinations tested: {len(results)}", flush=True)
     print(f"  Valid configurations: {len(filtered_results)}", flush=True)
     print(f"  Results saved to: {shard_results_file}", flush=True)
-    if filtered_results:
+    if len(filtered_results):
         print(f"  Top-{args.top} saved to: {shard_top_file}", flush=True)
         best = filtered_results[0]
         print(f"  Best config: zs={best['zs_threshold']}, adx={best['adx_max']}, atr={best['atrpct_min']}, cd={best['min_bars_cooldown']}", flush=True)
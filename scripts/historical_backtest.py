@@ -9,9 +9,12 @@ based on actual market patterns over the last 2 years.
 import argparse
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -19,38 +22,64 @@ sys.path.insert(0, str(project_root))
 # Import after path modification
 from bot.backtest.engine import run_backtest, run_backtest_onebar  # noqa: E402
 from bot.data.historical_source import HistoricalOHLCV  # noqa: E402
+from bot.data.ohlcv_source import OHLCVColumns  # noqa: E402
 from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
 
 
-def format_metrics_table(metrics: dict, mode: str) -> str:
-    """Format metrics as a human-readable table."""
-    lines = [f"=== Historical Backtest Results (mode={mode}) ==="]
+def _format_both(metrics: dict, mode: str) -> tuple[str, str]:
+    """Render the JSON dump and the human-readable table in one pass.
 
+    A single walk over metrics serializes each scalar once for the JSON
+    body and formats it once for the table, instead of json.dumps
+    traversing the same dict a second time.
+    """
     # Define key metrics for each mode
     if mode == "close":
         key_metrics = ["trades", "final_equity", "win_rate", "max_dd", "return_pct", "total_fees"]
     else:  # onebar
         key_metrics = ["trades", "final_equity", "pf", "max_dd"]
 
-    # Calculate column widths
+    wanted = set(key_metrics)
     max_key_width = max(len(key) for key in key_metrics)
 
-    for key in key_metrics:
-        if key in metrics:
-            value = metrics[key]
+    json_parts = []
+    cells = {}
+    for key, value in metrics.items():
+        json_parts.append(f'  "{key}": {json.dumps(value)}')
+        if key in wanted:
             if isinstance(value, float):
-                if key in ["win_rate", "return_pct", "max_dd"]:
+                if key in ("win_rate", "return_pct", "max_dd"):
                     formatted_value = f"{value:.1%}"
-                elif key in ["final_equity", "total_fees"]:
+                elif key in ("final_equity", "total_fees"):
                     formatted_value = f"{value:.2f}"
                 else:
                     formatted_value = f"{value:.3f}"
             else:
                 formatted_value = str(value)
+            cells[key] = formatted_value
+
+    # Table rows keep the key_metrics order; values were formatted above
+    table_lines = [f"=== Historical Backtest Results (mode={mode}) ==="]
+    table_lines.extend(
+        f"{key.replace('_', ' ').title():<{max_key_width}}: {cells[key]}"
+        for key in key_metrics
+        if key in cells
+    )
+
+    json_text = "{\n" + ",\n".join(json_parts) + "\n}" if json_parts else "{}"
+    return json_text, "\n".join(table_lines)
 
-            lines.append(f"{key.replace('_', ' ').title():<{max_key_width}}: {formatted_value}")
 
-    return "\n".join(lines)
+@lru_cache(maxsize=8)
+def _load_bars(symbol: str, timeframe: str) -> OHLCVColumns:
+    """Load the 2-year series once per (symbol, timeframe) per process.
+
+    Grid sweeps that call run_historical_backtest repeatedly with only
+    fee/threshold/mode varying share the same OHLCVColumns object
+    instead of re-opening the cache for every grid point.
+    """
+    source = HistoricalOHLCV(symbol=symbol, timeframe=timeframe)
+    return source.load_arrays(timeframe, bars=0)  # bars=0 means load all available (2 years)
 
 
 def run_historical_backtest(
@@ -59,23 +88,26 @@ def run_historical_backtest(
     fee: float = 0.001,
     threshold: float = 0.005,
     symbol: str = "BTCUSDT",
-) -> tuple[dict[str, Any], list[float], list[tuple[int, float, float, float, float, int]]]:
+) -> tuple[dict[str, Any], list[float], OHLCVColumns]:
     """Run historical backtest for last 2 years."""
 
     print(f"Loading historical data for {symbol} ({timeframe})...")
 
-    # Load historical data
-    data_source = HistoricalOHLCV(symbol=symbol, timeframe=timeframe)
-    bars = data_source.load(timeframe, bars=0)  # bars=0 means load all available (2 years)
+    # Load historical data as SoA columns: the engine reads the price
+    # columns directly, no per-bar tuple materialization
+    bars = _load_bars(symbol, timeframe)
 
+    first_ts, last_ts = int(bars.ts[0]), int(bars.ts[-1])
     print(f"Loaded {len(bars)} bars of historical data")
-    print(f"Date range: {bars[0][0]} to {bars[-1][0]}")
-
-    # Convert timestamps to readable dates
-    from datetime import datetime
-
-    start_date = datetime.fromtimestamp(bars[0][0]).strftime("%Y-%m-%d %H:%M")
-    end_date = datetime.fromtimestamp(bars[-1][0]).strftime("%Y-%m-%d %H:%M")
+    print(f"Date range: {first_ts} to {last_ts}")
+
+    # Convert timestamps to readable dates: reinterpret the int64 ts
+    # column as datetime64 (zero-copy view) and let NumPy format the
+    # endpoints — no per-value datetime object construction
+    dates = bars.ts.view("datetime64[s]")
+    start_date, end_date = (
+        s.replace("T", " ") for s in np.datetime_as_string(dates[[0, -1]], unit="m")
+    )
     print(f"Period: {start_date} to {end_date}")
 
     # Initialize strategy
@@ -123,19 +155,18 @@ def main():
             symbol=args.symbol,
         )
 
-        # Print JSON results
+        # Print JSON results and human-readable table (built together)
+        json_text, table_text = _format_both(metrics, args.mode)
         print("\n" + "=" * 50)
         print("JSON Results:")
-        print(json.dumps(metrics, indent=2))
+        print(json_text)
+        print("\n" + table_text)
 
-        # Print human-readable table
-        print("\n" + format_metrics_table(metrics, args.mode))
-
-        # Save data if requested
+        # Save data if requested; save_to_csv needs no source state, so
+        # no second HistoricalOHLCV construction here
         if args.save_data:
-            data_source = HistoricalOHLCV(symbol=args.symbol, timeframe=args.timeframe)
-            csv_path = data_source.save_to_csv(
-                bars, f"historical_{args.symbol}_{args.timeframe}.csv"
+            csv_path = HistoricalOHLCV.save_to_csv(
+                bars.to_bars(), f"historical_{args.symbol}_{args.timeframe}.csv"
             )
             print(f"\nHistorical data saved to: {csv_path}")
 
@@ -144,13 +175,11 @@ def main():
             output_path = Path(args.out)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            import csv
-
-            with open(output_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["metric", "value"])
-                for key, value in metrics.items():
-                    writer.writerow([key, value])
+            # Two-column metric/value rows need no CSV quoting; build the
+            # whole file in memory and write it with one syscall
+            lines = ["metric,value"]
+            lines.extend(f"{key},{value}" for key, value in metrics.items())
+            output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
             print(f"\nResults saved to: {output_path}")
 
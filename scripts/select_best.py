@@ -1,58 +1,73 @@
 #!/usr/bin/env python3
-import csv
 import json
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 IN = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("artifacts/backtests/batch_2y.csv")
 OUT = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("artifacts/reports/best_params.json")
 OUT.parent.mkdir(parents=True, exist_ok=True)
 
+# альтернативные имена колонок из разных версий bench
+ALIASES = {
+    "Mode": "mode",
+    "Fee": "fee",
+    "Threshold": "threshold",
+    "equity": "final_equity",
+    "winrate": "win_rate",
+    "dd": "max_dd",
+    "return%": "return_pct",
+}
+
+NUMERIC = ["fee", "threshold", "win_rate", "pf", "max_dd", "return_pct"]
+
+
+def f2(col):
+    v = pd.to_numeric(col, errors="coerce")
+    return v.where(v <= 2.0, v / 100.0)  # если проценты в 0-100, приводим к 0-1
+
+
+# Один C-парс всего файла вместо построчного DictReader + try/except на ячейку
+df = pd.read_csv(IN).rename(columns=ALIASES)
+for c in ["mode", "trades", "final_equity", "timeframe", *NUMERIC]:
+    if c not in df.columns:
+        df[c] = np.nan
+df["trades"] = pd.to_numeric(df["trades"], errors="coerce").fillna(0).astype(int)
+df["final_equity"] = pd.to_numeric(df["final_equity"], errors="coerce").fillna(0.0)
+for c in NUMERIC:
+    df[c] = f2(df[c])
+
+# здравые фильтры — одна векторная маска вместо предиката на строку
+mask = (df["trades"] >= 50) & (df["pf"].fillna(0) >= 1.3) & (df["max_dd"].fillna(1) <= 0.25)
+if mask.any():
+    cands = df[mask]
+else:  # fallback — топ-5 по pf
+    cands = df.loc[df["pf"].fillna(0).nlargest(5).index]
+
+# скоринг: pf*(1-max_dd), затем return_pct — argmax по векторам
+score = (cands["pf"].fillna(0) * (1 - cands["max_dd"].fillna(0))).to_numpy()
+ret = cands["return_pct"].fillna(0).to_numpy()
+row = cands.iloc[np.lexsort((ret, score))[-1]]
+
+
+def opt(v):
+    return None if pd.isna(v) else float(v)
+
 
-def f2(x):
-    if x is None or x == "":
-        return None
-    try:
-        v = float(x)
-        return v / 100.0 if v > 2.0 else v  # если проценты в 0-100, приводим к 0-1
-    except Exception:
-        return None
-
-
-def norm_row(r):
-    return {
-        "mode": r.get("mode") or r.get("Mode"),
-        "fee": f2(r.get("fee") or r.get("Fee")),
-        "threshold": f2(r.get("threshold") or r.get("Threshold")),
-        "trades": int(float(r.get("trades") or 0)),
-        "final_equity": float(r.get("equity") or r.get("final_equity") or 0.0),
-        "win_rate": f2(r.get("winrate") or r.get("win_rate")),
-        "pf": f2(r.get("pf")),
-        "max_dd": f2(r.get("dd") or r.get("max_dd")),
-        "return_pct": f2(r.get("return%") or r.get("return_pct")),
-        "timeframe": r.get("timeframe") or "1h",
-    }
-
-
-rows = []
-with open(IN, encoding="utf-8") as f:
-    for raw in csv.DictReader(f):
-        rows.append(norm_row(raw))
-
-# здравые фильтры
-cands = [
-    r for r in rows if r["trades"] >= 50 and (r["pf"] or 0) >= 1.3 and (r["max_dd"] or 1) <= 0.25
-]
-
-if not cands:  # fallback — топ по pf
-    cands = sorted(rows, key=lambda x: (x["pf"] or 0), reverse=True)[:5]
-
-# скоринг: pf*(1-max_dd), затем return_pct
-best = sorted(
-    cands,
-    key=lambda x: ((x["pf"] or 0) * (1 - (x["max_dd"] or 0)), (x["return_pct"] or 0)),
-    reverse=True,
-)[0]
+best = {
+    "mode": None if pd.isna(row["mode"]) else row["mode"],
+    "fee": opt(row["fee"]),
+    "threshold": opt(row["threshold"]),
+    "trades": int(row["trades"]),
+    "final_equity": float(row["final_equity"]),
+    "win_rate": opt(row["win_rate"]),
+    "pf": opt(row["pf"]),
+    "max_dd": opt(row["max_dd"]),
+    "return_pct": opt(row["return_pct"]),
+    "timeframe": row["timeframe"] if not pd.isna(row["timeframe"]) else "1h",
+}
 
 OUT.write_text(json.dumps(best, indent=2, ensure_ascii=False), encoding="utf-8")
 print(f"Best params → {OUT}")
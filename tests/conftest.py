@@ -0,0 +1,22 @@
+"""Shared test setup: make the project root importable once per session."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from bot.data.ohlcv_source import SyntheticOHLCV  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def synth_bars_300():
+    """300 bars of seed-42 synthetic 15m data, generated once per session.
+
+    Tests that only need a deterministic price series share this list
+    (or a slice of it) instead of re-running the generator.
+    """
+    return SyntheticOHLCV(seed=42).load(tf="15m", bars=300)
@@ -5,9 +5,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-# Add project root to Python path
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 
 def test_bench_batch_run():
@@ -72,39 +70,19 @@ def test_bench_batch_run():
     assert "0.01" in data_row, "Missing threshold in data row"
 
 
-def test_backtest_single_csv():
-    """Test single backtest with CSV output."""
-    script_path = project_root / "scripts" / "backtest.py"
-    output_path = project_root / "user_data" / "single.csv"
+def test_backtest_single_csv(tmp_path, monkeypatch):
+    """Test single backtest with CSV output (in-process, no interpreter spawn)."""
+    from scripts.backtest import main as backtest_main
 
-    # Clean up any existing test file
-    if output_path.exists():
-        output_path.unlink()
+    output_path = tmp_path / "single.csv"
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
 
-    # Run single backtest with CSV output
-    env = os.environ.copy()
-    env["DATA_SOURCE"] = "synthetic"
-    result = subprocess.run(
-        [
-            sys.executable,
-            str(script_path),
-            "--mode",
-            "close",
-            "--timeframe",
-            "15m",
-            "--bars",
-            "50",
-            "--out",
-            str(output_path),
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
+    rc = backtest_main(
+        ["--mode", "close", "--timeframe", "15m", "--bars", "50", "--out", str(output_path)]
     )
 
     # Check return code
-    assert result.returncode == 0, f"Single backtest script failed: {result.stderr}"
+    assert rc == 0, "Single backtest run failed"
 
     # Check CSV file exists
     assert output_path.exists(), "CSV file was not created"
@@ -128,44 +106,22 @@ def test_backtest_single_csv():
     assert "50" in data_row, "Missing bars count in data row"
 
 
-def test_backtest_append_csv():
-    """Test single backtest with append mode."""
-    script_path = project_root / "scripts" / "backtest.py"
-    output_path = project_root / "user_data" / "append_test.csv"
+def test_backtest_append_csv(tmp_path, monkeypatch):
+    """Test single backtest with append mode (in-process)."""
+    from scripts.backtest import main as backtest_main
 
-    # Clean up any existing test file
-    if output_path.exists():
-        output_path.unlink()
+    output_path = tmp_path / "append_test.csv"
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
 
     # First run - create file
-    env = os.environ.copy()
-    env["DATA_SOURCE"] = "synthetic"
-    result1 = subprocess.run(
-        [
-            sys.executable,
-            str(script_path),
-            "--mode",
-            "close",
-            "--timeframe",
-            "15m",
-            "--bars",
-            "30",
-            "--out",
-            str(output_path),
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
+    rc1 = backtest_main(
+        ["--mode", "close", "--timeframe", "15m", "--bars", "30", "--out", str(output_path)]
     )
-
-    assert result1.returncode == 0, f"First run failed: {result1.stderr}"
+    assert rc1 == 0, "First run failed"
 
     # Second run - append
-    result2 = subprocess.run(
+    rc2 = backtest_main(
         [
-            sys.executable,
-            str(script_path),
             "--mode",
             "onebar",
             "--timeframe",
@@ -175,14 +131,9 @@ def test_backtest_append_csv():
             "--out",
             str(output_path),
             "--append",
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
+        ]
     )
-
-    assert result2.returncode == 0, f"Second run failed: {result2.stderr}"
+    assert rc2 == 0, "Second run failed"
 
     # Check CSV content
     csv_content = output_path.read_text(encoding="utf-8")
@@ -201,22 +152,16 @@ def test_backtest_append_csv():
     assert "40" in data_row2, "Missing bars count in second data row"
 
 
-def test_csv_header_on_append_to_new_file():
+def test_csv_header_on_append_to_new_file(tmp_path, monkeypatch):
     """Test that CSV header is written when appending to non-existent file."""
-    script_path = project_root / "scripts" / "bench.py"
-    output_path = project_root / "user_data" / "header_test.csv"
+    from scripts.bench import main as bench_main
 
-    # Clean up any existing test file
-    if output_path.exists():
-        output_path.unlink()
+    output_path = tmp_path / "header_test.csv"
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
 
     # Run batch backtest with append to non-existent file
-    env = os.environ.copy()
-    env["DATA_SOURCE"] = "synthetic"
-    result = subprocess.run(
+    rc = bench_main(
         [
-            sys.executable,
-            str(script_path),
             "--modes",
             "onebar",
             "--bars",
@@ -230,15 +175,11 @@ def test_csv_header_on_append_to_new_file():
             "--out",
             str(output_path),
             "--append",
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
+        ]
     )
 
     # Check return code
-    assert result.returncode == 0, f"Batch script failed: {result.stderr}"
+    assert rc == 0, "Batch run failed"
 
     # Check CSV file exists
     assert output_path.exists(), "CSV file was not created"
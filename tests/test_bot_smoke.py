@@ -1,19 +1,15 @@
 """Smoke tests for bot module."""
 
 import math
-import sys
-from pathlib import Path
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
-# Import bot modules after path setup
-from bot.backtest.engine import run_backtest  # noqa: E402
-from bot.core.exchange import PaperExchange  # noqa: E402
-from bot.data.ohlcv_source import SyntheticOHLCV  # noqa: E402
-from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
-from bot.utils.timeframes import tf_to_seconds  # noqa: E402
+from bot.backtest.engine import run_backtest
+from bot.core.exchange import PaperExchange
+from bot.data.ohlcv_source import SyntheticOHLCV
+from bot.strategy.mean_reversion import MeanReversion
+from bot.strategy.mean_reversion_optimized import MeanReversionOptimized
+from bot.utils.timeframes import tf_to_seconds
 
 
 def test_import_all_modules():
@@ -66,6 +62,25 @@ def test_synthetic_data():
         assert low <= min(o, c)
 
 
+def test_synthetic_data_arrays():
+    """Test that the SoA path matches the tuple path."""
+    source = SyntheticOHLCV(seed=42)
+    cols = source.load_arrays(tf="15m", bars=300)
+
+    assert len(cols.close) == 300
+    assert cols.to_bars() == source.load(tf="15m", bars=300)
+
+
+def test_synthetic_data_deterministic():
+    """Same seed reproduces the same bars; different seeds diverge."""
+    assert SyntheticOHLCV(seed=42).load(tf="15m", bars=100) == SyntheticOHLCV(seed=42).load(
+        tf="15m", bars=100
+    )
+    assert SyntheticOHLCV(seed=42).load(tf="15m", bars=100) != SyntheticOHLCV(seed=43).load(
+        tf="15m", bars=100
+    )
+
+
 def test_mean_reversion_strategy():
     """Test mean reversion strategy."""
     strategy = MeanReversion(window=20, threshold=0.005)
@@ -101,15 +116,24 @@ def test_paper_exchange():
     assert exchange.get_total_fees() > 0
 
 
-def test_backtest_engine():
-    """Test backtest engine."""
-    # Generate data
-    source = SyntheticOHLCV(seed=42)
-    bars = source.load(tf="15m", bars=300)
+@pytest.fixture(scope="session")
+def smoke_backtest(synth_bars_300):
+    """Run the shared 300-bar backtest once per session.
+
+    test_backtest_engine and test_backtest_integration assert against
+    identical inputs, so they consume one memoized run instead of
+    executing the engine twice.
+    """
+    bars = synth_bars_300
 
-    # Run backtest
     strategy = MeanReversion(window=20, threshold=0.005)
     metrics, equity_curve = run_backtest(bars, strategy, fee=0.001)
+    return metrics, equity_curve, bars
+
+
+def test_backtest_engine(smoke_backtest):
+    """Test backtest engine."""
+    metrics, equity_curve, bars = smoke_backtest
 
     # Check metrics structure
     required_keys = ["trades", "net_pnl", "win_rate", "max_dd"]
@@ -131,14 +155,113 @@ def test_backtest_engine():
         assert equity > 0
 
 
-def test_backtest_integration():
-    """Test full backtest integration."""
-    # This is the main integration test
+def test_backtest_vectorized_matches_scalar():
+    """Vectorized MeanReversion path must match the per-bar scalar path."""
     source = SyntheticOHLCV(seed=42)
-    bars = source.load(tf="15m", bars=300)
+    bars = source.load(tf="15m", bars=500)
 
-    strategy = MeanReversion(window=20, threshold=0.005)
-    metrics, equity_curve = run_backtest(bars, strategy, fee=0.001)
+    class _ScalarOnly:
+        """Wrapper hiding signals_vec so run_backtest takes the scalar path."""
+
+        def __init__(self, inner):
+            self._inner = inner
+
+        def on_bar(self, ts, o, h, low, c, v):
+            return self._inner.on_bar(ts, o, h, low, c, v)
+
+        def name(self):
+            return self._inner.name()
+
+    fast_metrics, fast_curve = run_backtest(bars, MeanReversion(window=20, threshold=0.005))
+    slow_metrics, slow_curve = run_backtest(
+        bars, _ScalarOnly(MeanReversion(window=20, threshold=0.005))
+    )
+
+    assert fast_metrics["trades"] == slow_metrics["trades"]
+    assert fast_metrics["win_rate"] == slow_metrics["win_rate"]
+    assert fast_metrics["final_equity"] == pytest.approx(slow_metrics["final_equity"])
+    assert fast_metrics["max_dd"] == pytest.approx(slow_metrics["max_dd"])
+    assert fast_curve == pytest.approx(slow_curve)
+
+
+def test_backtest_vectorized_rejected_orders_match_scalar():
+    """Fast path must fall back to the scalar loop when orders get rejected."""
+    source = SyntheticOHLCV(seed=42)
+    bars = source.load(tf="15m", bars=500)
+
+    class _ScalarOnly:
+        """Wrapper hiding signals_vec so run_backtest takes the scalar path."""
+
+        def __init__(self, inner):
+            self._inner = inner
+
+        def on_bar(self, ts, o, h, low, c, v):
+            return self._inner.on_bar(ts, o, h, low, c, v)
+
+        def name(self):
+            return self._inner.name()
+
+    # Price scales where PaperExchange rejects orders: closes far above the
+    # starting balance (insufficient funds) and below min_notional
+    for factor in (500.0, 0.05):
+        scaled = [
+            (ts, o * factor, h * factor, low * factor, c * factor, v)
+            for ts, o, h, low, c, v in bars
+        ]
+        fast_metrics, fast_curve = run_backtest(scaled, MeanReversion(window=20, threshold=0.005))
+        slow_metrics, slow_curve = run_backtest(
+            scaled, _ScalarOnly(MeanReversion(window=20, threshold=0.005))
+        )
+
+        assert fast_metrics["trades"] == slow_metrics["trades"]
+        assert fast_metrics["final_equity"] == pytest.approx(slow_metrics["final_equity"])
+        assert fast_metrics["max_dd"] == pytest.approx(slow_metrics["max_dd"])
+        assert fast_curve == pytest.approx(slow_curve)
+
+
+def test_backtest_optimized_vectorized_matches_scalar():
+    """Vectorized MeanReversionOptimized path must match the scalar path."""
+    source = SyntheticOHLCV(seed=42)
+    bars = source.load(tf="15m", bars=500)
+
+    class _ScalarOnly:
+        """Wrapper hiding signals_vec so run_backtest takes the scalar path."""
+
+        def __init__(self, inner):
+            self._inner = inner
+
+        def on_bar(self, ts, o, h, low, c, v):
+            return self._inner.on_bar(ts, o, h, low, c, v)
+
+        def name(self):
+            return self._inner.name()
+
+    def make_strategy():
+        # Loose filters so signals actually fire on synthetic data
+        return MeanReversionOptimized(
+            window=20,
+            threshold=0.005,
+            zscore_threshold=0.5,
+            adx_threshold=60.0,
+            atr_threshold=0.001,
+            min_bars_cooldown=0,
+        )
+
+    fast_metrics, fast_curve = run_backtest(bars, make_strategy())
+    slow_metrics, slow_curve = run_backtest(bars, _ScalarOnly(make_strategy()))
+
+    assert fast_metrics["trades"] == slow_metrics["trades"]
+    assert fast_metrics["trades"] > 0
+    assert fast_metrics["win_rate"] == slow_metrics["win_rate"]
+    assert fast_metrics["final_equity"] == pytest.approx(slow_metrics["final_equity"])
+    assert fast_metrics["max_dd"] == pytest.approx(slow_metrics["max_dd"])
+    assert fast_curve == pytest.approx(slow_curve)
+
+
+def test_backtest_integration(smoke_backtest):
+    """Test full backtest integration."""
+    # This is the main integration test
+    metrics, equity_curve, _ = smoke_backtest
 
     # Verify we have reasonable results
     assert metrics["trades"] >= 0
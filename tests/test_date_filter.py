@@ -138,3 +138,44 @@ def test_date_filter_with_time():
 
     # Should have 3 bars
     assert len(filtered_bars) == 3
+
+
+def test_bar_index_append_and_range():
+    """Test incremental BarIndex append and range queries."""
+    from utils.dates import BarIndex, filter_bars_by_date
+
+    base_ts = int(datetime(2023, 1, 1).timestamp())
+    index = BarIndex()
+    for i in range(5):
+        ts = base_ts + (i * 86400)
+        index.append((ts, 100.0, 101.0, 99.0, 100.5, 1000))
+
+    # Out-of-order bar lands in its sorted position
+    index.append((base_ts - 86400, 100.0, 101.0, 99.0, 100.5, 1000))
+    assert len(index) == 6
+    assert index.ts == sorted(index.ts)
+
+    # Range query returns the contiguous slice
+    assert len(index.range(base_ts, base_ts + 2 * 86400)) == 3
+    assert len(index.range()) == 6
+
+    # filter_bars_by_date delegates to the index
+    filtered, st, et = filter_bars_by_date(index, "2023-01-01", "2023-01-03")
+    assert len(filtered) == 3
+    assert all(st <= b[0] <= et for b in filtered)
+
+
+def test_to_ts_utc_rejects_invalid_dates():
+    """Test that malformed YYYY-MM-DD dates raise ValueError, not resolve."""
+    import pytest
+
+    from utils.dates import to_ts_utc
+
+    # Valid dates parse to midnight UTC
+    assert to_ts_utc("2023-01-01") == 1672531200
+    assert to_ts_utc("2024-02-29") == 1709164800  # leap day
+
+    # Out-of-range day/month components must raise, not roll over
+    for bad in ("2023-02-30", "2023-01-45", "2023-01-00", "2023-13-01", "2023-00-15"):
+        with pytest.raises(ValueError):
+            to_ts_utc(bad)
@@ -1,13 +1,6 @@
 """Tests for freshness check utilities."""
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from bot.utils.freshness import is_stale  # noqa: E402
+from bot.utils.freshness import is_stale
 
 
 def test_fresh_data():
@@ -57,3 +50,39 @@ def test_different_timeframes():
     # 1 hour timeframe
     assert not is_stale(last_ts, last_ts + 3600, 3600)  # Fresh
     assert is_stale(last_ts, last_ts + 5000, 3600)  # Stale
+
+
+def test_is_stale_array_gaps():
+    """Test vectorized gap detection over a bar series."""
+    import numpy as np
+
+    from bot.utils.freshness import is_stale_array
+
+    tf_sec = 900  # 15 minutes
+    base_ts = 1609459200
+    # Regular series with one missing candle between bars 2 and 3
+    ts = np.array(
+        [base_ts, base_ts + 900, base_ts + 1800, base_ts + 3600, base_ts + 4500],
+        dtype=np.int64,
+    )
+
+    gaps = is_stale_array(ts, tf_sec)
+
+    assert gaps.dtype == bool
+    assert len(gaps) == len(ts) - 1
+    assert gaps.tolist() == [False, False, True, False]
+
+
+def test_is_stale_array_matches_scalar():
+    """Test that the array variant agrees with is_stale pairwise."""
+    import numpy as np
+
+    from bot.utils.freshness import is_stale_array
+
+    tf_sec = 60
+    ts = np.array([0, 60, 130, 190, 400, 460], dtype=np.int64)
+
+    gaps = is_stale_array(ts, tf_sec)
+    expected = [is_stale(int(a), int(b), tf_sec) for a, b in zip(ts[:-1], ts[1:])]
+
+    assert gaps.tolist() == expected
@@ -1,17 +1,12 @@
 """Tests for backtest metrics and CSV export functionality."""
 
-import sys
 from pathlib import Path
 
 import pytest
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from bot.backtest.engine import run_backtest  # noqa: E402
-from bot.data.ohlcv_source import SyntheticOHLCV  # noqa: E402
-from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
+from bot.backtest.engine import run_backtest
+from bot.data.ohlcv_source import SyntheticOHLCV
+from bot.strategy.mean_reversion import MeanReversion
 
 
 @pytest.mark.xfail(reason="TASK-003: Metrics not implemented yet")
@@ -1,24 +1,15 @@
 """Tests for one-bar backtest mode."""
 
-import os
-import subprocess
-import sys
-from pathlib import Path
+import pytest
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from bot.backtest.engine import run_backtest_onebar
+from bot.data.ohlcv_source import SyntheticOHLCV
+from bot.strategy.mean_reversion import MeanReversion
 
-from bot.backtest.engine import run_backtest_onebar  # noqa: E402
-from bot.data.ohlcv_source import SyntheticOHLCV  # noqa: E402
-from bot.strategy.mean_reversion import MeanReversion  # noqa: E402
 
-
-def test_onebar_backtest():
+def test_onebar_backtest(synth_bars_300):
     """Test one-bar backtest functionality."""
-    # Generate 300 bars of synthetic data
-    data_source = SyntheticOHLCV(seed=42)
-    bars = data_source.load(tf="15m", bars=300)
+    bars = synth_bars_300
 
     # Initialize MeanReversion strategy
     strategy = MeanReversion(window=20, threshold=0.005, timeframe="15m")
@@ -39,11 +30,9 @@ def test_onebar_backtest():
     assert equity[-1] == metrics["final_equity"], "Final equity should match metrics"
 
 
-def test_onebar_no_trades():
+def test_onebar_no_trades(synth_bars_300):
     """Test one-bar backtest with no trades."""
-    # Generate minimal data
-    data_source = SyntheticOHLCV(seed=42)
-    bars = data_source.load(tf="15m", bars=10)  # Too few bars for strategy
+    bars = synth_bars_300[:10]  # Too few bars for strategy
 
     # Initialize strategy with high threshold (no signals)
     strategy = MeanReversion(window=20, threshold=0.5, timeframe="15m")
@@ -58,65 +47,81 @@ def test_onebar_no_trades():
     assert len(equity) == 10, f"Expected 10 equity points, got {len(equity)}"
 
 
-def test_cli_onebar_output():
-    """Test CLI output for onebar mode."""
-    script_path = project_root / "scripts" / "backtest.py"
-
-    # Run CLI with onebar mode and small dataset
-    env = os.environ.copy()
-    env["DATA_SOURCE"] = "synthetic"
-    result = subprocess.run(
-        [
-            sys.executable,
-            str(script_path),
-            "--mode",
-            "onebar",
-            "--timeframe",
-            "15m",
-            "--bars",
-            "50",
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
-    )
+def test_cli_onebar_output(monkeypatch, capsys):
+    """Test CLI output for onebar mode (in-process, no interpreter spawn)."""
+    from scripts.backtest import main as backtest_main
+
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
+    rc = backtest_main(["--mode", "onebar", "--timeframe", "15m", "--bars", "50"])
 
-    assert result.returncode == 0, f"CLI failed: {result.stderr}"
+    assert rc == 0, "CLI failed"
 
-    output = result.stdout
+    output = capsys.readouterr().out
     assert "Trades" in output, "Missing 'Trades' in CLI output"
     assert "Final Equity" in output, "Missing 'Final Equity' in CLI output"
     assert "mode=onebar" in output, "Missing mode indicator in CLI output"
 
 
-def test_cli_close_output():
-    """Test CLI output for close mode."""
-    script_path = project_root / "scripts" / "backtest.py"
-
-    # Run CLI with close mode
-    env = os.environ.copy()
-    env["DATA_SOURCE"] = "synthetic"
-    result = subprocess.run(
-        [
-            sys.executable,
-            str(script_path),
-            "--mode",
-            "close",
-            "--timeframe",
-            "15m",
-            "--bars",
-            "100",
-        ],
-        capture_output=True,
-        text=True,
-        cwd=project_root,
-        env=env,
-    )
+def test_cli_close_output(monkeypatch, capsys):
+    """Test CLI output for close mode (in-process, no interpreter spawn)."""
+    from scripts.backtest import main as backtest_main
+
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
+    rc = backtest_main(["--mode", "close", "--timeframe", "15m", "--bars", "100"])
 
-    assert result.returncode == 0, f"CLI failed: {result.stderr}"
+    assert rc == 0, "CLI failed"
 
-    output = result.stdout
+    output = capsys.readouterr().out
     assert "Trades" in output, "Missing 'Trades' in CLI output"
     assert "Win Rate" in output, "Missing 'Win Rate' in CLI output"
     assert "mode=close" in output, "Missing mode indicator in CLI output"
+
+
+def test_onebar_optimized_signal_batch_matches_scalar():
+    """Test that MeanReversionOptimized.signal_batch matches signal() per prefix."""
+    import numpy as np
+
+    from bot.strategy.mean_reversion_optimized import MeanReversionOptimized
+
+    data_source = SyntheticOHLCV(seed=42)
+    bars = data_source.load(tf="15m", bars=400)
+    history = [(t, o, h, low, c) for t, o, h, low, c, v in bars]
+
+    # Thresholds loose enough that some signals actually fire
+    strategy = MeanReversionOptimized(
+        window=20, zscore_threshold=0.5, adx_threshold=60.0, atr_threshold=0.001
+    )
+    batch = strategy.signal_batch(history)
+
+    mapping = {"buy": 1, "sell": -1, None: 0}
+    expected = np.zeros(len(history), dtype=np.int8)
+    for t in range(1, len(history)):
+        expected[t] = mapping[strategy.signal(history[:t])]
+
+    assert batch.dtype == np.int8
+    assert np.array_equal(batch, expected)
+    assert (batch != 0).any(), "parity test should cover bars with signals"
+
+
+def test_onebar_batch_matches_single_runs():
+    """Test that the batched sweep matches individual one-bar backtests."""
+    from bot.backtest.engine import run_backtest_onebar_batch
+
+    data_source = SyntheticOHLCV(seed=42)
+    bars = data_source.load(tf="15m", bars=300)
+
+    thresholds = [0.002, 0.005]
+    fees = [0.0005, 0.001]
+    strategies = [MeanReversion(window=20, threshold=th, timeframe="15m") for th in thresholds]
+
+    batch = run_backtest_onebar_batch(bars, strategies, fees)
+    assert len(batch) == len(strategies) * len(fees)
+
+    k = 0
+    for th in thresholds:
+        for fee in fees:
+            strategy = MeanReversion(window=20, threshold=th, timeframe="15m")
+            metrics, _ = run_backtest_onebar(bars, strategy, fee=fee)
+            for key in ("trades", "final_equity", "pf", "max_dd"):
+                assert batch[k][key] == pytest.approx(metrics[key]), (key, th, fee)
+            k += 1
@@ -1,8 +1,15 @@
 """Tests for exchange rules."""
 
+import numpy as np
 import pytest
 
-from bot.core.rules import round_price, round_qty, validate_notional
+from bot.core.rules import (
+    round_price,
+    round_price_array,
+    round_qty,
+    round_qty_array,
+    validate_notional,
+)
 
 
 def test_round_price():
@@ -70,3 +77,19 @@ def test_validate_notional_default_minimum():
     validate_notional(1.0, 10.0)  # Should not raise
     with pytest.raises(ValueError):
         validate_notional(1.0, 5.0)  # Below default minimum of 10.0
+
+
+def test_round_price_array_matches_scalar():
+    """Test that batched price rounding matches the scalar version."""
+    prices = [100.123, 100.126, 0.0, 0.005, 100.0]
+    result = round_price_array(np.array(prices), 0.01)
+    expected = [round_price(p, 0.01) for p in prices]
+    assert np.allclose(result, expected)
+
+
+def test_round_qty_array_matches_scalar():
+    """Test that batched quantity rounding matches the scalar version."""
+    qtys = [1.234, 1.236, 0.0, 0.005, 2.5]
+    result = round_qty_array(np.array(qtys), 0.01)
+    expected = [round_qty(q, 0.01) for q in qtys]
+    assert np.allclose(result, expected)
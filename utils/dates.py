@@ -2,40 +2,152 @@
 
 from __future__ import annotations
 
+import bisect
+import calendar
 from collections.abc import Iterable
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from functools import lru_cache
 
+import numpy as np
 
-def to_ts_utc(s: str) -> int:
-    """Convert date string to UTC timestamp."""
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=1024)
+def to_ts_utc_ex(s: str) -> tuple[int, bool]:
+    """Convert date string to (UTC timestamp, date-only flag).
+
+    Pure string-to-int conversion; CLI runs re-filter the same date
+    range repeatedly, so repeat calls are served from the cache instead
+    of re-parsing the ISO string. The flag marks plain YYYY-MM-DD
+    inputs so callers can apply the inclusive end-of-day offset without
+    re-inspecting the string.
+    """
     x = s.strip()
+    if len(x) == 10 and x[4] == "-" and x[7] == "-":
+        # Fast path for the dominant plain YYYY-MM-DD input: slice-to-int
+        # plus ordinal arithmetic, skipping fromisoformat's general ISO
+        # grammar and the datetime/astimezone round-trip entirely. The
+        # date() constructor validates month/day ranges, raising the same
+        # ValueError fromisoformat would for e.g. "2023-02-30"
+        d = date(int(x[:4]), int(x[5:7]), int(x[8:10]))
+        return (d.toordinal() - _EPOCH_ORDINAL) * 86400, True
     if "T" in x:
+        date_only = False
         if x.endswith("Z"):
             x = x[:-1] + "+00:00"
         dt = datetime.fromisoformat(x)
     else:
+        date_only = len(x) == 10
         dt = datetime.fromisoformat(x + "T00:00:00")
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    return int(dt.astimezone(timezone.utc).timestamp())
+    # Integer-only epoch math: timegm over the UTC time tuple skips the
+    # float64 round-trip of dt.timestamp()
+    return calendar.timegm(dt.astimezone(timezone.utc).utctimetuple()), date_only
 
 
+def to_ts_utc(s: str) -> int:
+    """Convert date string to UTC timestamp."""
+    return to_ts_utc_ex(s)[0]
+
+
+@lru_cache(maxsize=1024)
 def iso_utc(ts: int | None) -> str:
-    """Convert timestamp to ISO UTC string."""
+    """Convert timestamp to ISO UTC string (cached; timestamps recur in logs)."""
     if ts is None:
         return "None"
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
 
 
+class BarIndex:
+    """Incrementally maintained timestamp index over a bar list.
+
+    Live/one-bar flows append bars as they arrive; keeping the ts column
+    alongside the rows makes each append O(1) on the usual in-order path
+    (O(log n) for out-of-order bars) and a [start, end] range query two
+    binary searches plus one slice, instead of rescanning the whole list.
+    """
+
+    def __init__(
+        self, bars: Iterable[tuple[int, float, float, float, float, int]] = ()
+    ) -> None:
+        self.rows = list(bars)
+        self.ts = [b[0] for b in self.rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, bar: tuple[int, float, float, float, float, int]) -> None:
+        """Insert one bar, keeping the index sorted by timestamp."""
+        ts = bar[0]
+        if not self.ts or ts >= self.ts[-1]:
+            # Common live path: bars arrive in order, plain append
+            self.ts.append(ts)
+            self.rows.append(bar)
+        else:
+            i = bisect.bisect_right(self.ts, ts)
+            self.ts.insert(i, ts)
+            self.rows.insert(i, bar)
+
+    def range(
+        self, st: int | None = None, et: int | None = None
+    ) -> list[tuple[int, float, float, float, float, int]]:
+        """Return bars with st <= ts <= et (either bound optional)."""
+        lo = bisect.bisect_left(self.ts, st) if st is not None else 0
+        hi = bisect.bisect_right(self.ts, et) if et is not None else len(self.rows)
+        return self.rows[lo:hi]
+
+
 def filter_bars_by_date(
     bars: Iterable[tuple[int, float, float, float, float, int]],
     start: str | None,
     end: str | None,
 ) -> tuple[list[tuple[int, float, float, float, float, int]], int | None, int | None]:
-    """Filter bars by date range and return filtered bars with start/end timestamps."""
+    """Filter bars by date range and return filtered bars with start/end timestamps.
+
+    Bars must be in ascending timestamp order (every loader emits them
+    that way): the kept range is then contiguous, so the boundaries are
+    binary-searched on an int64 timestamp column and the result is one
+    list slice — no per-bar Python comparisons.
+    """
     st = to_ts_utc(start) if start else None
-    et = to_ts_utc(end) if end else None
-    if et and end and len(end) == 10:
-        et += 86399  # конец дня включительно
-    fb = [b for b in bars if (st is None or b[0] >= st) and (et is None or b[0] <= et)]
-    return fb, st, et
+    if end:
+        et, date_only = to_ts_utc_ex(end)
+        et += 86399 * date_only  # конец дня включительно, без ветвления (и корректно при et=0)
+    else:
+        et = None
+    if isinstance(bars, BarIndex):
+        return bars.range(st, et), st, et
+    bars = bars if isinstance(bars, list) else list(bars)
+    if st is None and et is None:
+        return list(bars), st, et
+    ts = np.fromiter((b[0] for b in bars), dtype=np.int64, count=len(bars))
+    lo = int(np.searchsorted(ts, st, side="left")) if st is not None else 0
+    hi = int(np.searchsorted(ts, et, side="right")) if et is not None else len(bars)
+    return bars[lo:hi], st, et
+
+
+def filter_bars_by_date_np(
+    ts: np.ndarray,
+    start: str | None,
+    end: str | None,
+) -> tuple[int, int, int | None, int | None]:
+    """Binary-search the [start, end] range in sorted bar timestamps.
+
+    Columnar counterpart of filter_bars_by_date: timestamps increase
+    monotonically, so the kept range is the slice ts[lo:hi], found in
+    O(log n) with np.searchsorted instead of an O(n) Python scan.
+
+    Returns:
+        (lo, hi, st, et) — slice bounds plus the parsed UTC boundaries.
+    """
+    st = to_ts_utc(start) if start else None
+    if end:
+        et, date_only = to_ts_utc_ex(end)
+        et += 86399 * date_only  # конец дня включительно, без ветвления (и корректно при et=0)
+    else:
+        et = None
+    lo = int(np.searchsorted(ts, st, side="left")) if st is not None else 0
+    hi = int(np.searchsorted(ts, et, side="right")) if et is not None else len(ts)
+    return lo, hi, st, et